@@ -9,6 +9,7 @@ This script:
 5. Calls Claude API to generate summary and protocol
 """
 
+import argparse
 import json
 import os
 import re
@@ -1384,15 +1385,19 @@ def main(video_path_str: str) -> Dict:
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python orchestrator.py <path_to_video>")
-        sys.exit(1)
-
-    video_path = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Full meeting video processing cycle")
+    parser.add_argument("video_path", help="Path to video file")
+    parser.add_argument("--result-json", dest="result_json",
+                        help="Write the final result dictionary to this JSON file")
+    args = parser.parse_args()
 
     try:
-        result = main(video_path)
+        result = main(args.video_path)
         print(f"\nResult: {json.dumps(result, ensure_ascii=False, indent=2)}")
+
+        if args.result_json:
+            with open(args.result_json, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
     except Exception as e:
         print(f"\n[ERROR] Processing error: {e}")
         import traceback
@@ -8,16 +8,19 @@ This script:
 4. Logs all operations
 """
 
+import asyncio
 import json
 import logging
 import os
 import re
-import subprocess
 import sys
+import tempfile
+import threading
 import time
+from collections import deque
 from pathlib import Path
 from datetime import datetime
-from typing import Set, Dict
+from typing import Set, Dict, Optional, Tuple
 import hashlib
 from dotenv import load_dotenv
 
@@ -26,7 +29,7 @@ load_dotenv()
 
 try:
     from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler, FileCreatedEvent
+    from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileMovedEvent
 except ImportError:
     print("ERROR: watchdog is not installed. Install it: pip install watchdog")
     sys.exit(1)
@@ -54,6 +57,36 @@ ORCHESTRATOR_SCRIPT = Path("scripts/orchestrator.py")
 # File stabilization timeout (seconds) - wait until file is fully copied
 FILE_STABLE_TIMEOUT = 5
 
+# Yandex.Disk temporary files with UUID prefixes
+# Pattern: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx_originalname.ext
+YANDEX_TEMP_PATTERN = re.compile(
+    r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_',
+    re.IGNORECASE
+)
+
+# Number of leading bytes hashed to identify a video file
+HASH_PREFIX_SIZE = 1024 * 1024
+
+# Delay (seconds) used to coalesce database saves triggered by watchdog events
+DB_SAVE_DEBOUNCE = 1.0
+
+# Maximum orchestrator run time (seconds) - 5 hours
+ORCHESTRATOR_TIMEOUT = 18000
+
+# Number of orchestrator runs allowed in parallel
+MAX_PARALLEL_JOBS = int(os.getenv('WATCHER_MAX_PARALLEL_JOBS', '1'))
+
+# Orchestrator output lines kept for error reporting
+OUTPUT_TAIL_LINES = 50
+
+
+def is_yandex_temp_file(name: str) -> bool:
+    """Check if file name carries a Yandex.Disk temporary UUID prefix"""
+    # Cheap dash-position check rejects ordinary names before the regex runs
+    if name[8:9] != '-' or name[13:14] != '-' or name[36:37] != '_':
+        return False
+    return YANDEX_TEMP_PATTERN.match(name) is not None
+
 
 class ProcessedVideosDB:
     """Database of processed video files"""
@@ -61,6 +94,10 @@ class ProcessedVideosDB:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self.data: Dict[str, Dict] = self._load()
+        self._lock = threading.RLock()
+        self._save_timer: Optional[threading.Timer] = None
+        # path -> ((mtime_ns, size), hash) reused between is_processed and mark_processed
+        self._hash_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
 
     def _load(self) -> Dict[str, Dict]:
         """Load database from file"""
@@ -75,27 +112,60 @@ class ProcessedVideosDB:
 
     def _save(self):
         """Save database to file"""
-        try:
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving database: {e}")
+        with self._lock:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.db_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.data, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                logger.error(f"Error saving database: {e}")
+
+    def _schedule_save(self):
+        """Coalesce saves arriving within DB_SAVE_DEBOUNCE seconds into one write"""
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(DB_SAVE_DEBOUNCE, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write pending changes to disk immediately"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._save()
 
     @staticmethod
     def _calculate_file_hash(file_path: Path) -> str:
         """Calculate SHA256 hash of file (first 1MB for speed)"""
-        sha256_hash = hashlib.sha256()
         try:
             with open(file_path, "rb") as f:
-                # Read first 1MB for fast hashing
-                chunk = f.read(1024 * 1024)
-                sha256_hash.update(chunk)
-            return sha256_hash.hexdigest()
+                # Buffered read() returns the full 1MB unless the file is shorter
+                return hashlib.sha256(f.read(HASH_PREFIX_SIZE)).hexdigest()
         except Exception as e:
             logger.error(f"Error calculating hash for {file_path}: {e}")
             return ""
 
+    def _get_file_hash(self, file_path: Path) -> str:
+        """Return file hash, reusing the cached value while the file is unchanged"""
+        try:
+            stat = file_path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return self._calculate_file_hash(file_path)
+
+        key = str(file_path)
+        cached = self._hash_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        file_hash = self._calculate_file_hash(file_path)
+        if file_hash:
+            self._hash_cache[key] = (signature, file_hash)
+        return file_hash
+
     def is_processed(self, file_path: Path) -> bool:
         """Check if file has been successfully processed"""
         # Check file existence
@@ -103,7 +173,7 @@ class ProcessedVideosDB:
             logger.warning(f"File {file_path.name} does not exist, skipping check")
             return False
 
-        file_hash = self._calculate_file_hash(file_path)
+        file_hash = self._get_file_hash(file_path)
         if not file_hash:
             return False
 
@@ -118,7 +188,8 @@ class ProcessedVideosDB:
     def mark_processed(self, file_path: Path, result_folder: str, status: str = "success",
                       error: str = None):
         """Mark file as processed"""
-        file_hash = self._calculate_file_hash(file_path)
+        file_hash = self._get_file_hash(file_path)
+        self._hash_cache.pop(str(file_path), None)
 
         # Get file size if file still exists
         file_size = 0
@@ -141,8 +212,9 @@ class ProcessedVideosDB:
 
         # Use hash as key (or file name if hash is empty)
         key = file_hash if file_hash else file_path.name
-        self.data[key] = record
-        self._save()
+        with self._lock:
+            self.data[key] = record
+        self._schedule_save()
         logger.info(f"File {file_path.name} marked as {status}")
 
     def get_stats(self) -> Dict:
@@ -159,10 +231,20 @@ class ProcessedVideosDB:
 
 
 class VideoFileHandler(FileSystemEventHandler):
-    """File system event handler for video files"""
+    """
+    File system event handler for video files
+
+    Watchdog calls on_created() and on_moved() from its observer thread; the
+    handler only filters the event and posts the file to an asyncio queue, so
+    the observer is never blocked by a running orchestrator. Files renamed into
+    place (e.g. a recording's .part file) arrive as moved events.
+    """
 
-    def __init__(self, db: ProcessedVideosDB):
+    def __init__(self, db: ProcessedVideosDB, loop: asyncio.AbstractEventLoop,
+                 queue: asyncio.Queue):
         self.db = db
+        self.loop = loop
+        self.queue = queue
         self.processing_files: Set[str] = set()
 
     def on_created(self, event: FileCreatedEvent):
@@ -170,43 +252,71 @@ class VideoFileHandler(FileSystemEventHandler):
         if event.is_directory:
             return
 
-        file_path = Path(event.src_path)
+        self._enqueue(Path(event.src_path))
 
+    def on_moved(self, event: FileMovedEvent):
+        """Handle file rename event - the new name is the file to process"""
+        if event.is_directory:
+            return
+
+        self._enqueue(Path(event.dest_path))
+
+    def _enqueue(self, file_path: Path):
+        """
+        Filter a detected file and queue it for processing
+
+        Args:
+            file_path: Video file path
+        """
         # Check extension
         if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
             return
 
         # Ignore Yandex.Disk temporary files with UUID prefixes
-        # Pattern: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx_originalname.ext
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_'
-        if re.match(uuid_pattern, file_path.name, re.IGNORECASE):
+        if is_yandex_temp_file(file_path.name):
             logger.info(f"Ignoring Yandex.Disk temporary file: {file_path.name}")
             return
 
         logger.info(f"Detected new video file: {file_path.name}")
 
-        # Avoid duplicate processing
-        if str(file_path) in self.processing_files:
+        # Hand the file over to the worker coroutines (thread-safe)
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, file_path)
+
+    async def handle_new_file(self, file_path: Path):
+        """
+        Stabilize, deduplicate and process a newly detected file
+
+        Args:
+            file_path: Video file path
+        """
+        # Avoid duplicate processing - claim the path before the first await, so
+        # events arriving during the stability wait see it as taken
+        key = str(file_path)
+        if key in self.processing_files:
             logger.info(f"File {file_path.name} already being processed, skipping")
             return
+        self.processing_files.add(key)
 
-        # Wait for file stabilization (copying may take time)
-        self._wait_for_stable_file(file_path)
+        try:
+            # Wait for file stabilization (copying may take time)
+            await self._wait_for_stable_file(file_path)
 
-        # Check that file exists after waiting
-        if not file_path.exists():
-            logger.warning(f"File {file_path.name} disappeared after stabilization wait, skipping processing")
-            return
+            # Check that file exists after waiting
+            if not file_path.exists():
+                logger.warning(f"File {file_path.name} disappeared after stabilization wait, skipping processing")
+                return
 
-        # Check if file has already been processed
-        if self.db.is_processed(file_path):
-            logger.info(f"File {file_path.name} was already successfully processed, skipping")
-            return
+            # Check if file has already been processed
+            if self.db.is_processed(file_path):
+                logger.info(f"File {file_path.name} was already successfully processed, skipping")
+                return
 
-        # Start processing
-        self._process_video(file_path)
+            # Start processing
+            await self._process_video(file_path)
+        finally:
+            self.processing_files.discard(key)
 
-    def _wait_for_stable_file(self, file_path: Path, timeout: int = 60):
+    async def _wait_for_stable_file(self, file_path: Path, timeout: int = 60):
         """
         Wait until file stabilizes (copying completes)
 
@@ -224,14 +334,14 @@ class VideoFileHandler(FileSystemEventHandler):
                 # Check that file exists
                 if not file_path.exists():
                     logger.warning(f"File {file_path.name} disappeared during stabilization wait")
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     continue
 
                 current_size = file_path.stat().st_size
 
                 if current_size == last_size and current_size > 0:
                     # Size unchanged, file is stable
-                    time.sleep(FILE_STABLE_TIMEOUT)
+                    await asyncio.sleep(FILE_STABLE_TIMEOUT)
 
                     # Check again (file may disappear)
                     if file_path.exists() and file_path.stat().st_size == current_size:
@@ -239,15 +349,33 @@ class VideoFileHandler(FileSystemEventHandler):
                         return
 
                 last_size = current_size
-                time.sleep(2)
+                await asyncio.sleep(2)
 
             except Exception as e:
                 logger.warning(f"Error checking file {file_path.name}: {e}")
-                time.sleep(2)
+                await asyncio.sleep(2)
 
         logger.warning(f"File {file_path.name} did not stabilize within {timeout}s, continuing")
 
-    def _process_video(self, file_path: Path):
+    @staticmethod
+    async def _drain_output(stream: asyncio.StreamReader, name: str, tail: deque):
+        """
+        Forward orchestrator output to the logger line by line
+
+        Args:
+            stream: Process stdout stream
+            name: Video file name (used as log prefix)
+            tail: Buffer collecting the last output lines
+        """
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            text = line.decode('utf-8', errors='replace').rstrip()
+            tail.append(text)
+            logger.info(f"[{name}] {text}")
+
+    async def _process_video(self, file_path: Path):
         """
         Launch video processing through orchestrator
 
@@ -255,6 +383,7 @@ class VideoFileHandler(FileSystemEventHandler):
             file_path: Video file path
         """
         self.processing_files.add(str(file_path))
+        result_json_path: Optional[Path] = None
 
         try:
             # Check that file exists before processing
@@ -273,36 +402,51 @@ class VideoFileHandler(FileSystemEventHandler):
             except Exception as e:
                 logger.warning(f"Failed to get file size: {e}")
 
+            # Orchestrator writes its final result dictionary to this file
+            with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as result_file:
+                result_json_path = Path(result_file.name)
+
             # Launch orchestrator
-            cmd = [sys.executable, str(ORCHESTRATOR_SCRIPT), str(file_path)]
+            cmd = [sys.executable, str(ORCHESTRATOR_SCRIPT), str(file_path),
+                   "--result-json", str(result_json_path)]
 
             logger.info(f"Launching command: {' '.join(cmd)}")
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=18000  # 5 hours maximum
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=1024 * 1024
             )
 
-            if result.returncode == 0:
+            output_tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        self._drain_output(process.stdout, file_path.name, output_tail),
+                        process.wait()
+                    ),
+                    timeout=ORCHESTRATOR_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.error(f"[TIMEOUT] Processing {file_path.name} exceeded time limit (5 hours)")
+                self.db.mark_processed(file_path, "", status="failed", error="Timeout")
+                return
+
+            output = '\n'.join(output_tail)
+
+            if process.returncode == 0:
                 # Successful processing
                 logger.info(f"[SUCCESS] File {file_path.name} successfully processed!")
 
-                # Parse result to get result folder
+                # Read result written by orchestrator to get result folder
                 try:
-                    # Look for line with result_folder in output
-                    for line in result.stdout.split('\n'):
-                        if 'result_folder' in line or 'Results folder' in line:
-                            logger.info(f"Result: {line}")
-
-                    # Try to find JSON at end of output
-                    json_match = re.search(r'\{[^{}]*"result_folder"[^{}]*\}', result.stdout, re.DOTALL)
-                    if json_match:
-                        result_data = json.loads(json_match.group(0))
-                        result_folder = result_data.get('result_folder', 'unknown')
-                    else:
-                        result_folder = 'unknown'
+                    result_data = json.loads(result_json_path.read_bytes())
+                    result_folder = result_data.get('result_folder', 'unknown')
+                    logger.info(f"Result: {result_folder}")
 
                 except Exception as e:
                     logger.warning(f"Failed to parse result: {e}")
@@ -314,18 +458,13 @@ class VideoFileHandler(FileSystemEventHandler):
             else:
                 # Processing error
                 logger.error(f"[FAILED] Error processing {file_path.name}")
-                logger.error(f"Return code: {result.returncode}")
-                logger.error(f"STDOUT: {result.stdout[-500:]}")  # Last 500 characters
-                logger.error(f"STDERR: {result.stderr[-500:]}")
+                logger.error(f"Return code: {process.returncode}")
+                logger.error(f"OUTPUT: {output[-500:]}")  # Last 500 characters
 
                 # Mark as failed attempt
-                error_msg = result.stderr[-200:] if result.stderr else "Unknown error"
+                error_msg = output[-200:] if output else "Unknown error"
                 self.db.mark_processed(file_path, "", status="failed", error=error_msg)
 
-        except subprocess.TimeoutExpired:
-            logger.error(f"[TIMEOUT] Processing {file_path.name} exceeded time limit (5 hours)")
-            self.db.mark_processed(file_path, "", status="failed", error="Timeout")
-
         except Exception as e:
             logger.error(f"[ERROR] Unhandled error processing {file_path.name}: {e}")
             import traceback
@@ -334,9 +473,29 @@ class VideoFileHandler(FileSystemEventHandler):
 
         finally:
             self.processing_files.discard(str(file_path))
+            if result_json_path is not None:
+                result_json_path.unlink(missing_ok=True)
+
+
+async def process_queue(handler: VideoFileHandler, queue: asyncio.Queue):
+    """
+    Worker coroutine: take detected files from the queue and process them
+
+    Args:
+        handler: File handler
+        queue: Queue of detected video files
+    """
+    while True:
+        file_path = await queue.get()
+        try:
+            await handler.handle_new_file(file_path)
+        except Exception as e:
+            logger.error(f"[ERROR] Worker failed on {file_path.name}: {e}")
+        finally:
+            queue.task_done()
 
 
-def scan_existing_files(db: ProcessedVideosDB, handler: VideoFileHandler):
+async def scan_existing_files(db: ProcessedVideosDB, handler: VideoFileHandler):
     """
     Check existing files in input folder on startup
 
@@ -362,14 +521,18 @@ def scan_existing_files(db: ProcessedVideosDB, handler: VideoFileHandler):
             logger.warning(f"File {file_path.name} disappeared during scanning, skipping")
             continue
 
-        if not db.is_processed(file_path):
+        if str(file_path) in handler.processing_files:
+            logger.info(f"File {file_path.name} already being processed, skipping")
+        elif not db.is_processed(file_path):
             logger.info(f"Unprocessed file: {file_path.name}, starting processing...")
-            handler._process_video(file_path)
+            await handler._process_video(file_path)
+            # Persist the status right away; a restart mid-backlog must not redo finished files
+            db.flush()
         else:
             logger.info(f"File {file_path.name} already processed, skipping")
 
 
-def main():
+async def async_main():
     """Main monitoring function"""
     logger.info("=" * 80)
     logger.info("AUTOMATIC INPUT FOLDER MONITORING")
@@ -388,11 +551,13 @@ def main():
     stats = db.get_stats()
     logger.info(f"Loaded processed files database: {stats}")
 
-    # Create handler
-    handler = VideoFileHandler(db)
+    # Create handler and job queue
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    handler = VideoFileHandler(db, loop, queue)
 
     # Scan existing files
-    scan_existing_files(db, handler)
+    await scan_existing_files(db, handler)
 
     # Configure watchdog observer
     observer = Observer()
@@ -404,19 +569,32 @@ def main():
     logger.info("Press Ctrl+C to stop")
     logger.info("=" * 80)
 
+    workers = [
+        asyncio.create_task(process_queue(handler, queue))
+        for _ in range(max(1, MAX_PARALLEL_JOBS))
+    ]
+
     try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        logger.info("Stop signal received...")
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
         observer.stop()
+        observer.join()
+        db.flush()
+        logger.info("Monitoring stopped")
 
-    observer.join()
-    logger.info("Monitoring stopped")
+        # Final statistics
+        stats = db.get_stats()
+        logger.info(f"Final statistics: {stats}")
 
-    # Final statistics
-    stats = db.get_stats()
-    logger.info(f"Final statistics: {stats}")
+
+def main():
+    """Entry point: run the monitoring event loop"""
+    try:
+        asyncio.run(async_main())
+    except KeyboardInterrupt:
+        logger.info("Stop signal received...")
 
 
 if __name__ == "__main__":
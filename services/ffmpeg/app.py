@@ -46,6 +46,10 @@ AUDIO_DIR = DATA_DIR / "audio"
 INPUT_DIR.mkdir(parents=True, exist_ok=True)
 AUDIO_DIR.mkdir(parents=True, exist_ok=True)
 
+# Maximum number of FFmpeg processes running at the same time
+FFMPEG_CONCURRENCY = int(os.getenv("FFMPEG_CONCURRENCY", os.cpu_count() or 2))
+FFMPEG_SEM = asyncio.Semaphore(FFMPEG_CONCURRENCY)
+
 
 class HealthResponse(BaseModel):
     """Health check response model"""
@@ -158,9 +162,11 @@ async def extract_audio_from_video(
     # -acodec pcm_s16le: PCM 16-bit little-endian (uncompressed WAV)
     # -ar: sample rate
     # -ac: number of channels
+    # -threads 1: one core per process, parallelism comes from FFMPEG_CONCURRENCY
     # -y: overwrite output file if exists
     cmd = [
         "ffmpeg",
+        "-threads", "1",
         "-i", str(input_path),
         "-vn",  # No video
         "-acodec", "pcm_s16le",  # PCM 16-bit
@@ -260,13 +266,14 @@ async def extract_audio(
             content = await file.read()
             await f.write(content)
 
-        # Extract audio
-        await extract_audio_from_video(
-            input_path=input_path,
-            output_path=output_path,
-            sample_rate=16000,
-            channels=1
-        )
+        # Extract audio (limited to FFMPEG_CONCURRENCY parallel processes)
+        async with FFMPEG_SEM:
+            await extract_audio_from_video(
+                input_path=input_path,
+                output_path=output_path,
+                sample_rate=16000,
+                channels=1
+            )
 
         # Get audio duration
         duration = await get_audio_duration(output_path)
@@ -2,10 +2,17 @@
 Browser Joiner - Playwright automation for joining meetings
 Phase 4 of Meeting Auto Capture - Using ffmpeg screen capture
 """
-from playwright.sync_api import sync_playwright, BrowserContext, Playwright
+from playwright.async_api import async_playwright, BrowserContext, Playwright
+import asyncio
+import concurrent.futures
 import os
 import logging
-from typing import Optional
+import signal
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Awaitable, BinaryIO, Callable, Coroutine, Dict, Optional
 from datetime import datetime
 import shutil
 import subprocess
@@ -13,35 +20,409 @@ import subprocess
 from models import MeetingInvitation
 
 
+# Video encoders in order of preference: (encoder, ffmpeg video args, muxer, file extension)
+# Hardware encoders take the load off the CPU; VP9 is the software fallback.
+# gdigrab delivers bgra, from which the software encoders would pick 4:4:4
+# (High 4:4:4 / VP9 profile 1) - many players and browsers cannot play that
+VIDEO_ENCODERS = [
+    ('h264_nvenc', ['-c:v', 'h264_nvenc', '-preset', 'p4', '-rc', 'vbr', '-cq', '28'], 'matroska', 'mkv'),
+    ('h264_qsv', ['-c:v', 'h264_qsv', '-global_quality', '28'], 'matroska', 'mkv'),
+    ('h264_amf', ['-c:v', 'h264_amf', '-rc', 'cqp', '-qp_i', '28', '-qp_p', '28'], 'matroska', 'mkv'),
+    ('libx264', ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '28', '-pix_fmt', 'yuv420p'], 'matroska', 'mkv'),
+    ('libvpx-vp9', ['-c:v', 'libvpx-vp9', '-crf', '33', '-b:v', '0', '-pix_fmt', 'yuv420p'], 'webm', 'webm'),
+]
+
+# Profile files Chromium reads before launch_persistent_context returns
+PROFILE_WARM_FILES = (
+    'Local State',
+    os.path.join('Default', 'Preferences'),
+    os.path.join('Default', 'Cookies'),
+    os.path.join('Default', 'Network', 'Cookies'),
+    os.path.join('Default', 'Login Data'),
+)
+
+# Playwright defaults for every page of a context, so handlers only pass
+# a timeout when they need a different one
+ACTION_TIMEOUT_MS = 10000
+NAVIGATION_TIMEOUT_MS = 30000
+
+# /dev/shm smaller than this makes Chromium tabs crash, so it falls back to /tmp
+MIN_DEV_SHM_BYTES = 256 * 1024 * 1024
+
+
+def chromium_launch_args() -> list:
+    """
+    Build Chromium command line flags for this host
+
+    Returns:
+        List of Chromium flags
+    """
+    args = [
+        '--disable-blink-features=AutomationControlled',
+        # Same-site tabs share one renderer process
+        '--process-per-site',
+    ]
+
+    # The sandbox is only in the way when running as root in a container;
+    # on Windows it costs nothing and protects the host
+    if os.name != 'nt':
+        args.append('--no-sandbox')
+
+    # Disk-backed shared memory is slower - only use it when /dev/shm is too small
+    if os.path.ismount('/dev/shm') and shutil.disk_usage('/dev/shm').free < MIN_DEV_SHM_BYTES:
+        args.append('--disable-dev-shm-usage')
+
+    return args
+
+
+class BrowserPool:
+    """
+    Keep persistent browser contexts warm between meetings
+
+    A persistent context is bound to its profile directory, so the pool is keyed
+    by profile: a context released after a meeting stays open and is handed out
+    again for the next meeting on the same platform instead of cold-starting
+    Chromium. Cookies are kept on purpose - profiles hold platform logins.
+
+    Contexts run headed and the recorder captures the whole desktop, so idle
+    windows are minimized and only restored when handed out again.
+    """
+
+    def __init__(self, launcher: Callable[[str], Awaitable[BrowserContext]],
+                 max_idle: int = 2, recycle_after: int = 100):
+        """
+        Initialize browser pool
+
+        Args:
+            launcher: Function that launches a persistent context for a profile directory
+            max_idle: Maximum number of idle contexts kept open
+            recycle_after: Close a context after this many meetings to bound memory growth
+        """
+        self.launcher = launcher
+        self.max_idle = max_idle
+        self.recycle_after = recycle_after
+        self.logger = logging.getLogger(__name__)
+
+        self._idle: "OrderedDict[str, BrowserContext]" = OrderedDict()  # profile_dir -> context
+        self._use_counts: Dict[int, int] = {}  # id(context) -> meetings served
+
+    async def acquire(self, profile_dir: str) -> BrowserContext:
+        """
+        Get a warm context for the profile or launch a new one
+
+        Args:
+            profile_dir: Browser profile directory
+
+        Returns:
+            BrowserContext instance
+        """
+        context = self._idle.pop(profile_dir, None)
+        if context is not None and self._is_alive(context) and await self._set_window_state(context, 'normal'):
+            self.logger.info(f"Reusing warm browser context: {profile_dir}")
+        else:
+            if context is not None:
+                await self._close(context)
+            context = await self.launcher(profile_dir)
+            self._use_counts[id(context)] = 0
+
+        self._use_counts[id(context)] = self._use_counts.get(id(context), 0) + 1
+        return context
+
+    async def release(self, profile_dir: str, context: BrowserContext, reuse: bool = True):
+        """
+        Return a context to the pool after a meeting
+
+        Args:
+            profile_dir: Browser profile directory the context was launched with
+            context: BrowserContext instance
+            reuse: False to close the context instead of keeping it warm
+        """
+        uses = self._use_counts.get(id(context), 0)
+
+        if not reuse or uses >= self.recycle_after or not self._is_alive(context):
+            await self._close(context)
+            return
+
+        try:
+            # Leave one blank tab, close the rest (meeting tab stops its media)
+            pages = context.pages
+            for page in pages[1:]:
+                await page.close()
+            if pages:
+                await pages[0].goto('about:blank')
+        except Exception as e:
+            self.logger.warning(f"Failed to reset browser context, closing it: {e}")
+            await self._close(context)
+            return
+
+        # An idle window left on screen would cover or show up in later recordings
+        if not await self._set_window_state(context, 'minimized'):
+            await self._close(context)
+            return
+
+        self._idle[profile_dir] = context
+        self._idle.move_to_end(profile_dir)
+
+        # Evict least recently used contexts above the limit
+        while len(self._idle) > self.max_idle:
+            _, oldest = self._idle.popitem(last=False)
+            await self._close(oldest)
+
+    async def close_all(self):
+        """Close all idle contexts"""
+        while self._idle:
+            _, context = self._idle.popitem()
+            await self._close(context)
+
+    async def _close(self, context: BrowserContext):
+        """Close context and forget its use counter"""
+        self._use_counts.pop(id(context), None)
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def _set_window_state(self, context: BrowserContext, state: str) -> bool:
+        """
+        Minimize or restore the browser window of a context
+
+        Args:
+            context: BrowserContext instance
+            state: 'minimized' or 'normal'
+
+        Returns:
+            True on success, False if the window could not be changed
+        """
+        try:
+            page = context.pages[0] if context.pages else await context.new_page()
+            session = await context.new_cdp_session(page)
+            try:
+                window = await session.send('Browser.getWindowForTarget')
+                await session.send('Browser.setWindowBounds', {
+                    'windowId': window['windowId'],
+                    'bounds': {'windowState': state},
+                })
+            finally:
+                await session.detach()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Failed to set browser window {state}: {e}")
+            return False
+
+    @staticmethod
+    def _is_alive(context: BrowserContext) -> bool:
+        """Check that the browser behind the context is still running"""
+        try:
+            context.pages
+            return True
+        except Exception:
+            return False
+
+
+class BufferedRecordingWriter:
+    """
+    Copy ffmpeg output from its stdout pipe to disk through a memory buffer
+
+    A reader thread drains the pipe as fast as ffmpeg produces data and a
+    writer thread flushes it to the file in large blocks, so slow storage
+    (HDD, network drive) does not stall the encoder mid-meeting. When the
+    buffer is full the reader waits, which back-pressures ffmpeg instead of
+    dropping data.
+
+    A muxer writing to a pipe cannot seek back for the index and duration,
+    so the file is remuxed once recording stops (see BrowserJoiner).
+    """
+
+    READ_CHUNK = 1024 * 1024        # 1 MB per pipe read
+    MIN_WRITE = 64 * 1024           # Coalesce writes to at least 64 KB
+    MAX_BUFFER = 256 * 1024 * 1024  # Cap buffered data at 256 MB
+
+    def __init__(self, source, video_path: str):
+        """
+        Initialize writer
+
+        Args:
+            source: Readable binary stream (ffmpeg stdout)
+            video_path: Output file path
+        """
+        self.source = source
+        self.video_path = video_path
+        self.logger = logging.getLogger(__name__)
+
+        self._chunks: deque = deque()
+        self._buffered = 0
+        self._eof = False
+        self._failed = False
+        self._high_watermark_logged = False
+        self._cond = threading.Condition()
+
+        self._reader = threading.Thread(target=self._read_loop, name='ffmpeg-reader', daemon=True)
+        self._writer = threading.Thread(target=self._write_loop, name='ffmpeg-writer', daemon=True)
+
+    def start(self):
+        """Start reader and writer threads"""
+        self._reader.start()
+        self._writer.start()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all buffered data is written and the file is closed
+
+        Args:
+            timeout: Seconds to wait for each thread
+
+        Returns:
+            True if the whole recording reached the file, False on a write
+            error or if the threads are still running after the timeout
+        """
+        self._reader.join(timeout)
+        self._writer.join(timeout)
+        return not (self._failed or self._reader.is_alive() or self._writer.is_alive())
+
+    def _read_loop(self):
+        """Move data from the pipe into the buffer"""
+        try:
+            while True:
+                data = self.source.read1(self.READ_CHUNK)
+                if not data:
+                    break
+                with self._cond:
+                    while self._buffered >= self.MAX_BUFFER and not self._failed:
+                        self._cond.wait()
+                    if self._failed:
+                        # Nothing drains the buffer any more - keep reading so ffmpeg can exit
+                        continue
+                    self._chunks.append(data)
+                    self._buffered += len(data)
+                    self._log_depth()
+                    self._cond.notify_all()
+        except Exception as e:
+            self.logger.error(f"Error reading ffmpeg output: {e}")
+        finally:
+            with self._cond:
+                self._eof = True
+                self._cond.notify_all()
+
+    def _write_loop(self):
+        """Flush buffered data to the output file in large blocks"""
+        try:
+            with open(self.video_path, 'wb', buffering=0) as f:
+                while True:
+                    with self._cond:
+                        while self._buffered < self.MIN_WRITE and not self._eof:
+                            self._cond.wait()
+                        if not self._chunks and self._eof:
+                            break
+                        block = b''.join(self._chunks)
+                        self._chunks.clear()
+                        self._buffered = 0
+                        self._cond.notify_all()
+                    f.write(block)
+        except Exception as e:
+            self.logger.error(f"Error writing recording {self.video_path}: {e}")
+            with self._cond:
+                self._failed = True
+                self._chunks.clear()
+                self._buffered = 0
+                self._cond.notify_all()
+
+    def _log_depth(self):
+        """Warn once each time the buffer crosses half of its capacity"""
+        if self._buffered > self.MAX_BUFFER // 2:
+            if not self._high_watermark_logged:
+                self.logger.warning(
+                    f"Recording buffer over 50% full ({self._buffered // (1024 * 1024)} MB), "
+                    f"disk is slower than ffmpeg: {self.video_path}"
+                )
+                self._high_watermark_logged = True
+        else:
+            self._high_watermark_logged = False
+
+
+@dataclass(slots=True)
+class Recording:
+    """ffmpeg recording of one meeting"""
+
+    process: subprocess.Popen
+    writer: BufferedRecordingWriter
+    video_path: str  # Final file, written by _finalize_recording
+    part_path: str  # Raw ffmpeg pipe output
+    muxer: str
+    stderr_log: BinaryIO
+    started_at: float  # time.monotonic()
+
+
 class BrowserJoiner:
-    """Launch browser, join meetings, and record with ffmpeg screen capture"""
+    """
+    Launch browser, join meetings, and record with ffmpeg screen capture
 
-    def __init__(self, profiles_path: str, video_output_folder: str):
+    All Playwright work runs as coroutines on one event loop owned by a
+    dedicated thread; other threads (scheduler jobs) hand coroutines over
+    with submit(), so several joins can overlap their page waits.
+    """
+
+    def __init__(self, profiles_path: str, video_output_folder: str,
+                 loop: asyncio.AbstractEventLoop,
+                 pool_size: int = 2, pool_recycle_after: int = 100):
         """
         Initialize browser joiner
 
         Args:
             profiles_path: Path to browser profiles directory
             video_output_folder: Folder where videos will be saved
+            loop: Event loop running in the browser thread
+            pool_size: Number of idle browser contexts kept warm between meetings
+            pool_recycle_after: Meetings served by one context before it is relaunched
         """
         self.profiles_path = os.path.abspath(profiles_path)
         self.video_output_folder = os.path.abspath(video_output_folder)
+        self.loop = loop
         self.logger = logging.getLogger(__name__)
 
         # Ensure output folder exists
         os.makedirs(self.video_output_folder, exist_ok=True)
 
+        # Resolve and create profile directories of all known platforms once
+        from platform_handlers import HANDLER_PATHS
+        self._profile_dirs: Dict[str, str] = {}
+        for platform in HANDLER_PATHS:
+            self._profile_dir_for(platform)
+
+        # Pull profile files into the OS cache so the first launch does not wait on disk
+        threading.Thread(target=self._prewarm_profiles, name='profile-prewarm', daemon=True).start()
+
         # Store playwright instance
         self.playwright: Optional[Playwright] = None
 
-        # Store ffmpeg processes and video file paths
-        self.ffmpeg_processes = {}
-        self.video_file_paths = {}
+        # Warm persistent contexts reused across meetings
+        self.pool = BrowserPool(self._launch_context, pool_size, pool_recycle_after)
+        self.context_profiles: Dict[int, str] = {}  # id(context) -> profile_dir
+
+        # Active recordings by meeting id
+        self.recordings: Dict[str, Recording] = {}
 
         # ffmpeg executable path
         self.ffmpeg_path = "C:/prj/Rec-Transcribe-Send/tools/ffmpeg-8.0-essentials_build/bin/ffmpeg.exe"
 
-    def join_meeting(self, meeting: MeetingInvitation) -> Optional[BrowserContext]:
+        # Chromium flags for all launched contexts
+        self.chromium_args = chromium_launch_args()
+
+        # Pick the best working video encoder once at startup
+        self.video_encoder = self._detect_video_encoder()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Schedule coroutine on the browser event loop from any thread
+
+        Args:
+            coro: Coroutine (e.g. join_meeting(meeting))
+
+        Returns:
+            Future with the coroutine result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def join_meeting(self, meeting: MeetingInvitation) -> Optional[BrowserContext]:
         """
         Launch browser with persistent profile and Playwright video recording,
         join meeting, start recording, return context
@@ -52,37 +433,17 @@ class BrowserJoiner:
         Returns:
             BrowserContext instance or None if failed
         """
+        context = None
         try:
             self.logger.info(f"Launching browser for meeting: {meeting.id}")
 
             # Get profile directory for this platform
-            profile_name = self._get_profile_name(meeting.platform)
-            profile_dir = os.path.join(self.profiles_path, profile_name)
-            os.makedirs(profile_dir, exist_ok=True)
+            profile_dir = self._profile_dir_for(meeting.platform)
 
             self.logger.info(f"Using profile: {profile_dir}")
 
-            # Start Playwright
-            if not self.playwright:
-                self.playwright = sync_playwright().start()
-
-            # Launch persistent context WITHOUT Playwright video recording
-            # We use ffmpeg to capture screen + audio externally
-            context = self.playwright.chromium.launch_persistent_context(
-                user_data_dir=profile_dir,
-                headless=False,  # MUST be visible for meetings
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled'
-                    # Removed fake media stream flags - they show recording indicator on screen
-                    # We don't need them since ffmpeg captures the screen externally
-                ],
-                viewport={'width': 1920, 'height': 1080},
-                accept_downloads=True,
-                ignore_default_args=['--enable-automation'],
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
+            context = await self.pool.acquire(profile_dir)
+            self.context_profiles[id(context)] = profile_dir
 
             self.logger.info("Browser context created")
 
@@ -92,16 +453,20 @@ class BrowserJoiner:
             # Get platform-specific handler
             handler = get_handler(meeting.platform)
 
-            # Open new page and join meeting
-            page = context.new_page()
+            # Join in the tab the context already has (a fresh persistent context
+            # opens one, a pooled one is left on about:blank) instead of a new tab
+            page = context.pages[0] if context.pages else await context.new_page()
 
-            success = handler.join(page, meeting)
+            success = await handler.join(page, meeting)
 
             if success:
                 self.logger.info("Successfully joined meeting")
 
-                # Wait a bit for meeting to fully load
-                page.wait_for_timeout(5000)
+                # Wait for the meeting UI; fixed delay if the platform has no known signal
+                if handler.in_meeting_selectors:
+                    await handler.wait_for_in_meeting(page)
+                else:
+                    await page.wait_for_timeout(5000)
 
                 # Start ffmpeg screen recording
                 video_path = self._start_ffmpeg_recording(meeting)
@@ -114,14 +479,17 @@ class BrowserJoiner:
                 return context
             else:
                 self.logger.error("Failed to join meeting")
-                context.close()
+                # The browser itself is fine - keep it warm for the next meeting
+                await self._release_context(context)
                 return None
 
         except Exception as e:
             self.logger.error(f"Error joining meeting: {e}", exc_info=True)
+            if context is not None:
+                await self._release_context(context, reuse=False)
             return None
 
-    def stop_recording(self, context: BrowserContext, meeting: MeetingInvitation) -> Optional[str]:
+    async def stop_recording(self, context: BrowserContext, meeting: MeetingInvitation) -> Optional[str]:
         """
         Stop ffmpeg recording and close browser
 
@@ -132,53 +500,41 @@ class BrowserJoiner:
         Returns:
             Path to the saved video file or None if failed
         """
-        import time
-
         try:
             self.logger.info(f"Stopping recording for meeting: {meeting.id}")
 
-            # Stop ffmpeg process
-            ffmpeg_process = self.ffmpeg_processes.get(meeting.id)
-            if ffmpeg_process:
+            recording = self.recordings.pop(meeting.id, None)
+            if recording:
                 self.logger.info("Stopping ffmpeg recording...")
 
-                # Send 'q' to ffmpeg to stop recording gracefully
-                try:
-                    ffmpeg_process.stdin.write(b'q')
-                    ffmpeg_process.stdin.flush()
-                except:
-                    pass
+                # Waiting for ffmpeg blocks, keep it off the event loop
+                await asyncio.to_thread(self._stop_ffmpeg, recording.process)
 
-                # Wait for ffmpeg to finish (max 10 seconds)
-                try:
-                    ffmpeg_process.wait(timeout=10)
-                    self.logger.info("ffmpeg stopped gracefully")
-                except subprocess.TimeoutExpired:
-                    self.logger.warning("ffmpeg didn't stop gracefully, terminating...")
-                    ffmpeg_process.terminate()
-                    try:
-                        ffmpeg_process.wait(timeout=5)
-                    except subprocess.TimeoutExpired:
-                        ffmpeg_process.kill()
-
-                # Remove from tracking
-                del self.ffmpeg_processes[meeting.id]
+                # Let the writer flush the remaining buffered data
+                written = await asyncio.to_thread(recording.writer.join, 60)
+                recording.stderr_log.close()
+
+                self.logger.info(f"Recorded {(time.monotonic() - recording.started_at) / 60:.1f} min")
             else:
                 self.logger.warning("No ffmpeg process found for this meeting")
 
-            # Close browser
-            self.logger.info("Closing browser context...")
-            context.close()
+            # Return browser to the pool (closes meeting tab)
+            self.logger.info("Releasing browser context...")
+            await self._release_context(context)
 
-            # Get video file path
-            video_path = self.video_file_paths.get(meeting.id)
-            if video_path and os.path.exists(video_path):
-                self.logger.info(f"Video saved to: {video_path}")
+            if recording is None:
+                return None
 
-                # Remove from tracking
-                if meeting.id in self.video_file_paths:
-                    del self.video_file_paths[meeting.id]
+            if not written:
+                # The file may still be growing - do not hand it on
+                self.logger.error(f"Recording was not fully written: {recording.part_path}")
+                return None
 
+            await asyncio.to_thread(self._finalize_recording, recording)
+
+            video_path = recording.video_path
+            if os.path.exists(video_path):
+                self.logger.info(f"Video saved to: {video_path}")
                 return video_path
             else:
                 self.logger.error(f"Video file not found: {video_path}")
@@ -187,11 +543,125 @@ class BrowserJoiner:
         except Exception as e:
             self.logger.error(f"Error stopping recording: {e}", exc_info=True)
             # Force close
+            await self._release_context(context, reuse=False)
+            return None
+
+    def _stop_ffmpeg(self, ffmpeg_process: subprocess.Popen):
+        """
+        Stop ffmpeg gracefully, terminating it if it does not exit in time
+
+        Args:
+            ffmpeg_process: Running ffmpeg process
+        """
+        # Send 'q' and close stdin so ffmpeg quits and finalizes the video file
+        try:
+            ffmpeg_process.stdin.write(b'q\n')
+            ffmpeg_process.stdin.flush()
+            ffmpeg_process.stdin.close()
+        except:
+            pass
+
+        # Wait for ffmpeg to finish (max 10 seconds)
+        try:
+            ffmpeg_process.wait(timeout=10)
+            self.logger.info("ffmpeg stopped gracefully")
+            return
+        except subprocess.TimeoutExpired:
+            pass
+
+        # Ctrl+Break also lets ffmpeg write the trailer (Windows, own process group)
+        if hasattr(signal, 'CTRL_BREAK_EVENT'):
+            self.logger.warning("ffmpeg ignored 'q', sending Ctrl+Break...")
             try:
-                context.close()
-            except:
+                os.kill(ffmpeg_process.pid, signal.CTRL_BREAK_EVENT)
+                ffmpeg_process.wait(timeout=5)
+                self.logger.info("ffmpeg stopped after Ctrl+Break")
+                return
+            except (OSError, subprocess.TimeoutExpired):
                 pass
-            return None
+
+        self.logger.warning("ffmpeg didn't stop gracefully, terminating...")
+        ffmpeg_process.terminate()
+        try:
+            ffmpeg_process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            ffmpeg_process.kill()
+
+    def _finalize_recording(self, recording: Recording):
+        """
+        Remux the piped recording into its final file
+
+        Stream copy only: the muxer can seek now and writes the index (Cues)
+        and duration, so the video is seekable. If the remux fails the raw
+        file is kept as the recording - it plays, just without seeking.
+
+        Args:
+            recording: Stopped recording
+        """
+        try:
+            result = subprocess.run(
+                [self.ffmpeg_path, '-hide_banner', '-loglevel', 'error', '-y',
+                 '-i', recording.part_path, '-map', '0', '-c', 'copy',
+                 '-f', recording.muxer, recording.video_path],
+                capture_output=True, timeout=1800,
+                creationflags=subprocess.CREATE_NO_WINDOW
+            )
+            if result.returncode == 0:
+                os.remove(recording.part_path)
+                return
+            self.logger.warning(
+                f"Remux failed, keeping unindexed recording: "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+        except Exception as e:
+            self.logger.warning(f"Remux failed, keeping unindexed recording: {e}")
+
+        if os.path.exists(recording.part_path):
+            os.replace(recording.part_path, recording.video_path)
+
+    async def _launch_context(self, profile_dir: str) -> BrowserContext:
+        """
+        Launch persistent browser context for profile
+
+        Args:
+            profile_dir: Browser profile directory
+
+        Returns:
+            BrowserContext instance
+        """
+        # Start Playwright
+        if not self.playwright:
+            self.playwright = await async_playwright().start()
+
+        self.logger.info(f"Launching browser with profile: {profile_dir}")
+
+        # Launch persistent context WITHOUT Playwright video recording
+        # We use ffmpeg to capture screen + audio externally
+        context = await self.playwright.chromium.launch_persistent_context(
+            user_data_dir=profile_dir,
+            headless=False,  # MUST be visible for meetings
+            # Removed fake media stream flags - they show recording indicator on screen
+            # We don't need them since ffmpeg captures the screen externally
+            args=self.chromium_args,
+            viewport={'width': 1920, 'height': 1080},
+            accept_downloads=True,
+            ignore_default_args=['--enable-automation'],
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        )
+        context.set_default_timeout(ACTION_TIMEOUT_MS)
+        context.set_default_navigation_timeout(NAVIGATION_TIMEOUT_MS)
+        return context
+
+    async def _release_context(self, context: BrowserContext, reuse: bool = True):
+        """Return context to the pool (or close it if its profile is unknown)"""
+        profile_dir = self.context_profiles.pop(id(context), None)
+        if profile_dir is None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+            return
+        await self.pool.release(profile_dir, context, reuse=reuse)
 
     def _start_ffmpeg_recording(self, meeting: MeetingInvitation) -> Optional[str]:
         """
@@ -204,24 +674,26 @@ class BrowserJoiner:
             Path to video file being recorded, or None if failed
         """
         try:
+            _, video_args, muxer, extension = self.video_encoder
+
             # Create filename with metadata
-            # Format: {platform}_{timestamp}_mmmail({sender_email})_{meeting_id}.webm
+            # Format: {platform}_{timestamp}_mmmail({sender_email})_{meeting_id}.{mkv|webm}
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{meeting.platform}_{timestamp}_mmmail({meeting.sender_email})_{meeting.id}.webm"
+            filename = f"{meeting.platform}_{timestamp}_mmmail({meeting.sender_email})_{meeting.id}.{extension}"
             video_path = os.path.join(self.video_output_folder, filename)
 
             # ffmpeg command for screen capture with audio
-            # WebM format (VP9 + Opus) - more robust than MP4 for recording
+            # Matroska/WebM (H.264 or VP9 + Opus) - more robust than MP4 for recording
             # -f gdigrab: Screen capture on Windows
             # -framerate 15: Capture 15 frames per second (SD quality)
             # -i desktop: Capture entire desktop
             # -f dshow: DirectShow audio device
             # -i audio="...": Audio device name
-            # -c:v libvpx-vp9: VP9 video codec (better compression than VP8)
-            # -crf 33: Quality setting for VP9 (23=high, 33=SD, 45=low)
-            # -b:v 0: Use CRF mode (ignore bitrate)
+            # video_args: encoder chosen by _detect_video_encoder (see VIDEO_ENCODERS)
             # -c:a libopus: Opus audio codec (best quality)
             # -b:a 128k: High quality audio at 128 kbps
+            # -f {muxer} pipe:1: Stream to stdout, BufferedRecordingWriter saves to disk
+            #   (<video_path>.part, remuxed into video_path by _finalize_recording)
             ffmpeg_cmd = [
                 self.ffmpeg_path,
                 '-f', 'gdigrab',
@@ -229,31 +701,45 @@ class BrowserJoiner:
                 '-i', 'desktop',
                 '-f', 'dshow',
                 '-i', 'audio=Набор микрофонов (Senary Audio)',
-                '-c:v', 'libvpx-vp9',
-                '-crf', '33',          # SD video quality
-                '-b:v', '0',           # Use CRF mode
+                *video_args,
                 '-c:a', 'libopus',
                 '-b:a', '128k',        # High quality audio
-                '-y',  # Overwrite output file
-                video_path
+                '-f', muxer,
+                'pipe:1'
             ]
 
             self.logger.info(f"Starting ffmpeg recording: {video_path}")
-            self.logger.debug(f"ffmpeg command: {' '.join(ffmpeg_cmd)}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"ffmpeg command: {' '.join(ffmpeg_cmd)}")
+
+            # ffmpeg logs progress to stderr all the time - an unread pipe fills up
+            # and blocks ffmpeg mid-recording, so it goes to a log file instead
+            os.makedirs('logs', exist_ok=True)
+            stderr_log = open(os.path.join('logs', f'ffmpeg_{meeting.id}.log'), 'wb')
 
             # Start ffmpeg process in background
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW  # Hide console window on Windows
+            try:
+                process = subprocess.Popen(
+                    ffmpeg_cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_log,
+                    # Hide console window; own process group so Ctrl+Break reaches only ffmpeg
+                    creationflags=subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+                )
+            except Exception:
+                stderr_log.close()
+                raise
+
+            # Drain ffmpeg stdout to the video file in background threads
+            part_path = f"{video_path}.part"
+            writer = BufferedRecordingWriter(process.stdout, part_path)
+            writer.start()
+
+            self.recordings[meeting.id] = Recording(
+                process, writer, video_path, part_path, muxer, stderr_log, time.monotonic()
             )
 
-            # Store process and video path
-            self.ffmpeg_processes[meeting.id] = process
-            self.video_file_paths[meeting.id] = video_path
-
             self.logger.info(f"ffmpeg process started (PID: {process.pid})")
             return video_path
 
@@ -261,6 +747,81 @@ class BrowserJoiner:
             self.logger.error(f"Error starting ffmpeg recording: {e}", exc_info=True)
             return None
 
+    def _detect_video_encoder(self) -> tuple:
+        """
+        Find the most preferred video encoder that actually works on this machine
+
+        ffmpeg builds list hardware encoders even without matching hardware,
+        so each candidate is verified with a tiny test encode.
+
+        Returns:
+            Entry of VIDEO_ENCODERS
+        """
+        forced = os.getenv('MAC_VIDEO_ENCODER')
+
+        try:
+            listing = subprocess.run(
+                [self.ffmpeg_path, '-hide_banner', '-encoders'],
+                capture_output=True, text=True, timeout=10
+            ).stdout
+        except Exception as e:
+            self.logger.warning(f"Could not list ffmpeg encoders, using VP9: {e}")
+            return VIDEO_ENCODERS[-1]
+
+        for entry in VIDEO_ENCODERS:
+            name, video_args = entry[0], entry[1]
+            if forced and name != forced:
+                continue
+            if f' {name} ' not in listing:
+                continue
+            try:
+                probe = subprocess.run(
+                    [self.ffmpeg_path, '-hide_banner', '-loglevel', 'error',
+                     '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.2',
+                     *video_args, '-f', 'null', '-'],
+                    capture_output=True, timeout=20
+                )
+            except Exception:
+                continue
+            if probe.returncode == 0:
+                self.logger.info(f"Video encoder: {name}")
+                return entry
+
+        self.logger.info("Video encoder: libvpx-vp9 (no faster encoder available)")
+        return VIDEO_ENCODERS[-1]
+
+    def _profile_dir_for(self, platform: str) -> str:
+        """
+        Get (and create on first use) the profile directory for a platform
+
+        Args:
+            platform: Platform name (e.g., 'gpb.video')
+
+        Returns:
+            Absolute profile directory path
+        """
+        profile_dir = self._profile_dirs.get(platform)
+        if profile_dir is None:
+            profile_dir = os.path.join(self.profiles_path, self._get_profile_name(platform))
+            os.makedirs(profile_dir, exist_ok=True)
+            self._profile_dirs[platform] = profile_dir
+        return profile_dir
+
+    def _prewarm_profiles(self):
+        """Read key files of every profile once so they are in the OS page cache"""
+        buffer = bytearray(1024 * 1024)
+        warmed = 0
+        for profile_dir in set(self._profile_dirs.values()):
+            for name in PROFILE_WARM_FILES:
+                try:
+                    with open(os.path.join(profile_dir, name), 'rb', buffering=0) as f:
+                        while f.readinto(buffer):
+                            pass
+                    warmed += 1
+                except OSError:
+                    continue
+        self.logger.debug(f"Prewarmed {warmed} browser profile files")
+
     def _get_profile_name(self, platform: str) -> str:
         """
         Convert platform name to profile directory name
@@ -277,11 +838,12 @@ class BrowserJoiner:
         # Replace special characters with underscores
         return platform.replace('.', '_').replace(':', '_').replace('/', '_')
 
-    def cleanup(self):
-        """Cleanup playwright instance"""
+    async def cleanup(self):
+        """Close pooled browsers and cleanup playwright instance"""
+        await self.pool.close_all()
         if self.playwright:
             try:
-                self.playwright.stop()
+                await self.playwright.stop()
             except:
                 pass
             self.playwright = None
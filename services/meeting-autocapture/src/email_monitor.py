@@ -3,14 +3,33 @@ Email Monitor - IMAP email monitoring for meeting invitations
 Phase 1 of Meeting Auto Capture
 """
 import imapclient
+from imapclient.exceptions import IMAPClientAbortError
 import email
 from email import policy
 from email.parser import BytesParser
 import logging
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Callable
 import os
+import re
+
+# Servers drop IDLE after 30 minutes, so it is re-issued a bit earlier
+IDLE_RENEW_SECONDS = 29 * 60
+
+# Errors meaning the IMAP connection itself is broken (ssl.SSLError is an OSError)
+CONNECTION_ERRORS = (IMAPClientAbortError, OSError)
+
+# How often the IDLE wait wakes up to check whether the monitor was stopped
+IDLE_CHECK_TIMEOUT = 5
+
+# Cheap pre-check on the raw message before looking for calendar parts
+CALENDAR_CONTENT_TYPE = re.compile(rb'text/calendar', re.IGNORECASE)
+
+# Fetches an email whose callback keeps returning False gets before it is
+# marked as seen anyway, so one bad message is not retried forever
+MAX_EMAIL_ATTEMPTS = 5
 
 
 class EmailMonitor:
@@ -28,7 +47,10 @@ class EmailMonitor:
                 - password: Email password
                 - folder: Folder to monitor
                 - check_interval: Seconds between checks
-            on_email_callback: Function to call when new email detected
+            on_email_callback: Function to call when new email detected; called
+                from worker threads, possibly for several emails at once. Returning
+                False retries the email on later fetches (up to MAX_EMAIL_ATTEMPTS
+                times); an email whose callback raises is not retried
         """
         self.host = config['host']
         self.port = config['port']
@@ -42,6 +64,14 @@ class EmailMonitor:
         self.client: Optional[imapclient.IMAPClient] = None
         self.running = False
         self.monitor_thread: Optional[threading.Thread] = None
+        # imap_id -> failed callback attempts of emails left unseen for a retry
+        self._attempts: Dict[int, int] = {}
+
+        # Parses fetched messages in parallel on invitation bursts
+        self._parse_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 2,
+            thread_name_prefix='email-parse'
+        )
 
     def connect(self) -> imapclient.IMAPClient:
         """
@@ -76,6 +106,14 @@ class EmailMonitor:
             List of email data dictionaries
         """
         try:
+            # Reuse the connection while it answers NOOP
+            if self.client:
+                try:
+                    self.client.noop()
+                except CONNECTION_ERRORS as e:
+                    self.logger.warning(f"IMAP connection lost, reconnecting: {e}")
+                    self.client = None
+
             if not self.client:
                 self.client = self.connect()
 
@@ -87,34 +125,64 @@ class EmailMonitor:
 
             self.logger.info(f"Found {len(messages)} new email(s)")
 
+            # Fetch all new messages in one round-trip; PEEK leaves them unseen
+            # until they have been handled (see mark_seen)
+            fetch_data = self.client.fetch(messages, ['BODY.PEEK[]'])
+
+            # Parse emails in parallel, keep server order for results
+            futures = {
+                msg_id: self._parse_pool.submit(self.parse_email, data[b'BODY[]'])
+                for msg_id, data in fetch_data.items()
+            }
+
             emails = []
-            for msg_id in messages:
+            unparsable_ids = []
+            for msg_id, future in futures.items():
                 try:
-                    # Fetch email data
-                    fetch_data = self.client.fetch([msg_id], ['RFC822'])
-                    email_data = fetch_data[msg_id][b'RFC822']
-
-                    # Parse email
-                    parsed_email = self.parse_email(email_data)
+                    parsed_email = future.result()
                     parsed_email['imap_id'] = msg_id
                     emails.append(parsed_email)
 
-                    # Mark as seen after processing
-                    self.client.add_flags([msg_id], [imapclient.SEEN])
-                    self.logger.debug(f"Processed email ID {msg_id} and marked as seen")
-
                 except Exception as e:
                     self.logger.error(f"Error processing email ID {msg_id}: {e}")
-                    continue
+                    unparsable_ids.append(msg_id)
+
+            # Parsing would fail the same way on every fetch - do not fetch them again
+            self.mark_seen(unparsable_ids)
 
             return emails
 
-        except Exception as e:
-            self.logger.error(f"Error fetching emails: {e}")
+        except CONNECTION_ERRORS as e:
+            self.logger.error(f"Connection error fetching emails: {e}")
             # Try to reconnect on next iteration
             self.client = None
             return []
 
+        except Exception as e:
+            # Protocol-level or parsing problem - the connection is still usable
+            self.logger.error(f"Error fetching emails: {e}")
+            return []
+
+    def mark_seen(self, msg_ids: List[int]):
+        """
+        Flag handled emails as seen so they are not fetched again
+
+        Args:
+            msg_ids: IMAP message IDs
+        """
+        if not msg_ids or not self.client:
+            return
+
+        try:
+            self.client.add_flags(msg_ids, [imapclient.SEEN])
+            self.logger.debug(f"Marked email IDs {msg_ids} as seen")
+        except CONNECTION_ERRORS as e:
+            # Still unseen on the server - they are fetched again after reconnecting
+            self.logger.error(f"Connection error marking emails as seen: {e}")
+            self.client = None
+        except Exception as e:
+            self.logger.error(f"Error marking emails as seen: {e}")
+
     def parse_email(self, email_data: bytes) -> Dict:
         """
         Parse email to extract body, headers, attachments
@@ -156,36 +224,35 @@ class EmailMonitor:
         attachments = []
         calendar_attachments = []
 
-        # Walk through ALL parts of the email (including inline calendar)
-        for part in email_msg.walk():
-            content_type = part.get_content_type()
+        # Calendar parts usually sit inside multipart/alternative, where
+        # iter_attachments() does not look, so they are searched for
+        # separately - and only when the raw message mentions them at all
+        if CALENDAR_CONTENT_TYPE.search(email_data):
+            for part in email_msg.walk():
+                if part.get_content_type() != 'text/calendar':
+                    continue
+                # Decoded on demand - invitations often carry the same event
+                # both inline and as an attachment, and only the first is read
+                calendar_attachments.append({
+                    'filename': part.get_filename() or 'calendar.ics',
+                    'get_content': part.get_content
+                })
+                self.logger.debug("Found calendar part: text/calendar")
+
+        # Extract regular attachments (size of the encoded payload,
+        # decoding large attachments just to measure them is wasted work)
+        for part in email_msg.iter_attachments():
             filename = part.get_filename()
-
-            # Skip multipart containers
-            if part.is_multipart():
+            if not filename:
                 continue
-
-            # Extract calendar parts (text/calendar)
-            if content_type == 'text/calendar':
-                try:
-                    calendar_attachments.append({
-                        'filename': filename or 'calendar.ics',
-                        'content': part.get_content()
-                    })
-                    self.logger.debug(f"Found calendar part: {content_type}")
-                except Exception as e:
-                    self.logger.error(f"Error extracting calendar: {e}")
-
-            # Extract regular attachments
-            if filename:
-                try:
-                    attachments.append({
-                        'filename': filename,
-                        'content_type': content_type,
-                        'size': len(part.get_content())
-                    })
-                except Exception as e:
-                    self.logger.error(f"Error extracting attachment {filename}: {e}")
+            try:
+                attachments.append({
+                    'filename': filename,
+                    'content_type': part.get_content_type(),
+                    'size': len(part.get_payload(decode=False) or '')
+                })
+            except Exception as e:
+                self.logger.error(f"Error extracting attachment {filename}: {e}")
 
         result = {
             'headers': headers,
@@ -198,7 +265,7 @@ class EmailMonitor:
         self.logger.debug(f"Parsed email: {headers['subject']}")
         return result
 
-    def extract_calendar_attachment(self, email_data: Dict) -> Optional[bytes]:
+    def extract_calendar_attachment(self, email_data: Dict) -> Optional[str]:
         """
         Extract .ics attachment if present
 
@@ -206,12 +273,29 @@ class EmailMonitor:
             email_data: Parsed email dictionary
 
         Returns:
-            .ics file content as bytes, or None
+            .ics file content as text, or None
         """
         if email_data.get('calendar_attachments'):
-            return email_data['calendar_attachments'][0]['content']
+            return email_data['calendar_attachments'][0]['get_content']()
         return None
 
+    def wait_for_new_mail(self):
+        """
+        Block until the server reports new mail (IMAP IDLE) or IDLE must be renewed
+
+        Returns immediately after the wait when the monitor is stopped.
+        """
+        self.client.idle()
+        try:
+            started = time.monotonic()
+            while self.running and time.monotonic() - started < IDLE_RENEW_SECONDS:
+                responses = self.client.idle_check(timeout=IDLE_CHECK_TIMEOUT)
+                if any(len(r) > 1 and r[1] in (b'EXISTS', b'RECENT') for r in responses):
+                    self.logger.debug(f"IDLE notification: {responses}")
+                    return
+        finally:
+            self.client.idle_done()
+
     def monitor_loop(self):
         """Main monitoring loop (runs in background thread)"""
         self.logger.info("Email monitoring loop started")
@@ -221,16 +305,54 @@ class EmailMonitor:
                 # Fetch new emails
                 new_emails = self.fetch_new_emails()
 
-                # Process each email
-                for email_data in new_emails:
-                    if self.on_email_callback:
+                # Process each email; emails whose callback returned False stay
+                # unseen and are retried on the next fetch, up to MAX_EMAIL_ATTEMPTS
+                handled_ids = [email_data['imap_id'] for email_data in new_emails]
+                if self.on_email_callback:
+                    # Meeting extraction scans whole bodies - run the callbacks of a
+                    # burst side by side on the parse pool
+                    futures = [
+                        (email_data['imap_id'], self._parse_pool.submit(self.on_email_callback, email_data))
+                        for email_data in new_emails
+                    ]
+                    handled_ids = []
+                    for msg_id, future in futures:
                         try:
-                            self.on_email_callback(email_data)
+                            if future.result() is False:
+                                attempts = self._attempts.get(msg_id, 0) + 1
+                                if attempts < MAX_EMAIL_ATTEMPTS:
+                                    self._attempts[msg_id] = attempts
+                                    continue
+                                self.logger.error(
+                                    f"Giving up on email {msg_id} after {attempts} failed attempts"
+                                )
                         except Exception as e:
+                            # Retrying would fail the same way - do not fetch it again
                             self.logger.error(f"Error in email callback: {e}")
-
-                # Sleep until next check
-                time.sleep(self.check_interval)
+                        self._attempts.pop(msg_id, None)
+                        handled_ids.append(msg_id)
+
+                self.mark_seen(handled_ids)
+
+                # Forget retries for emails no longer unseen (read or deleted elsewhere)
+                fetched_ids = {email_data['imap_id'] for email_data in new_emails}
+                self._attempts = {
+                    msg_id: attempts for msg_id, attempts in self._attempts.items()
+                    if msg_id in fetched_ids
+                }
+
+                # Wait for server push if supported, otherwise poll. Emails waiting
+                # for a retry are not announced again, so poll until they are done
+                if self._attempts:
+                    time.sleep(self.check_interval)
+                elif self.client and self.client.has_capability('IDLE'):
+                    try:
+                        self.wait_for_new_mail()
+                    except Exception as e:
+                        self.logger.warning(f"IMAP IDLE failed, reconnecting: {e}")
+                        self.client = None
+                else:
+                    time.sleep(self.check_interval)
 
             except Exception as e:
                 self.logger.error(f"Error in monitoring loop: {e}")
@@ -266,6 +388,8 @@ class EmailMonitor:
             except:
                 pass
 
+        self._parse_pool.shutdown(wait=False, cancel_futures=True)
+
         self.logger.info("Email monitor stopped")
 
     def is_connected(self) -> bool:
@@ -2,10 +2,13 @@
 Meeting Auto Capture - Main Entry Point
 Standalone Python service for automated meeting capture
 """
+import asyncio
 import os
 import sys
 import logging
-import time
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -55,13 +58,18 @@ def validate_environment():
     return len(missing) == 0, missing
 
 
-def on_email_received(email_data: dict, parser: MeetingParser):
+def on_email_received(email_data: dict, parser: MeetingParser, scheduler: MeetingScheduler) -> bool:
     """
     Callback when new email is received
 
     Args:
         email_data: Email data from email monitor
         parser: MeetingParser instance
+        scheduler: MeetingScheduler that joins the saved meeting
+
+    Returns:
+        False if the meeting could not be saved and the email should be retried;
+        emails that fail to parse are not retried
     """
     logger = logging.getLogger(__name__)
 
@@ -71,15 +79,102 @@ def on_email_received(email_data: dict, parser: MeetingParser):
         # Parse email to meeting
         meeting = parser.parse_email_to_meeting(email_data)
 
-        if meeting:
-            # Save to pending folder
-            parser.save_meeting_json(meeting, 'data/meetings/pending')
-            logger.info(f"Saved meeting: {meeting.subject} scheduled for {meeting.start_time}")
-        else:
-            logger.debug("Email was not a meeting invitation")
+    except Exception as e:
+        # A malformed invitation fails the same way on every fetch
+        logger.error(f"Error parsing email, skipping it: {e}", exc_info=True)
+        return True
+
+    if not meeting:
+        logger.debug("Email was not a meeting invitation")
+        return True
 
+    # Save to pending folder - a failed write is the only transient error
+    try:
+        parser.save_meeting_json(meeting, 'data/meetings/pending')
     except Exception as e:
-        logger.error(f"Error processing email: {e}", exc_info=True)
+        logger.error(f"Error saving meeting, will retry: {e}")
+        return False
+
+    logger.info(f"Saved meeting: {meeting.subject} scheduled for {meeting.start_time}")
+    try:
+        scheduler.schedule_meeting(meeting)
+    except Exception as e:
+        # The meeting is saved in pending - retrying the email would save it twice
+        logger.error(f"Error scheduling meeting {meeting.id}: {e}", exc_info=True)
+
+    return True
+
+
+def start_browser_loop() -> asyncio.AbstractEventLoop:
+    """
+    Start the event loop that drives all Playwright work in a dedicated thread
+
+    Returns:
+        Running event loop
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name='browser-loop', daemon=True)
+    thread.start()
+    return loop
+
+
+def wait_for_shutdown():
+    """Block the main thread until SIGINT or SIGTERM is received"""
+    shutdown_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: shutdown_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: shutdown_event.set())
+
+    # Lock waits cannot be interrupted by Ctrl+C on Windows, so the wait
+    # is sliced there to give the signal handler a chance to run
+    wait_timeout = 1.0 if os.name == 'nt' else None
+    while not shutdown_event.wait(wait_timeout):
+        pass
+
+
+def shutdown_services(email_monitor: EmailMonitor, scheduler: MeetingScheduler,
+                      browser_joiner: BrowserJoiner, browser_loop: asyncio.AbstractEventLoop):
+    """
+    Stop all services
+
+    Args:
+        email_monitor: Running EmailMonitor
+        scheduler: Running MeetingScheduler
+        browser_joiner: BrowserJoiner to clean up
+        browser_loop: Event loop driving the browser joiner
+    """
+    logger = logging.getLogger(__name__)
+
+    logger.info("="*60)
+    logger.info("Shutting down gracefully...")
+    logger.info("="*60)
+
+    def stop_email_monitor():
+        email_monitor.stop()
+        logger.info("[OK] Email monitor stopped")
+
+    def stop_recordings():
+        # Active recordings are stopped by the scheduler before the browsers close
+        try:
+            scheduler.stop()
+            logger.info("[OK] Scheduler stopped")
+        finally:
+            browser_joiner.submit(browser_joiner.cleanup()).result(timeout=30)
+            browser_loop.call_soon_threadsafe(browser_loop.stop)
+            logger.info("[OK] Browser joiner cleaned up")
+
+    # Stop services side by side - the email monitor waits for its thread,
+    # which has nothing to do with recordings
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(stop_email_monitor), executor.submit(stop_recordings)]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error during shutdown: {e}")
+
+    logger.info("="*60)
+    logger.info("Stopped successfully")
+    logger.info("="*60)
 
 
 def main():
@@ -116,10 +211,9 @@ def main():
     logger.info("Environment variables validated")
 
     # Create data directories
-    os.makedirs('data/meetings/pending', exist_ok=True)
-    os.makedirs('data/meetings/in_progress', exist_ok=True)
-    os.makedirs('data/meetings/completed', exist_ok=True)
-    os.makedirs('data/browser_profiles', exist_ok=True)
+    for folder in ('data/meetings/pending', 'data/meetings/in_progress',
+                   'data/meetings/completed', 'data/browser_profiles'):
+        os.makedirs(folder, exist_ok=True)
 
     try:
         # Initialize components
@@ -127,24 +221,30 @@ def main():
 
         # Video Manager
         video_output_folder = os.getenv('MAC_VIDEO_OUTPUT_FOLDER', '../../data/input')
-        video_manager = VideoManager(output_folder=video_output_folder)
+        watch_mode = os.getenv('MAC_WATCH_MODE', 'native').lower()
+        video_manager = VideoManager(output_folder=video_output_folder, watch_mode=watch_mode)
         logger.info(f"[OK] Video Manager initialized (output: {video_output_folder})")
 
-        # Browser Joiner - Uses ffmpeg for screen + audio capture (WebM format)
+        # Browser Joiner - Uses ffmpeg for screen + audio capture (MKV/WebM format)
         profiles_path = os.getenv('MAC_BROWSER_PROFILES_PATH', './data/browser_profiles')
+        browser_loop = start_browser_loop()
 
         browser_joiner = BrowserJoiner(
             profiles_path=profiles_path,
-            video_output_folder=video_output_folder
+            video_output_folder=video_output_folder,
+            loop=browser_loop,
+            pool_size=int(os.getenv('MAC_BROWSER_POOL_SIZE', 2)),
+            pool_recycle_after=int(os.getenv('MAC_BROWSER_POOL_RECYCLE_AFTER', 100))
         )
-        logger.info(f"[OK] Browser Joiner initialized (ffmpeg screen capture, WebM format)")
+        logger.info(f"[OK] Browser Joiner initialized (ffmpeg screen capture, encoder: {browser_joiner.video_encoder[0]})")
         logger.info(f"  Profiles: {profiles_path}")
         logger.info(f"  Video output: {video_output_folder}")
 
         # Scheduler
         scheduler = MeetingScheduler(
             browser_joiner=browser_joiner,
-            video_manager=video_manager
+            video_manager=video_manager,
+            watch_mode=watch_mode
         )
 
         # Set timing configuration
@@ -176,7 +276,7 @@ def main():
         # Email Monitor with callback
         email_monitor = EmailMonitor(
             config=email_config,
-            on_email_callback=lambda email_data: on_email_received(email_data, parser)
+            on_email_callback=lambda email_data: on_email_received(email_data, parser, scheduler)
         )
         logger.info(f"[OK] Email Monitor initialized")
         logger.info(f"  Server: {email_config['host']}:{email_config['port']}")
@@ -201,44 +301,17 @@ def main():
         logger.info("="*60)
         logger.info("Services:")
         logger.info(f"  • Email monitoring: {email_config['folder']} (every {email_config['check_interval']}s)")
-        logger.info(f"  • Meeting scheduling: Check every minute")
+        logger.info(f"  • Meeting scheduling: One join job per meeting")
         logger.info(f"  • Auto-join: {pre_join_minutes} min before meeting")
         logger.info(f"  • Auto-stop: {post_buffer_minutes} min after meeting")
         logger.info("="*60)
         logger.info("Press Ctrl+C to stop")
         logger.info("="*60)
 
-        # Keep running
-        while True:
-            time.sleep(1)
+        # Block until Ctrl+C / SIGTERM instead of waking up every second
+        wait_for_shutdown()
 
-    except KeyboardInterrupt:
-        logger.info("\n" + "="*60)
-        logger.info("Shutting down gracefully...")
-        logger.info("="*60)
-
-        # Stop services
-        try:
-            email_monitor.stop()
-            logger.info("[OK] Email monitor stopped")
-        except:
-            pass
-
-        try:
-            scheduler.stop()
-            logger.info("[OK] Scheduler stopped")
-        except:
-            pass
-
-        try:
-            browser_joiner.cleanup()
-            logger.info("[OK] Browser joiner cleaned up")
-        except:
-            pass
-
-        logger.info("="*60)
-        logger.info("Stopped successfully")
-        logger.info("="*60)
+        shutdown_services(email_monitor, scheduler, browser_joiner, browser_loop)
 
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
@@ -6,13 +6,173 @@ from icalendar import Calendar
 import re
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta, timezone
 from typing import Optional, Dict, List, Tuple
 import logging
-from email.utils import parseaddr
+import threading
+from email.utils import getaddresses, parseaddr
 
 from models import MeetingInvitation, MeetingPattern
 
+# orjson serializes datetimes natively and is much faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# RE2 matches in linear time - no catastrophic backtracking on long HTML bodies
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+# Common password labels in one pattern ("Meeting Password:" and "Passcode:"
+# are covered by "Password:" and "code:"); the password group is set for
+# password labels, which win over codes
+PASSWORD_RE = re.compile(r'(?:(?P<password>[Pp]assword|[Пп]ароль)|[Cc]ode|[Кк]од):\s*(?P<value>\w+)')
+
+# Meeting length assumed when the invitation has no end time
+DEFAULT_DURATION_MINUTES = 60
+DEFAULT_DURATION = timedelta(minutes=DEFAULT_DURATION_MINUTES)
+
+# Append-only log of saved meetings kept next to the per-meeting files
+MEETING_INDEX_FILE = 'index.jsonl'
+
+# Characters not allowed in filenames, and hyphen runs to collapse
+INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+HYPHENS_RE = re.compile(r'-+')
+
+# iCalendar folded line continuations and the VEVENT properties we need
+ICS_FOLD_RE = re.compile(r'\r?\n[ \t]')
+ICS_PROPERTY_RE = re.compile(r'^(DTSTART|DTEND|SUMMARY|LOCATION)((?:;[^:\r\n]*)?):(.*?)\r?$', re.MULTILINE)
+ICS_ESCAPE_RE = re.compile(r'\\([\\;,nN])')
+
+
+def parse_ics_event(ics_content: str) -> Optional[Dict]:
+    """
+    Extract start, end, summary and location of the first VEVENT without building
+    the whole calendar tree
+
+    Times with a TZID need the calendar's VTIMEZONE definitions and are left to
+    icalendar.
+
+    Args:
+        ics_content: .ics file content
+
+    Returns:
+        Dictionary with calendar data, or None if the full parser is needed
+    """
+    begin = ics_content.find('BEGIN:VEVENT')
+    if begin < 0:
+        return None
+    end = ics_content.find('END:VEVENT', begin)
+    event = ICS_FOLD_RE.sub('', ics_content[begin:end if end > 0 else None])
+
+    properties = {}
+    for match in ICS_PROPERTY_RE.finditer(event):
+        name, params, value = match.groups()
+        if name in properties:
+            continue
+        if name in ('DTSTART', 'DTEND'):
+            if 'TZID=' in params.upper():
+                return None
+            properties[name] = value.strip()
+        else:
+            properties[name] = ICS_ESCAPE_RE.sub(
+                lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value
+            )
+
+    try:
+        start_dt = parse_ics_datetime(properties.get('DTSTART'), datetime.min.time())
+        end_dt = parse_ics_datetime(properties.get('DTEND'), datetime.max.time())
+    except ValueError:
+        return None
+
+    return {
+        'start': start_dt,
+        'end': end_dt,
+        'summary': properties.get('SUMMARY') or None,
+        'location': properties.get('LOCATION') or None
+    }
+
+
+def parse_ics_datetime(value: Optional[str], date_only_time: time) -> Optional[datetime]:
+    """
+    Parse an iCalendar DATE or DATE-TIME value (UTC or floating)
+
+    Args:
+        value: Property value, e.g. 20250115T100000Z or 20250115
+        date_only_time: Time of day used for DATE values
+
+    Returns:
+        datetime or None
+
+    Raises:
+        ValueError: If the value is not a DATE or DATE-TIME
+    """
+    if not value:
+        return None
+    if len(value) == 8:
+        return datetime.combine(datetime.strptime(value, '%Y%m%d').date(), date_only_time)
+    if value.endswith('Z'):
+        return datetime.strptime(value, '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc)
+    return datetime.strptime(value, '%Y%m%dT%H%M%S')
+
+
+def dumps_json(data: Dict, indent: bool = True) -> bytes:
+    """
+    Serialize to UTF-8 JSON, datetimes as ISO strings
+
+    Args:
+        data: Data to serialize
+        indent: Indent by 2 spaces, otherwise a single line
+
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False,
+                      default=datetime.isoformat).encode('utf-8')
+
+
+def literal_prefix(regex: str, min_length: int = 4) -> Optional[str]:
+    """
+    Get the literal text a regex match must start with, lowercased
+
+    Args:
+        regex: Regular expression
+        min_length: Shorter prefixes are too common to be useful
+
+    Returns:
+        Literal prefix or None
+    """
+    # Alternatives may start with anything
+    if '|' in regex:
+        return None
+
+    prefix = []
+    i = 0
+    while i < len(regex):
+        char = regex[i]
+        if char == '\\' and i + 1 < len(regex) and not regex[i + 1].isalnum():
+            # Escaped punctuation, e.g. \. or \/
+            prefix.append(regex[i + 1])
+            i += 2
+        elif char.isalnum() or char in '-_':
+            prefix.append(char)
+            i += 1
+        else:
+            break
+
+    # A quantifier right after the prefix makes its last character optional
+    if i < len(regex) and regex[i] in '?*{' and prefix:
+        prefix.pop()
+
+    literal = ''.join(prefix).lower()
+    return literal if len(literal) >= min_length else None
+
 
 class MeetingParser:
     """Parse email content and extract meeting details to JSON"""
@@ -25,8 +185,22 @@ class MeetingParser:
             patterns_file: Path to meeting_patterns.json file
         """
         self.logger = logging.getLogger(__name__)
+        self._index_lock = threading.Lock()
         self.patterns = self._load_patterns(patterns_file)
 
+        # All platform patterns fused into one regex, group p{i} is self.patterns[i],
+        # so a single scan finds every candidate URL
+        self._pattern_names = [p.name for p in self.patterns]
+        self._union_re = self._compile_url_regex(
+            '|'.join(f'(?P<p{i}>{p.regex})' for i, p in enumerate(self.patterns))
+        ) if self.patterns else None
+
+        # Literal text every pattern's URL starts with (e.g. 'zoom.us/j/'); a body
+        # containing none of them cannot match, so the regex scan is skipped.
+        # One pattern without a usable literal disables the pre-check.
+        anchors = [literal_prefix(p.regex) for p in self.patterns]
+        self._url_anchors = anchors if all(anchors) else None
+
     def _load_patterns(self, patterns_file: str) -> List[MeetingPattern]:
         """Load meeting patterns from JSON file"""
         try:
@@ -44,6 +218,27 @@ class MeetingParser:
             self.logger.error(f"Failed to load patterns file: {e}")
             return []
 
+    def _compile_url_regex(self, pattern: str):
+        """
+        Compile case-insensitive URL regex with RE2 when available, otherwise with re
+
+        Args:
+            pattern: Regular expression
+
+        Returns:
+            Compiled pattern (re2 and re patterns share the used API)
+        """
+        if re2 is not None:
+            try:
+                options = re2.Options()
+                options.case_sensitive = False
+                return re2.compile(pattern, options)
+            except re2.error as e:
+                # Patterns file may use features RE2 lacks (lookarounds, backreferences)
+                self.logger.warning(f"Meeting patterns not supported by RE2, using re: {e}")
+
+        return re.compile(pattern, re.IGNORECASE)
+
     def parse_email_to_meeting(self, email_data: Dict) -> Optional[MeetingInvitation]:
         """
         Main parsing function - convert email to MeetingInvitation
@@ -60,6 +255,14 @@ class MeetingParser:
             text_body = email_data.get('text_body', '')
             calendar_attachments = email_data.get('calendar_attachments', [])
 
+            # Emails without a calendar part or a meeting host in the body are not
+            # invitations - skip sender, calendar and URL parsing altogether
+            body_text = '\n'.join(part for part in (text_body, html_body) if part)
+            body_has_url = self.may_contain_meeting_url(body_text)
+            if not body_has_url and not calendar_attachments:
+                self.logger.debug(f"No meeting URL found in email: {headers.get('subject')}")
+                return None
+
             # Extract sender info
             sender_name, sender_email = parseaddr(headers.get('from', ''))
             if not sender_name:
@@ -68,15 +271,15 @@ class MeetingParser:
             # Parse calendar attachment if present
             calendar_data = None
             if calendar_attachments:
-                calendar_data = self.parse_ics_attachment(calendar_attachments[0]['content'])
+                calendar_data = self.parse_ics_attachment(calendar_attachments[0]['get_content']())
 
-            # Extract meeting URL from email body
-            search_text = text_body or html_body or ''
-            meeting_url, platform = self.extract_meeting_url(search_text)
-
-            # If no meeting URL found in body, check calendar location
-            if not meeting_url and calendar_data and calendar_data.get('location'):
-                meeting_url, platform = self.extract_meeting_url(calendar_data['location'])
+            # Extract meeting URL from both bodies and the calendar location in one scan
+            location = calendar_data.get('location') if calendar_data else None
+            search_text = body_text + '\n' + location if location else body_text
+            if body_has_url:
+                meeting_url, platform = self._find_meeting_url(search_text)
+            else:
+                meeting_url, platform = self.extract_meeting_url(search_text)
 
             # If still no meeting URL, this might not be a meeting invitation
             if not meeting_url:
@@ -84,7 +287,7 @@ class MeetingParser:
                 return None
 
             # Extract meeting password
-            password = self.extract_password(search_text)
+            password = self.extract_password(text_body or html_body or '')
 
             # Get start/end time from calendar or estimate
             if calendar_data:
@@ -93,7 +296,7 @@ class MeetingParser:
                 subject = calendar_data.get('summary') or headers.get('subject', 'No Subject')
             else:
                 # Try to parse from subject or use current time (fallback)
-                start_time = datetime.utcnow()
+                start_time = datetime.now(timezone.utc)
                 end_time = None
                 subject = headers.get('subject', 'No Subject')
 
@@ -102,18 +305,16 @@ class MeetingParser:
                 duration_minutes = int((end_time - start_time).total_seconds() / 60)
             else:
                 # Default to 60 minutes
-                duration_minutes = 60
-                end_time = start_time + timedelta(minutes=60)
+                duration_minutes = DEFAULT_DURATION_MINUTES
+                end_time = start_time + DEFAULT_DURATION
 
-            # Extract participants (basic implementation)
-            participants = []
+            # Extract participants - getaddresses handles commas inside quoted names
             to_header = headers.get('to', '')
-            if to_header:
-                # Parse email addresses from To field
-                for addr in to_header.split(','):
-                    name, email = parseaddr(addr.strip())
-                    if email:
-                        participants.append(email)
+            participants = [email for _, email in getaddresses([to_header]) if email] if to_header else []
+
+            # Most emails have no attachments - skip the comprehension for them
+            attachments = email_data.get('attachments')
+            attachment_names = [a['filename'] for a in attachments] if attachments else []
 
             # Create MeetingInvitation object
             meeting = MeetingInvitation(
@@ -132,7 +333,7 @@ class MeetingParser:
                 email_body_html=html_body,
                 email_body_text=text_body,
                 email_raw_headers=headers,
-                email_attachments=[a['filename'] for a in email_data.get('attachments', [])]
+                email_attachments=attachment_names
             )
 
             self.logger.info(f"Parsed meeting: {subject} ({platform}) at {start_time}")
@@ -157,33 +358,40 @@ class MeetingParser:
             if isinstance(ics_content, bytes):
                 ics_content = ics_content.decode('utf-8')
 
+            # Most invitations only need the quick scan, icalendar handles the rest
+            calendar_data = parse_ics_event(ics_content)
+            if calendar_data is not None:
+                return calendar_data
+
             cal = Calendar.from_ical(ics_content)
 
-            for component in cal.walk():
-                if component.name == "VEVENT":
-                    start = component.get('dtstart')
-                    end = component.get('dtend')
-                    summary = component.get('summary')
-                    location = component.get('location')
-
-                    # Convert to datetime if needed
-                    start_dt = start.dt if start else None
-                    end_dt = end.dt if end else None
-
-                    # Handle date-only (convert to datetime)
-                    if start_dt and not isinstance(start_dt, datetime):
-                        start_dt = datetime.combine(start_dt, datetime.min.time())
-                    if end_dt and not isinstance(end_dt, datetime):
-                        end_dt = datetime.combine(end_dt, datetime.max.time())
-
-                    return {
-                        'start': start_dt,
-                        'end': end_dt,
-                        'summary': str(summary) if summary else None,
-                        'location': str(location) if location else None
-                    }
-
-            return {}
+            # VEVENTs are direct children of VCALENDAR - no need to walk into
+            # VTIMEZONE rules or alarms
+            component = next((c for c in cal.subcomponents if c.name == "VEVENT"), None)
+            if component is None:
+                return {}
+
+            start = component.get('dtstart')
+            end = component.get('dtend')
+            summary = component.get('summary')
+            location = component.get('location')
+
+            # Convert to datetime if needed
+            start_dt = start.dt if start else None
+            end_dt = end.dt if end else None
+
+            # Handle date-only (convert to datetime)
+            if start_dt and not isinstance(start_dt, datetime):
+                start_dt = datetime.combine(start_dt, datetime.min.time())
+            if end_dt and not isinstance(end_dt, datetime):
+                end_dt = datetime.combine(end_dt, datetime.max.time())
+
+            return {
+                'start': start_dt,
+                'end': end_dt,
+                'summary': str(summary) if summary else None,
+                'location': str(location) if location else None
+            }
 
         except Exception as e:
             self.logger.error(f"Error parsing .ics attachment: {e}")
@@ -199,20 +407,58 @@ class MeetingParser:
         Returns:
             Tuple of (meeting_url, platform_name) or (None, None)
         """
-        if not text:
+        if not self.may_contain_meeting_url(text):
             return None, None
+        return self._find_meeting_url(text)
+
+    def may_contain_meeting_url(self, text: str) -> bool:
+        """
+        Cheap pre-check whether text can contain a meeting URL
+
+        Most emails are not invitations - a substring check rules them out
+        without running the URL regex.
+
+        Args:
+            text: Text to check
+
+        Returns:
+            False if no platform pattern can match
+        """
+        if not text or not self._union_re:
+            return False
+        if not self._url_anchors:
+            return True
+
+        text_lower = text.lower()
+        return any(anchor in text_lower for anchor in self._url_anchors)
 
-        # Try each pattern (already sorted by priority)
-        for pattern in self.patterns:
-            match = re.search(pattern.regex, text, re.IGNORECASE)
-            if match:
-                url = match.group(0)
-                # Ensure URL has protocol
-                if not url.startswith('http'):
-                    url = 'https://' + url
-                return url, pattern.name
+    def _find_meeting_url(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Scan text for meeting URLs and pick the highest priority one
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Tuple of (meeting_url, platform_name) or (None, None)
+        """
+        # Keep the match of the highest priority pattern (patterns are sorted by priority)
+        best_match, best_rank = None, len(self._pattern_names)
+        for match in self._union_re.finditer(text):
+            rank = int(match.lastgroup[1:])
+            if rank < best_rank:
+                best_match, best_rank = match, rank
+                if rank == 0:
+                    break
+
+        if not best_match:
+            return None, None
 
-        return None, None
+        url = best_match.group(0)
+        # Ensure URL has protocol
+        if not url.startswith('http'):
+            url = 'https://' + url
+        return url, self._pattern_names[best_rank]
 
     def extract_password(self, text: str) -> Optional[str]:
         """
@@ -227,24 +473,17 @@ class MeetingParser:
         if not text:
             return None
 
-        # Common password patterns
-        patterns = [
-            r'[Pp]assword:\s*(\w+)',
-            r'[Пп]ароль:\s*(\w+)',
-            r'[Cc]ode:\s*(\w+)',
-            r'[Кк]од:\s*(\w+)',
-            r'Meeting [Pp]assword:\s*(\w+)',
-            r'Passcode:\s*(\w+)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                password = match.group(1)
-                self.logger.debug(f"Found meeting password: {password}")
-                return password
+        password = None
+        for match in PASSWORD_RE.finditer(text):
+            if match.group('password'):
+                password = match.group('value')
+                break
+            if password is None:
+                password = match.group('value')
 
-        return None
+        if password:
+            self.logger.debug(f"Found meeting password: {password}")
+        return password
 
     def _sanitize_filename(self, text: str, max_length: int = 50) -> str:
         """
@@ -257,13 +496,12 @@ class MeetingParser:
         Returns:
             Sanitized text safe for filesystem
         """
-        import re
         # Remove or replace invalid characters
-        sanitized = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '', text)
+        sanitized = INVALID_FILENAME_CHARS_RE.sub('', text)
         # Replace spaces and dots with hyphens
         sanitized = sanitized.replace(' ', '-').replace('.', '-')
         # Remove multiple consecutive hyphens
-        sanitized = re.sub(r'-+', '-', sanitized)
+        sanitized = HYPHENS_RE.sub('-', sanitized)
         # Trim and limit length
         sanitized = sanitized.strip('-')[:max_length]
         return sanitized or 'unnamed'
@@ -303,6 +541,9 @@ class MeetingParser:
         Args:
             meeting: MeetingInvitation object
             folder: Target folder (default: pending)
+
+        Returns:
+            Path to the saved file
         """
         try:
             # Ensure folder exists
@@ -312,15 +553,17 @@ class MeetingParser:
             filename = self._generate_filename(meeting)
             filepath = os.path.join(folder, filename)
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                # Convert to dict and handle datetime serialization
-                data = meeting.model_dump()
-                # Convert datetime to ISO format
-                for key, value in data.items():
-                    if isinstance(value, datetime):
-                        data[key] = value.isoformat()
+            # mode='json' renders datetimes as ISO strings in pydantic-core
+            data = meeting.model_dump(mode='json')
+
+            # Write next to the target and rename into place, so the scheduler's
+            # folder watcher never reads a half-written file
+            tmp_path = filepath + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(dumps_json(data))
+            os.replace(tmp_path, filepath)
 
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._append_to_index(folder, data)
 
             self.logger.info(f"Saved meeting JSON: {filepath}")
             return filepath
@@ -328,3 +571,29 @@ class MeetingParser:
         except Exception as e:
             self.logger.error(f"Error saving meeting JSON: {e}")
             raise
+
+    def _append_to_index(self, folder: str, data: Dict):
+        """
+        Append meeting to the folder's JSONL index
+
+        The index is an append-only log of every meeting saved into the folder,
+        one JSON object per line, for consumers that follow it instead of
+        listing the directory. Meetings moved out later stay in the log.
+
+        Args:
+            folder: Meetings folder
+            data: JSON-ready meeting data
+        """
+        line = dumps_json(data, indent=False) + b'\n'
+        try:
+            with self._index_lock:
+                # O_APPEND + a single write keeps lines whole
+                fd = os.open(os.path.join(folder, MEETING_INDEX_FILE),
+                             os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+                try:
+                    os.write(fd, line)
+                finally:
+                    os.close(fd)
+        except OSError as e:
+            # The meeting file is already saved - the index is secondary
+            self.logger.warning(f"Could not append to meeting index in {folder}: {e}")
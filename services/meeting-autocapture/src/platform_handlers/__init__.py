@@ -1,34 +1,50 @@
 """
 Platform Handlers Package
 Exports all platform-specific handlers and get_handler() function
+
+Handler modules are imported on first use, so startup does not load all of them.
 """
+import importlib
+import logging
+from typing import Dict, Type
+
 from .base_handler import BasePlatformHandler
-from .mra_gazprombank import MRAGazprombankHandler
-from .gpb_video import GPBVideoHandler
-from .jvc_inspider import JVCInspiderHandler
-from .psbank_meeting import PSBankMeetingHandler
-from .zoom import ZoomHandler
-from .webex import WebexHandler
-from .google_meet import GoogleMeetHandler
-from .telemost_yandex import TelemostYandexHandler
-
-
-# Mapping of platform names to handler classes
-HANDLERS = {
-    'mra.gazprombank.ru': MRAGazprombankHandler,  # Priority 1
-    'gpb.video': GPBVideoHandler,
-    'jvc.inspider.ru': JVCInspiderHandler,
-    'meeting.psbank.ru': PSBankMeetingHandler,
-    'zoom': ZoomHandler,
-    'webex': WebexHandler,
-    'google_meet': GoogleMeetHandler,
-    'telemost.yandex': TelemostYandexHandler,
+
+
+# Mapping of platform names to handler (module, class)
+HANDLER_PATHS = {
+    'mra.gazprombank.ru': ('.mra_gazprombank', 'MRAGazprombankHandler'),  # Priority 1
+    'gpb.video': ('.gpb_video', 'GPBVideoHandler'),
+    'jvc.inspider.ru': ('.jvc_inspider', 'JVCInspiderHandler'),
+    'meeting.psbank.ru': ('.psbank_meeting', 'PSBankMeetingHandler'),
+    'zoom': ('.zoom', 'ZoomHandler'),
+    'webex': ('.webex', 'WebexHandler'),
+    'google_meet': ('.google_meet', 'GoogleMeetHandler'),
+    'telemost.yandex': ('.telemost_yandex', 'TelemostYandexHandler'),
 }
 
+# Fallback for unknown platforms
+DEFAULT_PLATFORM = 'gpb.video'
+
+# Handler classes imported so far, by class name
+_handler_classes: Dict[str, Type[BasePlatformHandler]] = {}
+
+# Handlers keep no per-meeting state, so one shared instance per class is enough
+_handler_instances: Dict[str, BasePlatformHandler] = {}
+
+
+def _import_handler(module_name: str, class_name: str) -> Type[BasePlatformHandler]:
+    """Import handler class once and remember it"""
+    handler_class = _handler_classes.get(class_name)
+    if handler_class is None:
+        module = importlib.import_module(module_name, __name__)
+        handler_class = _handler_classes[class_name] = getattr(module, class_name)
+    return handler_class
+
 
 def get_handler(platform: str) -> BasePlatformHandler:
     """
-    Get handler instance for platform
+    Get (shared) handler instance for platform
 
     Args:
         platform: Platform name (e.g., 'gpb.video', 'zoom')
@@ -39,16 +55,26 @@ def get_handler(platform: str) -> BasePlatformHandler:
     Raises:
         ValueError: If no handler found for platform
     """
-    handler_class = HANDLERS.get(platform)
+    handler_path = HANDLER_PATHS.get(platform)
 
-    if handler_class:
-        return handler_class()
-    else:
+    if not handler_path:
         # Return default handler (GPBVideoHandler as fallback)
-        import logging
         logger = logging.getLogger(__name__)
         logger.warning(f"No handler for platform: {platform}, using GPBVideoHandler as fallback")
-        return GPBVideoHandler()
+        handler_path = HANDLER_PATHS[DEFAULT_PLATFORM]
+
+    handler = _handler_instances.get(handler_path[1])
+    if handler is None:
+        handler = _handler_instances[handler_path[1]] = _import_handler(*handler_path)()
+    return handler
+
+
+def __getattr__(name: str):
+    """Import handler classes (e.g. ZoomHandler) on attribute access"""
+    for module_name, class_name in HANDLER_PATHS.values():
+        if class_name == name:
+            return _import_handler(module_name, class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
@@ -3,24 +3,44 @@ Base Platform Handler - Abstract base class for platform-specific join logic
 Phase 5 of Meeting Auto Capture
 """
 from abc import ABC, abstractmethod
-from playwright.sync_api import Page
+from playwright.async_api import Locator, Page, TimeoutError as PlaywrightTimeoutError
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
 import logging
-import sys
-import os
+import time
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# src/ (the parent of this package) is on sys.path, so models is a top-level module
 from models import MeetingInvitation
 
 
+# How long an optional prompt that did not show up is skipped for (seconds)
+NEGATIVE_CACHE_TTL = 3600
+
+# Optional prompts that recently did not show up: (host, prompt) -> expiry (monotonic time)
+_NEGATIVE_CACHE: Dict[Tuple[str, str], float] = {}
+
+
 class BasePlatformHandler(ABC):
     """Abstract base class for platform-specific handlers"""
 
+    # Selectors visible only once the meeting UI is up (e.g. leave/mute buttons).
+    # Empty means the platform has no known signal and the caller falls back to a fixed delay.
+    in_meeting_selectors: tuple = ()
+
+    # Take debug screenshots even when DEBUG logging is off
+    debug_screenshots: bool = False
+
+    # Declarative join flow for run_steps(): (action, selector, value, timeout) tuples
+    join_steps: tuple = ()
+
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Pending debug screenshots - referenced here so they are not garbage collected
+        self._screenshot_tasks = set()
 
     @abstractmethod
-    def join(self, page: Page, meeting: MeetingInvitation) -> bool:
+    async def join(self, page: Page, meeting: MeetingInvitation) -> bool:
         """
         Navigate to meeting and join.
 
@@ -33,7 +53,122 @@ class BasePlatformHandler(ABC):
         """
         pass
 
-    def enter_name(self, page: Page, name: str, selector: str) -> bool:
+    async def run_steps(self, page: Page, meeting: MeetingInvitation, steps) -> None:
+        """
+        Run a declarative join flow
+
+        Each step is an (action, selector, value, timeout) tuple; a None
+        timeout uses the context default set by BrowserJoiner. The selector
+        may be a tuple of selector lists in priority order - fill/click use
+        the first entry that matches, so a catch-all placed in a later entry
+        never wins over a specific element (within one list, the match that
+        comes first in the document wins):
+            'goto'  - navigate to the meeting field named by value
+            'wait'  - wait until selector is visible (carries on if it never is)
+            'fill'  - fill selector with the meeting field named by value, if present
+            'click' - click selector, if present
+
+        Args:
+            page: Playwright Page object
+            meeting: MeetingInvitation object
+            steps: Sequence of step tuples
+        """
+        # One Locator per selector for the whole flow - a wait and the fill/click
+        # that follows it share the same object instead of building a new one each
+        locators = {}
+
+        def locate(selector: str) -> Locator:
+            element = locators.get(selector)
+            if element is None:
+                element = locators[selector] = page.locator(selector).first
+            return element
+
+        for action, selector, value, timeout in steps:
+            if action == 'goto':
+                await page.goto(getattr(meeting, value), wait_until='domcontentloaded', timeout=timeout)
+                continue
+
+            tiers = (selector,) if isinstance(selector, str) else selector
+
+            if action == 'wait':
+                selector = ', '.join(tiers)
+                try:
+                    await locate(selector).wait_for(state='visible', timeout=timeout)
+                except PlaywrightTimeoutError:
+                    self.logger.warning(f"None of the elements appeared in time: {selector}")
+                continue
+
+            if action not in ('fill', 'click'):
+                raise ValueError(f"Unknown join step: {action}")
+
+            # Highest-priority entry with a match, or None if nothing is present
+            element = None
+            for selector in tiers:
+                if await locate(selector).count():
+                    element = locate(selector)
+                    break
+            if element is None:
+                continue
+
+            if action == 'fill':
+                try:
+                    await element.fill(getattr(meeting, value))
+                    self.logger.debug(f"Entered {value}")
+                except Exception as e:
+                    self.logger.error(f"Failed to enter {value}: {e}")
+            else:
+                try:
+                    self.logger.info(f"Clicking: {selector}")
+                    await element.click(timeout=timeout)
+                except PlaywrightTimeoutError as e:
+                    self.logger.warning(f"Could not click {selector}: {e}")
+
+    async def first_present(self, page: Page, selectors) -> Optional[Locator]:
+        """
+        Helper: Find the first element matched by the highest-priority selector list
+
+        Args:
+            page: Playwright Page object
+            selectors: Selector lists in priority order (catch-alls last)
+
+        Returns:
+            Locator of the element, or None if no entry matches
+        """
+        for selector in selectors:
+            element = page.locator(selector).first
+            if await element.count():
+                return element
+        return None
+
+    def prompt_missing(self, page: Page, prompt: str) -> bool:
+        """
+        Helper: Check if an optional prompt recently did not show up on this host
+
+        Args:
+            page: Playwright Page object
+            prompt: Prompt name (e.g. 'name_enter')
+
+        Returns:
+            True if waiting for the prompt can be skipped
+        """
+        return _NEGATIVE_CACHE.get((urlparse(page.url).hostname, prompt), 0) > time.monotonic()
+
+    def remember_prompt(self, page: Page, prompt: str, appeared: bool) -> None:
+        """
+        Helper: Record whether an optional prompt showed up on this host
+
+        Args:
+            page: Playwright Page object
+            prompt: Prompt name (e.g. 'name_enter')
+            appeared: True if the prompt was found
+        """
+        key = (urlparse(page.url).hostname, prompt)
+        if appeared:
+            _NEGATIVE_CACHE.pop(key, None)
+        else:
+            _NEGATIVE_CACHE[key] = time.monotonic() + NEGATIVE_CACHE_TTL
+
+    async def enter_name(self, page: Page, name: str, selector: str) -> bool:
         """
         Helper: Enter participant name
 
@@ -46,14 +181,14 @@ class BasePlatformHandler(ABC):
             True on success, False on failure
         """
         try:
-            page.fill(selector, name)
+            await page.fill(selector, name)
             self.logger.debug(f"Entered name: {name}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to enter name: {e}")
             return False
 
-    def enter_password(self, page: Page, password: str, selector: str) -> bool:
+    async def enter_password(self, page: Page, password: str, selector: str) -> bool:
         """
         Helper: Enter meeting password
 
@@ -66,14 +201,14 @@ class BasePlatformHandler(ABC):
             True on success, False on failure
         """
         try:
-            page.fill(selector, password)
+            await page.fill(selector, password)
             self.logger.debug(f"Entered password")
             return True
         except Exception as e:
             self.logger.error(f"Failed to enter password: {e}")
             return False
 
-    def click_join_button(self, page: Page, selector: str) -> bool:
+    async def click_join_button(self, page: Page, selector: str) -> bool:
         """
         Helper: Click join button
 
@@ -85,14 +220,43 @@ class BasePlatformHandler(ABC):
             True on success, False on failure
         """
         try:
-            page.click(selector)
+            await page.click(selector)
             self.logger.debug(f"Clicked join button")
             return True
         except Exception as e:
             self.logger.error(f"Failed to click join: {e}")
             return False
 
-    def wait_for_element(self, page: Page, selector: str, timeout: int = 10000) -> bool:
+    def save_screenshot(self, page: Page, path: str) -> Optional[asyncio.Task]:
+        """
+        Helper: Save a debug screenshot in the background
+
+        Skipped unless debug_screenshots is set or DEBUG logging is enabled;
+        the join flow does not wait for it.
+
+        Args:
+            page: Playwright Page object
+            path: Output file path (JPEG)
+
+        Returns:
+            The capture task (await it if the page is about to go away), or None if skipped
+        """
+        if not (self.debug_screenshots or self.logger.isEnabledFor(logging.DEBUG)):
+            return None
+
+        task = asyncio.get_running_loop().create_task(self._save_screenshot(page, path))
+        self._screenshot_tasks.add(task)
+        task.add_done_callback(self._screenshot_tasks.discard)
+        return task
+
+    async def _save_screenshot(self, page: Page, path: str) -> None:
+        try:
+            await page.screenshot(path=path, type='jpeg', quality=40, timeout=1500)
+            self.logger.debug(f"Screenshot saved: {path}")
+        except Exception as e:
+            self.logger.warning(f"Could not save screenshot: {e}")
+
+    async def wait_for_element(self, page: Page, selector: str, timeout: int = 10000) -> bool:
         """
         Helper: Wait for element to appear
 
@@ -105,8 +269,51 @@ class BasePlatformHandler(ABC):
             True if element appeared, False otherwise
         """
         try:
-            page.wait_for_selector(selector, timeout=timeout)
+            await page.locator(selector).first.wait_for(timeout=timeout)
             return True
         except Exception as e:
             self.logger.warning(f"Element not found: {selector}")
             return False
+
+    async def wait_for_any(self, page: Page, selectors, timeout: int = 10000) -> bool:
+        """
+        Helper: Wait until any of the selectors is visible
+
+        Args:
+            page: Playwright Page object
+            selectors: CSS selectors
+            timeout: Timeout in milliseconds
+
+        Returns:
+            True if an element appeared, False otherwise
+        """
+        try:
+            await page.locator(', '.join(selectors)).first.wait_for(state='visible', timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            self.logger.warning(f"None of the elements appeared within {timeout} ms: {selectors}")
+            return False
+
+    async def wait_for_in_meeting(self, page: Page, timeout_ms: int = 30000) -> bool:
+        """
+        Wait until the meeting interface is shown
+
+        Args:
+            page: Playwright Page object
+            timeout_ms: Timeout in milliseconds
+
+        Returns:
+            True if an in-meeting element appeared, False otherwise
+        """
+        if not self.in_meeting_selectors:
+            return False
+
+        try:
+            await page.locator(', '.join(self.in_meeting_selectors)).first.wait_for(
+                state='visible', timeout=timeout_ms
+            )
+            self.logger.info("Meeting interface is ready")
+            return True
+        except PlaywrightTimeoutError:
+            self.logger.warning(f"Meeting interface not detected within {timeout_ms} ms")
+            return False
@@ -2,19 +2,49 @@
 Google Meet Handler
 Handler for Google Meet meetings
 """
-from playwright.sync_api import Page
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from playwright.async_api import Page
 
-from platform_handlers.base_handler import BasePlatformHandler
+from .base_handler import BasePlatformHandler
 from models import MeetingInvitation
 
 
+# Candidate selectors, joined once into a single selector list per element
+
+# Name input (for guests)
+NAME_SELECTOR = ', '.join((
+    'input[placeholder*="name"]',
+    'input[placeholder*="Your name"]',
+    'input[aria-label*="name"]',
+))
+
+# "Ask to join" or "Join now" button
+JOIN_SELECTOR = ', '.join((
+    'button:has-text("Ask to join")',
+    'button:has-text("Join now")',
+    'button[aria-label*="Ask to join"]',
+    'button[aria-label*="Join"]',
+    '.join-button',
+))
+
+
 class GoogleMeetHandler(BasePlatformHandler):
     """Handler for Google Meet platform"""
 
-    def join(self, page: Page, meeting: MeetingInvitation) -> bool:
+    in_meeting_selectors = (
+        'button[aria-label*="Leave call"]',
+        'button[aria-label*="Покинуть"]',
+    )
+
+    # Google Meet may require Google account sign-in (handled by persistent profile)
+    join_steps = (
+        ('goto', None, 'meeting_link', None),
+        # Wait until the pre-join screen is rendered instead of sleeping
+        ('wait', f'{NAME_SELECTOR}, {JOIN_SELECTOR}', None, None),
+        ('fill', NAME_SELECTOR, 'sender_name', None),
+        ('click', JOIN_SELECTOR, None, 5000),
+    )
+
+    async def join(self, page: Page, meeting: MeetingInvitation) -> bool:
         """
         Navigate to Google Meet meeting and join
 
@@ -27,56 +57,9 @@ class GoogleMeetHandler(BasePlatformHandler):
         """
         try:
             self.logger.info(f"Joining Google Meet meeting: {meeting.meeting_link}")
+            await self.run_steps(page, meeting, self.join_steps)
 
-            # Navigate to meeting
-            page.goto(meeting.meeting_link, wait_until='networkidle', timeout=30000)
-
-            page.wait_for_timeout(3000)
-
-            # Check if already logged in or need to enter name
-            # Google Meet may require Google account sign-in (handled by persistent profile)
-
-            # Look for name input (for guests)
-            name_selectors = [
-                'input[placeholder*="name"]',
-                'input[placeholder*="Your name"]',
-                'input[aria-label*="name"]'
-            ]
-
-            for selector in name_selectors:
-                if page.query_selector(selector):
-                    self.enter_name(page, meeting.sender_name, selector)
-                    page.wait_for_timeout(1000)
-                    break
-
-            # Click "Ask to join" or "Join now" button
-            join_selectors = [
-                'button:has-text("Ask to join")',
-                'button:has-text("Join now")',
-                'button[aria-label*="Ask to join"]',
-                'button[aria-label*="Join"]',
-                '.join-button'
-            ]
-
-            for selector in join_selectors:
-                try:
-                    if page.query_selector(selector):
-                        self.logger.info(f"Clicking join button: {selector}")
-                        page.click(selector, timeout=5000)
-                        page.wait_for_timeout(3000)
-                        break
-                except:
-                    continue
-
-            # Handle microphone/camera permissions dialogs
-            try:
-                # Dismiss or allow permissions
-                page.wait_for_timeout(2000)
-            except:
-                pass
-
-            # Wait for meeting to load
-            page.wait_for_timeout(5000)
+            # BrowserJoiner waits for in_meeting_selectors before recording
 
             self.logger.info(f"Successfully joined Google Meet meeting: {meeting.id}")
             return True
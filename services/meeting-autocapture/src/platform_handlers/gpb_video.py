@@ -2,19 +2,49 @@
 GPB Video Handler - Priority 1
 Handler for gpb.video meeting platform
 """
-from playwright.sync_api import Page
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from playwright.async_api import Page
 
-from platform_handlers.base_handler import BasePlatformHandler
+from .base_handler import BasePlatformHandler
 from models import MeetingInvitation
 
 
+# Candidate selectors per element, catch-alls in a later entry (see run_steps)
+
+# Name input field (adjust selectors based on actual page)
+# Common patterns for name inputs
+NAME_SELECTORS = (
+    ', '.join((
+        'input[name="name"]',
+        'input[placeholder*="имя"]',
+        'input[placeholder*="name"]',
+    )),
+    'input[type="text"]',
+)
+
+JOIN_SELECTORS = (
+    ', '.join((
+        'button:has-text("Join")',
+        'button:has-text("Войти")',
+        'button:has-text("Присоединиться")',
+        '.join-button',
+        '#join-button',
+    )),
+    'button[type="submit"]',
+)
+
+
 class GPBVideoHandler(BasePlatformHandler):
     """Handler for gpb.video platform"""
 
-    def join(self, page: Page, meeting: MeetingInvitation) -> bool:
+    join_steps = (
+        ('goto', None, 'meeting_link', None),
+        # Wait until the join form is rendered instead of sleeping
+        ('wait', NAME_SELECTORS + JOIN_SELECTORS, None, None),
+        ('fill', NAME_SELECTORS, 'sender_name', None),
+        ('click', JOIN_SELECTORS, None, 5000),
+    )
+
+    async def join(self, page: Page, meeting: MeetingInvitation) -> bool:
         """
         Navigate to GPB Video meeting and join
 
@@ -27,48 +57,7 @@ class GPBVideoHandler(BasePlatformHandler):
         """
         try:
             self.logger.info(f"Joining GPB Video meeting: {meeting.meeting_link}")
-
-            # Navigate to meeting
-            page.goto(meeting.meeting_link, wait_until='networkidle', timeout=30000)
-
-            # Wait for page to load
-            page.wait_for_timeout(3000)
-
-            # Look for name input field (adjust selectors based on actual page)
-            # Common patterns for name inputs
-            name_selectors = [
-                'input[name="name"]',
-                'input[placeholder*="имя"]',
-                'input[placeholder*="name"]',
-                'input[type="text"]'
-            ]
-
-            for selector in name_selectors:
-                if page.query_selector(selector):
-                    self.enter_name(page, meeting.sender_name, selector)
-                    break
-
-            # Look for join button
-            join_selectors = [
-                'button:has-text("Join")',
-                'button:has-text("Войти")',
-                'button:has-text("Присоединиться")',
-                'button[type="submit"]',
-                '.join-button',
-                '#join-button'
-            ]
-
-            for selector in join_selectors:
-                try:
-                    if page.query_selector(selector):
-                        self.logger.info(f"Found join button: {selector}")
-                        page.click(selector, timeout=5000)
-                        break
-                except:
-                    continue
-
-            # Wait for meeting interface to load
-            page.wait_for_timeout(5000)
+            await self.run_steps(page, meeting, self.join_steps)
 
             self.logger.info(f"Successfully joined GPB Video meeting: {meeting.id}")
             return True
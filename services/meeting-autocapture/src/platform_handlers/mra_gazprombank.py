@@ -2,19 +2,55 @@
 MRA Gazprombank Handler - Priority 1
 Handler for mra.gazprombank.ru meeting platform
 """
-from playwright.sync_api import Page
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import logging
 
-from platform_handlers.base_handler import BasePlatformHandler
+from playwright.async_api import Page
+
+from .base_handler import BasePlatformHandler
 from models import MeetingInvitation
 
 
+# "Присоединиться к совещанию" (Join meeting) button
+JOIN_MEETING_SELECTOR = 'button:has-text("Присоединиться к совещанию")'
+
+# Each entry is one selector list, awaited in a single wait.
+# Entries are tried in order, so the catch-all only runs last.
+NAME_SELECTORS = (
+    ', '.join((
+        'input[type="text"]',  # Primary - generic text input
+        'input[placeholder*="имя"]',  # Backup - contains "имя" in placeholder
+        'input.form-control',  # Fallback - common CSS class
+    )),
+    'input',  # Last resort - any input
+)
+
+# "Введите отображаемое имя" (Enter display name) button
+SUBMIT_NAME_SELECTORS = (
+    ', '.join((
+        'button:has-text("Введите отображаемое имя")',  # Primary - exact text match
+        'button:has-text("отображаемое имя")',  # Backup - partial text
+    )),
+    ', '.join((
+        'button[type="submit"]',  # Fallback - submit button
+        'button.btn-primary',  # Common CSS class
+    )),
+)
+
+JOIN_SELECTORS = (
+    ', '.join((
+        JOIN_MEETING_SELECTOR,  # Primary - exact text
+        'button:has-text("Присоединиться")',  # Backup - partial text
+        'button:has-text("совещанию")',  # Fallback - contains "meeting"
+        'button.btn-success',  # Common green button class
+    )),
+    'button[type="button"]',  # Any button
+)
+
+
 class MRAGazprombankHandler(BasePlatformHandler):
     """Handler for mra.gazprombank.ru platform"""
 
-    def join(self, page: Page, meeting: MeetingInvitation) -> bool:
+    async def join(self, page: Page, meeting: MeetingInvitation) -> bool:
         """
         Navigate to MRA Gazprombank meeting and join as guest
 
@@ -29,159 +65,120 @@ class MRAGazprombankHandler(BasePlatformHandler):
             self.logger.info(f"Joining MRA Gazprombank meeting: {meeting.meeting_link}")
 
             # Navigate to meeting
-            page.goto(meeting.meeting_link, wait_until='networkidle', timeout=30000)
+            await page.goto(meeting.meeting_link, wait_until='domcontentloaded')
             self.logger.info(f"Navigated to URL: {page.url}")
 
-            # Wait for page to stabilize
-            page.wait_for_timeout(2000)
-
-            # Take screenshot for debugging
-            try:
-                screenshot_path = f"data/meetings/mra_gpb_step1_{meeting.id[:8]}.png"
-                page.screenshot(path=screenshot_path)
-                self.logger.info(f"Screenshot saved: {screenshot_path}")
-            except Exception as e:
-                self.logger.warning(f"Could not save screenshot: {e}")
+            # Wait for the name form or join button instead of sleeping
+            await self.wait_for_any(page, (JOIN_MEETING_SELECTOR, 'input[type="text"]'), timeout=15000)
 
             # Check if we're already on the join screen (name remembered from previous session)
-            # Try to find the join button with a short timeout
+            # The page has rendered by now, so a single DOM query is enough - no wait
             self.logger.info("Checking if join button is already visible (name remembered)...")
-            skip_name_entry = False
-            try:
-                join_button_test = page.wait_for_selector(
-                    'button:has-text("Присоединиться к совещанию")',
-                    state='visible',
-                    timeout=3000
-                )
-                if join_button_test:
-                    self.logger.info("✅ Join button already visible - name was remembered! Skipping to Step 3.")
-                    skip_name_entry = True
-            except Exception:
+            skip_name_entry = await page.locator(f"{JOIN_MEETING_SELECTOR} >> visible=true").count() > 0
+            if skip_name_entry:
+                self.logger.info("✅ Join button already visible - name was remembered! Skipping to Step 3.")
+            else:
                 self.logger.info("Join button not visible yet - proceeding with name entry flow")
-                skip_name_entry = False
 
             # If join button is NOT visible, we need to enter the name first
             if not skip_name_entry:
                 # Step 1: Enter name in the input field
                 self.logger.info("Entering name (first visit)...")
                 name_entered = False
-                name_selectors = [
-                    'input[type="text"]',  # Primary - generic text input
-                    'input[placeholder*="имя"]',  # Backup - contains "имя" in placeholder
-                    'input.form-control',  # Fallback - common CSS class
-                    'input'  # Last resort - any input
-                ]
-
-                for selector in name_selectors:
+                for selector in NAME_SELECTORS:
                     try:
                         self.logger.info(f"Waiting for name input field: {selector}")
-                        element = page.wait_for_selector(selector, state='visible', timeout=10000)
-                        if element:
-                            self.logger.info(f"Found name input field: {selector}")
-                            # Clear field first, then fill with sender_email
-                            element.fill('')
-                            element.fill(meeting.sender_email)
-                            self.logger.info(f"Entered name: {meeting.sender_email}")
-                            name_entered = True
-                            break
+                        element = page.locator(selector).first
+                        await element.wait_for(state='visible')
+                        self.logger.info(f"Found name input field: {selector}")
+                        # Fill with sender_email - fill() replaces any remembered value
+                        await element.fill(meeting.sender_email)
+                        self.logger.info(f"Entered name: {meeting.sender_email}")
+                        name_entered = True
+                        break
                     except Exception as e:
-                        self.logger.debug(f"Selector {selector} failed: {e}")
+                        if self.logger.isEnabledFor(logging.DEBUG):
+                            self.logger.debug(f"Selector {selector} failed: {e}")
                         continue
 
                 if not name_entered:
                     self.logger.error("Could not find name input field!")
+                    await self._failure_screenshot(page, meeting)
                     return False
 
-                # Wait a bit after entering name
-                page.wait_for_timeout(1000)
-
-                # Step 2: Click "Введите отображаемое имя" button
-                button_clicked = False
-                submit_name_selectors = [
-                    'button:has-text("Введите отображаемое имя")',  # Primary - exact text match
-                    'button:has-text("отображаемое имя")',  # Backup - partial text
-                    'button[type="submit"]',  # Fallback - submit button
-                    'button.btn-primary'  # Common CSS class
-                ]
-
-                for selector in submit_name_selectors:
-                    try:
-                        self.logger.info(f"Waiting for submit name button: {selector}")
-                        element = page.wait_for_selector(selector, state='visible', timeout=10000)
-                        if element:
+                # Step 2: Submit the name with Enter; the "Введите отображаемое имя"
+                # button is only a fallback for when the form ignores the key press
+                # (skipped for an hour once Enter did not work on this host)
+                name_submitted = False
+                if not self.prompt_missing(page, 'name_enter'):
+                    await element.press('Enter')
+                    self.logger.info("Submitted name with Enter")
+                    name_submitted = await self.wait_for_any(page, (JOIN_MEETING_SELECTOR,), timeout=3000)
+                    if not name_submitted:
+                        # A slow join screen is not a missed key press - if the form
+                        # is gone, Enter worked and Step 3 waits for the button
+                        name_submitted = not await element.is_visible()
+                    self.remember_prompt(page, 'name_enter', name_submitted)
+
+                if not name_submitted:
+                    for selector in SUBMIT_NAME_SELECTORS:
+                        try:
+                            self.logger.info(f"Waiting for submit name button: {selector}")
+                            element = page.locator(selector).first
+                            await element.wait_for(state='visible')
                             self.logger.info(f"Found submit name button: {selector}")
-                            element.click()
+                            # The next wait checks for the join screen itself
+                            await element.click(no_wait_after=True, timeout=5000)
                             self.logger.info(f"Clicked submit name button")
-                            button_clicked = True
+                            name_submitted = True
                             break
-                    except Exception as e:
-                        self.logger.debug(f"Selector {selector} failed: {e}")
-                        continue
-
-                if not button_clicked:
-                    self.logger.error("Could not find or click submit name button!")
-                    return False
+                        except Exception as e:
+                            if self.logger.isEnabledFor(logging.DEBUG):
+                                self.logger.debug(f"Selector {selector} failed: {e}")
+                            continue
 
-                # Wait for join meeting screen to load
-                self.logger.info("Waiting for join meeting screen to load...")
-                page.wait_for_timeout(3000)
+                    if not name_submitted:
+                        self.logger.error("Could not find or click submit name button!")
+                        await self._failure_screenshot(page, meeting)
+                        return False
 
-            # Take screenshot of step 2
-            try:
-                screenshot_path = f"data/meetings/mra_gpb_step2_{meeting.id[:8]}.png"
-                page.screenshot(path=screenshot_path)
-                self.logger.info(f"Screenshot saved: {screenshot_path}")
-            except Exception as e:
-                self.logger.warning(f"Could not save screenshot: {e}")
+                    # Wait for join meeting screen to load
+                    self.logger.info("Waiting for join meeting screen to load...")
+                    await self.wait_for_any(page, (JOIN_MEETING_SELECTOR,), timeout=9000)
 
             # Step 3: Click "Присоединиться к совещанию" (Join meeting) button
-            # Wait longer for page to fully render
-            page.wait_for_timeout(2000)
 
             join_clicked = False
-            join_selectors = [
-                'button:has-text("Присоединиться к совещанию")',  # Primary - exact text
-                'button:has-text("Присоединиться")',  # Backup - partial text
-                'button:has-text("совещанию")',  # Fallback - contains "meeting"
-                'button.btn-success',  # Common green button class
-                'button[type="button"]',  # Any button
-            ]
-
-            for selector in join_selectors:
+            for selector in JOIN_SELECTORS:
                 try:
                     self.logger.info(f"Waiting for join meeting button: {selector}")
-                    element = page.wait_for_selector(selector, state='visible', timeout=15000)
-                    if element:
-                        self.logger.info(f"Found join meeting button: {selector}")
-
-                        # Scroll to button to ensure it's in view
-                        element.scroll_into_view_if_needed()
-                        page.wait_for_timeout(500)
-
-                        # Click the button
-                        element.click()
-                        self.logger.info(f"Clicked join meeting button")
-                        join_clicked = True
-                        break
+                    element = page.locator(selector).first
+                    await element.wait_for(state='visible', timeout=15000)
+                    self.logger.info(f"Found join meeting button: {selector}")
+
+                    # Scroll to button to ensure it's in view
+                    await element.scroll_into_view_if_needed()
+                    await page.wait_for_timeout(300)
+
+                    # Click the button - BrowserJoiner waits for the meeting UI afterwards
+                    await element.click(no_wait_after=True, timeout=5000)
+                    self.logger.info(f"Clicked join meeting button")
+                    join_clicked = True
+                    break
                 except Exception as e:
-                    self.logger.debug(f"Selector {selector} failed: {e}")
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"Selector {selector} failed: {e}")
                     continue
 
             if not join_clicked:
                 self.logger.error("Could not find or click join meeting button!")
+                await self._failure_screenshot(page, meeting)
                 return False
 
-            # Wait for meeting interface to load
-            self.logger.info("Waiting for meeting interface to load...")
-            page.wait_for_timeout(5000)
+            # BrowserJoiner waits for the meeting interface before recording
 
             # Take final screenshot
-            try:
-                screenshot_path = f"data/meetings/mra_gpb_joined_{meeting.id[:8]}.png"
-                page.screenshot(path=screenshot_path)
-                self.logger.info(f"Screenshot saved: {screenshot_path}")
-            except Exception as e:
-                self.logger.warning(f"Could not save screenshot: {e}")
+            self._debug_screenshot(page, meeting, 'joined')
 
             self.logger.info(f"Successfully joined MRA Gazprombank meeting: {meeting.id}")
             return True
@@ -189,3 +186,13 @@ class MRAGazprombankHandler(BasePlatformHandler):
         except Exception as e:
             self.logger.error(f"Failed to join MRA Gazprombank meeting: {e}", exc_info=True)
             return False
+
+    def _debug_screenshot(self, page: Page, meeting: MeetingInvitation, label: str):
+        """Save mra_gpb_<label>_<id>.jpg in the background if debug screenshots are on"""
+        return self.save_screenshot(page, f"data/meetings/mra_gpb_{label}_{meeting.id[:8]}.jpg")
+
+    async def _failure_screenshot(self, page: Page, meeting: MeetingInvitation) -> None:
+        """Capture the page a step failed on before the caller releases it"""
+        task = self._debug_screenshot(page, meeting, 'failed')
+        if task:
+            await task
@@ -2,19 +2,51 @@
 PSBank Meeting Handler - Priority 2
 Handler for meeting.psbank.ru platform
 """
-from playwright.sync_api import Page
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
-from platform_handlers.base_handler import BasePlatformHandler
+from .base_handler import BasePlatformHandler
 from models import MeetingInvitation
 
 
+# Candidate selectors per element, catch-alls in a later entry (see run_steps)
+
+PASSWORD_SELECTOR = 'input[type="password"]'
+
+# Submit/enter button of the password screen
+PASSWORD_SUBMIT_SELECTORS = (
+    ', '.join((
+        'button:has-text("Enter")',
+        'button:has-text("Войти")',
+        '.submit-button',
+    )),
+    'button[type="submit"]',
+)
+
+NAME_SELECTORS = (
+    ', '.join((
+        'input[placeholder*="name"]',
+        'input[placeholder*="имя"]',
+        'input[name="displayName"]',
+        'input[name="name"]',
+    )),
+    'input[type="text"]',
+)
+
+JOIN_SELECTORS = (
+    ', '.join((
+        'button:has-text("Join")',
+        'button:has-text("Войти")',
+        'button:has-text("Присоединиться")',
+        '.join-button',
+    )),
+    'button[type="submit"]',
+)
+
+
 class PSBankMeetingHandler(BasePlatformHandler):
     """Handler for meeting.psbank.ru platform"""
 
-    def join(self, page: Page, meeting: MeetingInvitation) -> bool:
+    async def join(self, page: Page, meeting: MeetingInvitation) -> bool:
         """
         Navigate to PSBank meeting and join
 
@@ -29,69 +61,55 @@ class PSBankMeetingHandler(BasePlatformHandler):
             self.logger.info(f"Joining PSBank meeting: {meeting.meeting_link}")
 
             # Navigate to meeting
-            page.goto(meeting.meeting_link, wait_until='networkidle', timeout=30000)
-
-            # Wait for page to load
-            page.wait_for_timeout(3000)
-
-            # Check if password is required
-            password_input = page.query_selector('input[type="password"]')
-            if password_input and meeting.password:
+            await page.goto(meeting.meeting_link, wait_until='domcontentloaded')
+
+            password_input = page.locator(PASSWORD_SELECTOR).first
+            # Any name field signals the form - the entry to fill is picked below
+            name_input = page.locator(', '.join(NAME_SELECTORS)).first
+
+            # Race the password screen against the name form - whichever renders first
+            try:
+                await password_input.or_(name_input).first.wait_for(state='visible', timeout=15000)
+            except PlaywrightTimeoutError:
+                self.logger.warning("Neither the password nor the name form appeared within 15000 ms")
+
+            # Check if password is required - the race resolved on whichever screen
+            # rendered, so one visibility check tells the two apart (a hidden
+            # password field left in the DOM does not count)
+            if meeting.password and await password_input.is_visible():
                 self.logger.info("Entering meeting password")
-                self.enter_password(page, meeting.password, 'input[type="password"]')
+                await password_input.fill(meeting.password)
 
                 # Click submit/enter button
-                submit_selectors = [
-                    'button[type="submit"]',
-                    'button:has-text("Enter")',
-                    'button:has-text("Войти")',
-                    '.submit-button'
-                ]
-
-                for selector in submit_selectors:
+                submit_button = await self.first_present(page, PASSWORD_SUBMIT_SELECTORS)
+                if submit_button is not None:
                     try:
-                        if page.query_selector(selector):
-                            page.click(selector, timeout=3000)
-                            break
-                    except:
-                        continue
+                        await submit_button.click(timeout=3000)
+                    except PlaywrightTimeoutError:
+                        pass
 
-                page.wait_for_timeout(2000)
+                # Wait for the name form that follows the password screen
+                try:
+                    await name_input.wait_for(state='visible', timeout=6000)
+                except PlaywrightTimeoutError:
+                    self.logger.warning("Name form did not appear after the password screen")
 
             # Look for name input
-            name_selectors = [
-                'input[placeholder*="name"]',
-                'input[placeholder*="имя"]',
-                'input[name="displayName"]',
-                'input[name="name"]',
-                'input[type="text"]'
-            ]
-
-            for selector in name_selectors:
-                if page.query_selector(selector):
-                    self.enter_name(page, meeting.sender_name, selector)
-                    break
+            name_input = await self.first_present(page, NAME_SELECTORS)
+            if name_input is not None:
+                await name_input.fill(meeting.sender_name)
+                self.logger.debug(f"Entered name: {meeting.sender_name}")
 
             # Look for join button
-            join_selectors = [
-                'button:has-text("Join")',
-                'button:has-text("Войти")',
-                'button:has-text("Присоединиться")',
-                'button[type="submit"]',
-                '.join-button'
-            ]
-
-            for selector in join_selectors:
+            join_button = await self.first_present(page, JOIN_SELECTORS)
+            if join_button is not None:
                 try:
-                    if page.query_selector(selector):
-                        self.logger.info(f"Found join button: {selector}")
-                        page.click(selector, timeout=5000)
-                        break
-                except:
-                    continue
-
-            # Wait for meeting interface
-            page.wait_for_timeout(5000)
+                    self.logger.info("Found join button")
+                    await join_button.click(timeout=5000)
+                except PlaywrightTimeoutError:
+                    pass
+
+            # BrowserJoiner waits for the meeting interface before recording
 
             self.logger.info(f"Successfully joined PSBank meeting: {meeting.id}")
             return True
@@ -2,19 +2,56 @@
 Telemost Yandex Handler
 Handler for Yandex Telemost meetings
 """
-from playwright.sync_api import Page
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
-from platform_handlers.base_handler import BasePlatformHandler
+from .base_handler import BasePlatformHandler
 from models import MeetingInvitation
 
 
+# Candidate selectors, joined once into a single selector list per element
+
+# "Continue in browser" button
+CONTINUE_SELECTOR = ', '.join((
+    'button:has-text("Продолжить в браузере")',
+    'button:has-text("Continue in browser")',
+    'a:has-text("Продолжить в браузере")',
+    'a:has-text("Continue in browser")',
+))
+
+# Name/email input field, tried in order: specific fields first,
+# the generic inputs only if none of them is visible
+NAME_SELECTORS = (
+    ', '.join((
+        'input[placeholder*="имя"]',
+        'input[placeholder*="Имя"]',
+        'input[placeholder*="name"]',
+        'input[name="name"]',
+        'input[name="displayName"]',
+    )),
+    ', '.join((
+        'input[type="text"]',
+        'input.input',  # Generic input class
+        'input',  # Last resort - any input
+    )),
+)
+
+# Join/connect button, the generic submit button only if no labelled one is present
+JOIN_SELECTORS = (
+    ', '.join((
+        'button:has-text("Подключиться")',  # Connect button
+        'button:has-text("Войти")',
+        'button:has-text("Присоединиться")',
+        'button:has-text("Join")',
+        '.join-button',
+    )),
+    'button[type="submit"]',
+)
+
+
 class TelemostYandexHandler(BasePlatformHandler):
     """Handler for Telemost Yandex platform"""
 
-    def join(self, page: Page, meeting: MeetingInvitation) -> bool:
+    async def join(self, page: Page, meeting: MeetingInvitation) -> bool:
         """
         Navigate to Yandex Telemost meeting and join
 
@@ -28,82 +65,58 @@ class TelemostYandexHandler(BasePlatformHandler):
         try:
             self.logger.info(f"Joining Yandex Telemost meeting: {meeting.meeting_link}")
 
-            # Navigate to meeting
-            page.goto(meeting.meeting_link, wait_until='networkidle', timeout=30000)
+            # Navigate to meeting - return as soon as the server responds; the
+            # page keeps loading analytics and WebRTC probes long after it is usable
+            await page.goto(meeting.meeting_link, wait_until='commit')
 
-            page.wait_for_timeout(3000)
+            # Locators are built once and reused by every wait, probe and action below
+            continue_button = page.locator(CONTINUE_SELECTOR).first
+            name_inputs = [page.locator(f"{selector} >> visible=true").first for selector in NAME_SELECTORS]
+            any_join_button = page.locator(', '.join(JOIN_SELECTORS)).first
+
+            # The landing page is ready once one of its controls is visible
+            try:
+                await continue_button.or_(name_inputs[0]).first.wait_for(state='visible', timeout=15000)
+            except PlaywrightTimeoutError:
+                self.logger.warning("Landing page controls did not appear within 15000 ms")
 
             # Click "Continue in browser" button if present
-            continue_selectors = [
-                'button:has-text("Продолжить в браузере")',
-                'button:has-text("Continue in browser")',
-                'a:has-text("Продолжить в браузере")',
-                'a:has-text("Continue in browser")'
-            ]
-
-            for selector in continue_selectors:
+            if await continue_button.count():
                 try:
-                    if page.query_selector(selector):
-                        self.logger.info(f"Clicking 'Continue in browser' button: {selector}")
-                        page.click(selector, timeout=5000)
-                        page.wait_for_timeout(3000)
-                        break
-                except:
-                    continue
+                    self.logger.info("Clicking 'Continue in browser' button")
+                    await continue_button.click(timeout=5000)
+                    await name_inputs[0].or_(any_join_button).first.wait_for(state='visible', timeout=9000)
+                except PlaywrightTimeoutError:
+                    pass
 
             # Yandex Telemost may require Yandex account login (handled by persistent profile)
 
             # Look for name/email input field (use sender_email as display name)
-            name_selectors = [
-                'input[placeholder*="имя"]',
-                'input[placeholder*="Имя"]',
-                'input[placeholder*="name"]',
-                'input[name="name"]',
-                'input[name="displayName"]',
-                'input[type="text"]',
-                'input.input',  # Generic input class
-                'input'  # Last resort - any input
-            ]
-
             name_entered = False
-            for selector in name_selectors:
+            for selector, name_input in zip(NAME_SELECTORS, name_inputs):
                 try:
-                    element = page.query_selector(selector)
-                    if element and element.is_visible():
+                    if await name_input.count():
                         # Use sender_email as the display name
                         self.logger.info(f"Entering sender_email into name field: {selector}")
-                        self.enter_name(page, meeting.sender_email, selector)
-                        page.wait_for_timeout(1000)
+                        await name_input.fill(meeting.sender_email)
                         name_entered = True
                         break
-                except:
+                except PlaywrightTimeoutError:
                     continue
 
             if not name_entered:
                 self.logger.warning("No visible name input field found, proceeding without entering name")
 
             # Click join/connect button
-            join_selectors = [
-                'button:has-text("Подключиться")',  # Connect button
-                'button:has-text("Войти")',
-                'button:has-text("Присоединиться")',
-                'button:has-text("Join")',
-                'button[type="submit"]',
-                '.join-button'
-            ]
-
-            for selector in join_selectors:
+            join_button = await self.first_present(page, JOIN_SELECTORS)
+            if join_button is not None:
                 try:
-                    if page.query_selector(selector):
-                        self.logger.info(f"Clicking join button: {selector}")
-                        page.click(selector, timeout=5000)
-                        page.wait_for_timeout(3000)
-                        break
-                except:
-                    continue
+                    self.logger.info("Clicking join button")
+                    await join_button.click(timeout=5000)
+                except PlaywrightTimeoutError:
+                    pass
 
-            # Wait for meeting to load
-            page.wait_for_timeout(5000)
+            # BrowserJoiner waits for the meeting interface before recording
 
             self.logger.info(f"Successfully joined Yandex Telemost meeting: {meeting.id}")
             return True
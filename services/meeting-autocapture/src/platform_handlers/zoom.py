@@ -2,19 +2,66 @@
 Zoom Handler
 Handler for Zoom meetings
 """
-from playwright.sync_api import Page
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from playwright.async_api import Page
 
-from platform_handlers.base_handler import BasePlatformHandler
+from .base_handler import BasePlatformHandler
 from models import MeetingInvitation
 
 
+# Candidate selectors per element, catch-alls in a later entry (see run_steps)
+
+# "Join from Browser" link
+BROWSER_JOIN_SELECTOR = ', '.join((
+    'a:has-text("Join from Your Browser")',
+    'a:has-text("join from your browser")',
+    '.join-from-browser',
+))
+
+NAME_SELECTORS = (
+    ', '.join((
+        'input#inputname',
+        'input[placeholder*="name"]',
+    )),
+    'input[type="text"]',
+)
+
+JOIN_SELECTOR = ', '.join((
+    'button:has-text("Join")',
+    'button#joinBtn',
+    '.join-audio-by-voip__join-btn',
+))
+
+# "Join Audio" or "Join with Computer Audio"
+AUDIO_SELECTOR = ', '.join((
+    'button:has-text("Join with Computer Audio")',
+    'button:has-text("Join Audio")',
+    '.join-audio-by-voip__join-btn',
+))
+
+
 class ZoomHandler(BasePlatformHandler):
     """Handler for Zoom platform"""
 
-    def join(self, page: Page, meeting: MeetingInvitation) -> bool:
+    in_meeting_selectors = (
+        'button.footer__leave-btn',
+        'button[aria-label*="Leave"]',
+    )
+
+    join_steps = (
+        ('goto', None, 'meeting_link', None),
+        # Wait for the landing page instead of sleeping
+        ('wait', BROWSER_JOIN_SELECTOR + ', input#inputname', None, 15000),
+        ('click', BROWSER_JOIN_SELECTOR, None, 5000),
+        ('wait', NAME_SELECTORS, None, 6000),
+        ('fill', NAME_SELECTORS, 'sender_name', None),
+        ('click', JOIN_SELECTOR, None, 5000),
+        # Handle audio/video permissions dialog - waited for on every join, not
+        # skipped via the missing-prompt cache: without it nothing is recorded
+        ('wait', AUDIO_SELECTOR, None, 3000),
+        ('click', AUDIO_SELECTOR, None, 5000),
+    )
+
+    async def join(self, page: Page, meeting: MeetingInvitation) -> bool:
         """
         Navigate to Zoom meeting and join
 
@@ -27,76 +74,9 @@ class ZoomHandler(BasePlatformHandler):
         """
         try:
             self.logger.info(f"Joining Zoom meeting: {meeting.meeting_link}")
+            await self.run_steps(page, meeting, self.join_steps)
 
-            # Navigate to meeting
-            page.goto(meeting.meeting_link, wait_until='networkidle', timeout=30000)
-
-            page.wait_for_timeout(3000)
-
-            # Look for "Join from Browser" link
-            browser_join_selectors = [
-                'a:has-text("Join from Your Browser")',
-                'a:has-text("join from your browser")',
-                '.join-from-browser'
-            ]
-
-            for selector in browser_join_selectors:
-                try:
-                    if page.query_selector(selector):
-                        self.logger.info("Clicking 'Join from Browser'")
-                        page.click(selector, timeout=5000)
-                        page.wait_for_timeout(2000)
-                        break
-                except:
-                    continue
-
-            # Enter name
-            name_selectors = [
-                'input#inputname',
-                'input[placeholder*="name"]',
-                'input[type="text"]'
-            ]
-
-            for selector in name_selectors:
-                if page.query_selector(selector):
-                    self.enter_name(page, meeting.sender_name, selector)
-                    break
-
-            # Click join button
-            join_selectors = [
-                'button:has-text("Join")',
-                'button#joinBtn',
-                '.join-audio-by-voip__join-btn'
-            ]
-
-            for selector in join_selectors:
-                try:
-                    if page.query_selector(selector):
-                        self.logger.info(f"Clicking join button: {selector}")
-                        page.click(selector, timeout=5000)
-                        page.wait_for_timeout(3000)
-                        break
-                except:
-                    continue
-
-            # Handle audio/video permissions dialog
-            try:
-                # Look for "Join Audio" or "Join with Computer Audio"
-                audio_selectors = [
-                    'button:has-text("Join with Computer Audio")',
-                    'button:has-text("Join Audio")',
-                    '.join-audio-by-voip__join-btn'
-                ]
-
-                for selector in audio_selectors:
-                    if page.query_selector(selector):
-                        page.click(selector, timeout=5000)
-                        break
-            except:
-                pass
-
-            # Wait for meeting to load
-            page.wait_for_timeout(5000)
+            # BrowserJoiner waits for in_meeting_selectors before recording
 
             self.logger.info(f"Successfully joined Zoom meeting: {meeting.id}")
             return True
@@ -5,31 +5,86 @@ Phase 3 of Meeting Auto Capture
 from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime, timedelta, timezone
 import os
-import json
 import shutil
 import logging
-from typing import Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import FileSystemEventHandler
 
 from models import MeetingInvitation
+from meeting_parser import dumps_json, INVALID_FILENAME_CHARS_RE, HYPHENS_RE
+
+# Folder that new meeting JSONs are saved into
+PENDING_DIR = "data/meetings/pending"
+
+# Rescan interval of the polling watcher (MAC_WATCH_MODE=poll), for network
+# shares where inotify/ReadDirectoryChangesW events are not delivered
+POLL_WATCH_INTERVAL = 60
+
+# Parallel file reads in load_pending_meetings (hides network share latency)
+LOAD_WORKERS = 8
+
+
+class PendingMeetingHandler(FileSystemEventHandler):
+    """File system event handler for meeting JSONs dropped into pending/"""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def on_created(self, event):
+        """Called when a file is created"""
+        if not event.is_directory and event.src_path.endswith('.json'):
+            self.callback(event.src_path)
+
+    def on_moved(self, event):
+        """Called when a file is renamed into place (atomic writes)"""
+        if not event.is_directory and event.dest_path.endswith('.json'):
+            self.callback(event.dest_path)
 
 
 class MeetingScheduler:
     """Schedule meeting joins and recording stops"""
 
-    def __init__(self, browser_joiner, video_manager):
+    def __init__(self, browser_joiner, video_manager, watch_mode: str = 'native'):
         """
         Initialize scheduler
 
         Args:
             browser_joiner: BrowserJoiner instance
             video_manager: VideoManager instance
+            watch_mode: 'native' for OS file events on pending/, 'poll' to rescan it
         """
         self.scheduler = BackgroundScheduler()
         self.browser_joiner = browser_joiner
         self.video_manager = video_manager
-        self.active_sessions: Dict[str, any] = {}  # meeting_id -> browser context
+        self.video_manager.set_meeting_store(self)
+        self.watch_mode = watch_mode
+        self.observer = None
+        self.active_sessions: Dict[str, Tuple[any, MeetingInvitation]] = {}  # meeting_id -> (browser context, meeting)
         self.logger = logging.getLogger(__name__)
 
+        # Parsed meeting JSONs: filepath -> (st_mtime_ns, meeting), so an
+        # unchanged file is parsed only once
+        self._meeting_cache: Dict[str, Tuple[int, MeetingInvitation]] = {}
+
+        # Known meeting files: status -> meeting_id -> filepath, so lookups
+        # do not have to scan the (ever growing) status folders
+        self._file_index: Dict[str, Dict[str, str]] = {
+            'pending': {}, 'in_progress': {}, 'completed': {}
+        }
+
+        # Status folders are created once here; moves and scans rely on them
+        for status in self._file_index:
+            os.makedirs(f"data/meetings/{status}", exist_ok=True)
+
+        # A meeting can be scheduled twice (email callback + file event);
+        # only the first join job to fire joins it
+        self._join_lock = threading.Lock()
+        self._joined_ids = set()
+
         # Configuration from environment (will be set by main.py)
         self.pre_join_minutes = 2
         self.post_buffer_minutes = 5
@@ -38,86 +93,93 @@ class MeetingScheduler:
         """Start scheduler and load pending meetings"""
         self.logger.info("Starting meeting scheduler...")
 
-        # Load existing pending meetings
-        self.load_pending_meetings()
+        # Watch before loading so files dropped in between are not missed
+        self.start_watching()
 
-        # Start background scheduler with minute-level checking
-        self.scheduler.add_job(
-            self.check_meetings,
-            'interval',
-            minutes=1,
-            id='meeting_checker',
-            replace_existing=True
-        )
+        # Load existing pending meetings (each one gets its own join job)
+        self.load_pending_meetings()
 
         self.scheduler.start()
         self.logger.info("Scheduler started successfully")
 
+    def start_watching(self):
+        """Start file system watcher that schedules meetings dropped into pending/"""
+        if self.watch_mode == 'poll':
+            self.observer = PollingObserver(timeout=POLL_WATCH_INTERVAL)
+        else:
+            self.observer = Observer()
+
+        self.observer.schedule(PendingMeetingHandler(self._on_meeting_file), PENDING_DIR, recursive=False)
+        self.observer.start()
+
+        self.logger.info(f"Watching pending meetings folder ({self.watch_mode}): {PENDING_DIR}")
+
+    def _on_meeting_file(self, filepath: str):
+        """
+        Callback when a meeting JSON appears in pending/
+
+        Args:
+            filepath: Path to the meeting JSON
+        """
+        meeting = self._load_meeting_from_file(filepath)
+        if meeting:
+            self._file_index['pending'][meeting.id] = filepath
+            self.schedule_meeting(meeting)
+
     def load_pending_meetings(self):
         """Load all pending meeting JSONs and schedule them"""
-        pending_dir = "data/meetings/pending"
+        pending_dir = PENDING_DIR
 
-        if not os.path.exists(pending_dir):
-            self.logger.info("No pending meetings directory found")
+        # scandir returns file types with the names - no extra stat per entry
+        with os.scandir(pending_dir) as it:
+            json_files = [entry.path for entry in it
+                          if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False)]
+        self.logger.info(f"Loading {len(json_files)} pending meetings")
+        if not json_files:
             return
 
-        json_files = [f for f in os.listdir(pending_dir) if f.endswith('.json')]
-        self.logger.info(f"Loading {len(json_files)} pending meetings")
+        # Parse files in parallel; _load_meeting_from_file logs and returns None on errors
+        with ThreadPoolExecutor(max_workers=min(len(json_files), LOAD_WORKERS)) as executor:
+            meetings = list(executor.map(self._load_meeting_from_file, json_files))
 
-        for filename in json_files:
+        for filepath, meeting in zip(json_files, meetings):
             try:
-                filepath = os.path.join(pending_dir, filename)
-                meeting = self._load_meeting_from_file(filepath)
-
                 if meeting:
                     self.logger.info(f"Loaded pending meeting: {meeting.subject} at {meeting.start_time}")
+                    self._file_index['pending'][meeting.id] = filepath
+                    self.schedule_meeting(meeting)
 
             except Exception as e:
-                self.logger.error(f"Error loading meeting {filename}: {e}")
+                self.logger.error(f"Error scheduling meeting {filepath}: {e}")
 
-    def check_meetings(self):
+    def schedule_meeting(self, meeting: MeetingInvitation):
         """
-        Check if any meetings need to join (runs every minute)
-        """
-        now = datetime.now().astimezone()  # Get current time in local timezone
-        pending_dir = "data/meetings/pending"
+        Schedule a one-shot join job N minutes before the meeting starts
 
-        self.logger.debug(f"Checking meetings at {now}")
+        Meetings whose join time has already passed are joined right away.
 
-        if not os.path.exists(pending_dir):
-            self.logger.warning(f"Pending directory does not exist: {pending_dir}")
+        Args:
+            meeting: MeetingInvitation object
+        """
+        if meeting.status != 'pending':
+            self.logger.debug(f"Skipping meeting {meeting.subject} - status is {meeting.status}")
             return
 
-        for filename in os.listdir(pending_dir):
-            if not filename.endswith('.json'):
-                continue
+        join_time = meeting.start_time - timedelta(minutes=self.pre_join_minutes)
 
-            try:
-                filepath = os.path.join(pending_dir, filename)
-                meeting = self._load_meeting_from_file(filepath)
-
-                if not meeting:
-                    self.logger.warning(f"Could not load meeting from {filename}")
-                    continue
-
-                if meeting.status != 'pending':
-                    self.logger.debug(f"Skipping meeting {meeting.subject} - status is {meeting.status}")
-                    continue
-
-                # Calculate join time (N minutes before start)
-                join_time = meeting.start_time - timedelta(minutes=self.pre_join_minutes)
-
-                self.logger.debug(f"Meeting {meeting.subject}: now={now}, join_time={join_time}, start_time={meeting.start_time}")
+        # misfire_grace_time=None runs join times that are already in the past
+        # (service restarted late, invitation received after the pre-join window)
+        self.scheduler.add_job(
+            self.trigger_join,
+            'date',
+            run_date=join_time,
+            args=[meeting],
+            id=f'join_{meeting.id}',
+            replace_existing=True,
+            misfire_grace_time=None
+        )
 
-                # Check if it's time to join
-                if now >= join_time:
-                    self.logger.info(f"Time to join meeting: {meeting.subject}")
-                    self.trigger_join(meeting)
-                else:
-                    self.logger.debug(f"Not yet time to join {meeting.subject} (need to wait {(join_time - now).total_seconds():.0f} seconds)")
-
-            except Exception as e:
-                self.logger.error(f"Error checking meeting {filename}: {e}", exc_info=True)
+        self.logger.info(f"Scheduled join for {meeting.id} at {join_time}")
 
     def trigger_join(self, meeting: MeetingInvitation):
         """
@@ -126,6 +188,12 @@ class MeetingScheduler:
         Args:
             meeting: MeetingInvitation object
         """
+        with self._join_lock:
+            if meeting.id in self._joined_ids:
+                self.logger.debug(f"Meeting {meeting.id} already joined, skipping duplicate job")
+                return
+            self._joined_ids.add(meeting.id)
+
         try:
             self.logger.info(f"Triggering join for meeting: {meeting.id}")
 
@@ -136,12 +204,14 @@ class MeetingScheduler:
             # Register meeting with video manager
             self.video_manager.register_meeting(meeting)
 
-            # Start browser session and join meeting
-            context = self.browser_joiner.join_meeting(meeting)
+            # Start browser session and join meeting (runs on the browser event loop)
+            context = self.browser_joiner.submit(
+                self.browser_joiner.join_meeting(meeting)
+            ).result()
 
             if context:
                 # Store session
-                self.active_sessions[meeting.id] = context
+                self.active_sessions[meeting.id] = (context, meeting)
 
                 # Schedule stop recording
                 if meeting.end_time:
@@ -180,17 +250,14 @@ class MeetingScheduler:
         try:
             self.logger.info(f"Triggering stop for meeting: {meeting_id}")
 
-            # Load meeting first
-            meeting = self._load_meeting(meeting_id, 'in_progress')
-            if not meeting:
-                self.logger.error(f"Meeting {meeting_id} not found in in_progress")
-                return
-
-            if meeting_id in self.active_sessions:
-                context = self.active_sessions[meeting_id]
+            session = self.active_sessions.get(meeting_id)
+            if session:
+                context, meeting = session
 
                 # Stop recording (now returns video file path)
-                video_path = self.browser_joiner.stop_recording(context, meeting)
+                video_path = self.browser_joiner.submit(
+                    self.browser_joiner.stop_recording(context, meeting)
+                ).result()
 
                 # Update meeting with video path
                 if video_path:
@@ -199,6 +266,15 @@ class MeetingScheduler:
 
                 # Remove from active sessions
                 del self.active_sessions[meeting_id]
+            else:
+                # No browser session left (already stopped) - just close the JSON out
+                meeting = self._load_meeting(meeting_id, 'in_progress')
+                if not meeting:
+                    self.logger.error(f"Meeting {meeting_id} not found in in_progress")
+                    return
+
+            # The video path is final - stop watching for it
+            self.video_manager.unregister_meeting(meeting_id)
 
             # Update status
             meeting.status = 'completed'
@@ -210,6 +286,32 @@ class MeetingScheduler:
         except Exception as e:
             self.logger.error(f"Error stopping meeting {meeting_id}: {e}")
 
+    def get_meeting(self, meeting_id: str) -> Optional[MeetingInvitation]:
+        """
+        Load a started meeting (in progress or completed) by ID
+
+        Args:
+            meeting_id: Meeting ID
+
+        Returns:
+            MeetingInvitation or None if not found
+        """
+        for status in ('in_progress', 'completed'):
+            if self._find_meeting_file(meeting_id, status):
+                return self._load_meeting(meeting_id, status)
+        return None
+
+    def save_meeting(self, meeting: MeetingInvitation):
+        """
+        Rewrite meeting JSON in the folder of its current status
+
+        Args:
+            meeting: MeetingInvitation object
+        """
+        # Failed meetings are kept in completed/ alongside the successful ones
+        status = 'completed' if meeting.status == 'failed' else meeting.status
+        self._move_meeting_json(meeting, status, status)
+
     def _find_meeting_file(self, meeting_id: str, status: str) -> Optional[str]:
         """
         Find meeting JSON file by ID in the given status folder
@@ -222,20 +324,28 @@ class MeetingScheduler:
         Returns:
             Full filepath if found, None otherwise
         """
+        index = self._file_index.setdefault(status, {})
+        filepath = index.get(meeting_id)
+        if filepath:
+            if os.path.exists(filepath):
+                return filepath
+            del index[meeting_id]
+
+        # Not indexed (left over from a previous run, short ID) - scan the folder
         folder = f"data/meetings/{status}"
-        if not os.path.exists(folder):
-            return None
 
-        # Get short ID (first 8 chars) for matching new format
-        id_short = meeting_id[:8]
+        # New format ends with the short ID (first 8 chars) - a suffix compare;
+        # old format files are named after the full ID
+        short_suffix = f"_{meeting_id[:8]}.json"
 
-        for filename in os.listdir(folder):
-            if not filename.endswith('.json'):
-                continue
+        with os.scandir(folder) as it:
+            for entry in it:
+                name = entry.name
+                if not (name.endswith(short_suffix) or (meeting_id in name and name.endswith('.json'))):
+                    continue
 
-            # Check if filename contains the ID (full or short)
-            if meeting_id in filename or id_short in filename:
-                return os.path.join(folder, filename)
+                if entry.is_file(follow_symlinks=False):
+                    return entry.path
 
         return None
 
@@ -248,17 +358,20 @@ class MeetingScheduler:
         return self._load_meeting_from_file(filepath)
 
     def _load_meeting_from_file(self, filepath: str) -> Optional[MeetingInvitation]:
-        """Load meeting from JSON file"""
+        """Load meeting from JSON file, reusing the parsed meeting while the file is unchanged"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Convert ISO datetime strings back to datetime objects
-            for key in ['start_time', 'end_time', 'created_at', 'processed_at']:
-                if key in data and data[key]:
-                    data[key] = datetime.fromisoformat(data[key])
-
-            return MeetingInvitation(**data)
+            mtime_ns = os.stat(filepath).st_mtime_ns
+            cached = self._meeting_cache.get(filepath)
+            if cached and cached[0] == mtime_ns:
+                # Callers update status fields, so each gets its own copy
+                return cached[1].model_copy()
+
+            # pydantic parses the JSON and the ISO datetime strings (including
+            # a 'Z' suffix) in one pass, without an intermediate dict
+            with open(filepath, 'rb') as f:
+                meeting = MeetingInvitation.model_validate_json(f.read())
+            self._meeting_cache[filepath] = (mtime_ns, meeting)
+            return meeting.model_copy()
 
         except Exception as e:
             self.logger.error(f"Error loading meeting from {filepath}: {e}")
@@ -269,13 +382,11 @@ class MeetingScheduler:
         Generate human-readable filename for meeting JSON
         Format: YYYYMMDD_HHMM_platform_subject_id.json
         """
-        import re
-
         def sanitize(text: str, max_len: int = 50) -> str:
             """Sanitize text for filename"""
-            text = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '', text)
+            text = INVALID_FILENAME_CHARS_RE.sub('', text)
             text = text.replace(' ', '-').replace('.', '-')
-            text = re.sub(r'-+', '-', text).strip('-')[:max_len]
+            text = HYPHENS_RE.sub('-', text).strip('-')[:max_len]
             return text or 'unnamed'
 
         time_str = meeting.start_time.strftime('%Y%m%d_%H%M')
@@ -306,22 +417,26 @@ class MeetingScheduler:
             dst_filename = self._generate_filename(meeting)
             dst = f"data/meetings/{to_status}/{dst_filename}"
 
-            # Ensure destination directory exists
-            os.makedirs(os.path.dirname(dst), exist_ok=True)
-
-            # Save updated meeting to destination
-            with open(dst, 'w', encoding='utf-8') as f:
-                data = meeting.model_dump()
-                # Convert datetime to ISO format
-                for key, value in data.items():
-                    if isinstance(value, datetime):
-                        data[key] = value.isoformat()
-
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            # Remove source file if it exists and is different from destination
-            if src and os.path.exists(src) and src != dst:
-                os.remove(src)
+            # Update the file in place, then rename it into the destination
+            # folder - the meeting exists in exactly one folder at any moment
+            target = src or dst
+            tmp_path = target + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                # mode='json' renders datetimes as ISO strings in pydantic-core
+                f.write(dumps_json(meeting.model_dump(mode='json')))
+            os.replace(tmp_path, target)
+
+            if src and src != dst:
+                try:
+                    os.replace(src, dst)
+                except OSError:
+                    # Status folders on different filesystems: copy + remove
+                    shutil.move(src, dst)
+
+            if src:
+                self._meeting_cache.pop(src, None)
+            self._file_index.setdefault(from_status, {}).pop(meeting.id, None)
+            self._file_index.setdefault(to_status, {})[meeting.id] = dst
 
             self.logger.debug(f"Moved meeting {meeting.id} from {from_status} to {to_status}")
 
@@ -332,13 +447,23 @@ class MeetingScheduler:
         """Stop scheduler"""
         self.logger.info("Stopping scheduler...")
 
-        # Stop all active sessions
-        for meeting_id, context in list(self.active_sessions.items()):
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+
+        # Stop all active sessions concurrently on the browser loop
+        futures = []
+        for context, meeting in list(self.active_sessions.values()):
             try:
-                # Load meeting to pass to stop_recording
-                meeting = self._load_meeting(meeting_id, 'in_progress')
-                if meeting:
+                futures.append(self.browser_joiner.submit(
                     self.browser_joiner.stop_recording(context, meeting)
+                ))
+            except:
+                pass
+
+        for future in futures:
+            try:
+                future.result()
             except:
                 pass
 
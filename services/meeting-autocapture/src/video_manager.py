@@ -4,41 +4,67 @@ Phase 7 of Meeting Auto Capture
 """
 import os
 import time
-import json
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from typing import Optional, Dict
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import PatternMatchingEventHandler
 
 from models import MeetingInvitation
 
+# Recording containers produced by BrowserJoiner (H.264 -> .mkv, VP9 -> .webm)
+VIDEO_EXTENSIONS = ('.mkv', '.webm')
 
-class VideoFileHandler(FileSystemEventHandler):
+
+class VideoFileHandler(PatternMatchingEventHandler):
     """File system event handler for video files"""
 
     def __init__(self, callback):
+        # watchdog drops other files and directories before calling back
+        super().__init__(patterns=[f'*{ext}' for ext in VIDEO_EXTENSIONS], ignore_directories=True)
         self.callback = callback
 
     def on_created(self, event):
-        """Called when a file is created"""
-        if not event.is_directory and event.src_path.endswith('.webm'):
-            self.callback(event.src_path)
+        """Called when a video file is created"""
+        self.callback(event.src_path)
+
+    def on_moved(self, event):
+        """Called when a file is renamed to a video file (e.g. from .part)"""
+        self.callback(event.dest_path)
 
 
 class VideoManager:
     """Track video file creation and link to meetings"""
 
-    def __init__(self, output_folder: str):
+    def __init__(self, output_folder: str, watch_mode: str = 'native'):
         """
         Initialize video manager
 
         Args:
             output_folder: Folder where extension saves videos
+            watch_mode: 'native' to wait for file events, 'poll' to rescan the folder
         """
         self.output_folder = output_folder
+        self.watch_mode = watch_mode
+        os.makedirs(self.output_folder, exist_ok=True)
+        self.observer = None
         self.logger = logging.getLogger(__name__)
         self.pending_meetings: Dict[str, MeetingInvitation] = {}  # meeting_id -> meeting
+        self.meeting_store = None  # MeetingScheduler, owns the meeting JSON files
+
+        # Set by the watcher when a meeting's video file appears
+        self._video_events: Dict[str, threading.Event] = {}  # meeting_id -> event
+        self._video_paths: Dict[str, str] = {}  # meeting_id -> video path
+
+    def set_meeting_store(self, meeting_store):
+        """
+        Set the component that loads and saves meeting JSONs
+
+        Args:
+            meeting_store: MeetingScheduler instance
+        """
+        self.meeting_store = meeting_store
 
     def register_meeting(self, meeting: MeetingInvitation):
         """
@@ -48,8 +74,20 @@ class VideoManager:
             meeting: MeetingInvitation object
         """
         self.pending_meetings[meeting.id] = meeting
+        self._video_events.setdefault(meeting.id, threading.Event())
         self.logger.info(f"Registered meeting for video monitoring: {meeting.id}")
 
+    def unregister_meeting(self, meeting_id: str):
+        """
+        Stop watching for a meeting's video file
+
+        Args:
+            meeting_id: Meeting ID
+        """
+        self.pending_meetings.pop(meeting_id, None)
+        self._video_events.pop(meeting_id, None)
+        self._video_paths.pop(meeting_id, None)
+
     def monitor_for_video(self, meeting_id: str, timeout: int = 300) -> Optional[str]:
         """
         Monitor output folder for video file matching meeting_id
@@ -61,28 +99,49 @@ class VideoManager:
         Returns:
             Path to video file or None if timeout
         """
-        start_time = time.time()
-
         self.logger.info(f"Monitoring for video file: {meeting_id} (timeout: {timeout}s)")
 
+        if self.observer is not None and self.watch_mode != 'poll':
+            return self._wait_for_video_event(meeting_id, timeout)
+
+        start_time = time.time()
+
         while time.time() - start_time < timeout:
-            if not os.path.exists(self.output_folder):
-                time.sleep(5)
-                continue
-
-            files = os.listdir(self.output_folder)
-            for file in files:
-                # Check if filename contains meeting ID
-                if meeting_id in file and file.endswith('.webm'):
-                    video_path = os.path.join(self.output_folder, file)
-                    self.logger.info(f"Found video file: {video_path}")
-                    return video_path
+            video_path = self._find_video(meeting_id)
+            if video_path:
+                self.logger.info(f"Found video file: {video_path}")
+                return video_path
 
             time.sleep(5)  # Check every 5 seconds
 
         self.logger.warning(f"Video file not found for meeting {meeting_id} after {timeout}s")
         return None
 
+    def _wait_for_video_event(self, meeting_id: str, timeout: int) -> Optional[str]:
+        """
+        Wait for the watcher to report the meeting's video file
+
+        Args:
+            meeting_id: Meeting ID to look for
+            timeout: Timeout in seconds
+
+        Returns:
+            Path to video file or None if timeout
+        """
+        event = self._video_events.setdefault(meeting_id, threading.Event())
+
+        # The file may have been created before the event was set up
+        video_path = self._video_paths.get(meeting_id) or self.check_for_video(meeting_id)
+        if video_path:
+            return video_path
+
+        if event.wait(timeout):
+            # The meeting may have been unregistered meanwhile, dropping the path
+            return self._video_paths.get(meeting_id) or self.check_for_video(meeting_id)
+
+        self.logger.warning(f"Video file not found for meeting {meeting_id} after {timeout}s")
+        return None
+
     def check_for_video(self, meeting_id: str) -> Optional[str]:
         """
         Check once if video file exists for meeting
@@ -93,22 +152,40 @@ class VideoManager:
         Returns:
             Path to video file or None
         """
-        if not os.path.exists(self.output_folder):
-            return None
-
         try:
-            files = os.listdir(self.output_folder)
-            for file in files:
-                # Check if filename contains meeting ID
-                if meeting_id in file and file.endswith('.webm'):
-                    video_path = os.path.join(self.output_folder, file)
-                    self.logger.info(f"Found video file: {video_path}")
-                    return video_path
+            video_path = self._find_video(meeting_id)
+            if video_path:
+                self.logger.info(f"Found video file: {video_path}")
+                return video_path
         except Exception as e:
             self.logger.error(f"Error checking for video: {e}")
 
         return None
 
+    def _find_video(self, meeting_id: str) -> Optional[str]:
+        """
+        Scan output folder once for a video file named after the meeting
+
+        Args:
+            meeting_id: Meeting ID to look for
+
+        Returns:
+            Path to video file or None
+        """
+        # scandir returns file types with the names - no extra stat per entry
+        try:
+            with os.scandir(self.output_folder) as it:
+                for entry in it:
+                    # Check if filename contains meeting ID
+                    if (meeting_id in entry.name and entry.name.endswith(VIDEO_EXTENSIONS)
+                            and entry.is_file(follow_symlinks=False)):
+                        return entry.path
+        except FileNotFoundError:
+            # Output folder removed while running (e.g. unmounted share)
+            pass
+
+        return None
+
     def update_meeting_with_video(self, meeting_id: str, video_path: str):
         """
         Update meeting JSON with video file path
@@ -117,35 +194,25 @@ class VideoManager:
             meeting_id: Meeting ID
             video_path: Path to video file
         """
-        # Try to find meeting in completed folder
-        meeting_json = f"data/meetings/completed/{meeting_id}.json"
-
-        if not os.path.exists(meeting_json):
-            # Try in_progress folder
-            meeting_json = f"data/meetings/in_progress/{meeting_id}.json"
-
-        if not os.path.exists(meeting_json):
-            self.logger.warning(f"Meeting JSON not found for {meeting_id}")
+        if self.meeting_store is None:
+            self.logger.warning(f"No meeting store set, cannot update meeting {meeting_id}")
             return
 
         try:
-            # Load existing meeting data
-            with open(meeting_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Update with video path
-            data['video_file_path'] = video_path
-            data['processed_at'] = datetime.utcnow().isoformat()
+            # Update the registered meeting object instead of re-reading its JSON
+            meeting = self.pending_meetings.get(meeting_id) or self.meeting_store.get_meeting(meeting_id)
+            if not meeting:
+                self.logger.warning(f"Meeting JSON not found for {meeting_id}")
+                return
 
-            # Save updated data
-            with open(meeting_json, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            meeting.video_file_path = video_path
+            meeting.processed_at = datetime.now(timezone.utc)
+            self.meeting_store.save_meeting(meeting)
 
             self.logger.info(f"Updated meeting {meeting_id} with video path: {video_path}")
 
             # Remove from pending meetings
-            if meeting_id in self.pending_meetings:
-                del self.pending_meetings[meeting_id]
+            self.pending_meetings.pop(meeting_id, None)
 
         except Exception as e:
             self.logger.error(f"Error updating meeting JSON: {e}")
@@ -155,16 +222,13 @@ class VideoManager:
         Start file system watcher for video output folder
         (Optional - for real-time monitoring)
         """
-        if not os.path.exists(self.output_folder):
-            os.makedirs(self.output_folder, exist_ok=True)
-
         event_handler = VideoFileHandler(self._on_video_created)
-        observer = Observer()
-        observer.schedule(event_handler, self.output_folder, recursive=False)
-        observer.start()
+        self.observer = Observer()
+        self.observer.schedule(event_handler, self.output_folder, recursive=False)
+        self.observer.start()
 
         self.logger.info(f"Started watching folder: {self.output_folder}")
-        return observer
+        return self.observer
 
     def _on_video_created(self, video_path: str):
         """
@@ -178,8 +242,19 @@ class VideoManager:
         # Check if this video matches any pending meetings
         filename = os.path.basename(video_path)
 
-        for meeting_id, meeting in list(self.pending_meetings.items()):
-            if meeting_id in filename:
-                self.logger.info(f"Matched video to meeting: {meeting_id}")
-                self.update_meeting_with_video(meeting_id, video_path)
-                break
+        # BrowserJoiner names recordings ..._{meeting_id}.{ext}, so the ID is
+        # looked up directly; other names fall back to a substring scan over
+        # registered meetings plus anyone blocked in monitor_for_video
+        meeting_id = os.path.splitext(filename)[0].rsplit('_', 1)[-1]
+        if meeting_id not in self._video_events:
+            meeting_id = next((known_id for known_id in list(self._video_events) if known_id in filename), None)
+            if meeting_id is None:
+                return
+
+        self.logger.info(f"Matched video to meeting: {meeting_id}")
+        self._video_paths[meeting_id] = video_path
+        event = self._video_events.get(meeting_id)
+        if meeting_id in self.pending_meetings:
+            self.update_meeting_with_video(meeting_id, video_path)
+        if event:
+            event.set()
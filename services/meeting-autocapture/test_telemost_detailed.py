@@ -6,7 +6,6 @@ import sys
 import json
 from pathlib import Path
 from dotenv import load_dotenv
-from datetime import datetime
 import logging
 
 # Setup detailed logging
@@ -26,11 +25,7 @@ def load_meeting_from_file(filepath: str) -> MeetingInvitation:
     with open(filepath, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
-    # Convert ISO datetime strings back to datetime objects
-    for key in ['start_time', 'end_time', 'created_at', 'processed_at']:
-        if key in data and data[key]:
-            data[key] = datetime.fromisoformat(data[key])
-
+    # pydantic parses the ISO datetime strings (including a 'Z' suffix)
     return MeetingInvitation(**data)
 
 def main():
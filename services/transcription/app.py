@@ -13,21 +13,27 @@ Endpoints:
 """
 
 import asyncio
-import json
+import functools
+import hashlib
+import io
 import logging
 import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Awaitable, Callable, Dict, Literal, Optional, List
 
 import aiofiles
+import orjson
+import zstandard
 from fastapi import FastAPI, File, HTTPException, UploadFile, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
-from transcribe import WhisperTranscriber, TranscriptionSegment
-from diarize import SpeakerDiarizer, merge_transcription_diarization
+from transcribe import WhisperTranscriber, TranscriptionSegment, decode_audio_16k, SAMPLE_RATE
+from diarize import SpeakerDiarizer, DiarizationSegment, merge_transcription_diarization
 
 # Logging configuration
 logging.basicConfig(
@@ -44,17 +50,62 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Transcription & Diarization Service",
     description="Speech transcription and speaker identification service",
-    version="1.0.0"
+    version="1.0.0",
+    # Responses rendered with orjson instead of the stdlib json module
+    default_response_class=ORJSONResponse
 )
 
 # Path configuration
 DATA_DIR = Path("/app/data")
-AUDIO_DIR = DATA_DIR / "audio"
 TRANSCRIPTS_DIR = DATA_DIR / "transcripts"
+# Joined with file names per request; also the path reported back to callers
+TRANSCRIPTS_DIR_STR = os.fspath(TRANSCRIPTS_DIR)
 MODELS_DIR = Path("/app/models")
 
+# Label used when diarization is skipped for a single speaker (pyannote format)
+SINGLE_SPEAKER_LABEL = "SPEAKER_00"
+
+# zstd level for transcripts requested with ?compressed=true
+TRANSCRIPT_ZSTD_LEVEL = 3
+
+# Concurrent Whisper inferences (CTranslate2 num_workers). 1 on CPU, where
+# each call already uses every thread it gets; 2 on a GPU lets one job's
+# kernels run while the other prepares features
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS") or 1)
+
+# One inference thread per model worker: CTranslate2 and torch already
+# parallelize each call internally, more threads only fight over the cores
+whisper_pool = ThreadPoolExecutor(max_workers=WHISPER_WORKERS, thread_name_prefix="whisper")
+diarize_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarize")
+
+# Intra-op threads per model, so Whisper and pyannote running side by side
+# split the cores instead of each claiming all of them
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", max(1, (os.cpu_count() or 2) // 2)))
+# Whisper-only deployments (/transcribe) can give CTranslate2 every core
+WHISPER_THREADS = int(os.getenv("WHISPER_THREADS") or INFERENCE_THREADS)
+# Recordings longer than this are diarized in windows of this many seconds,
+# speakers matched across windows (0 = always in one pass)
+DIARIZE_WINDOW_S = int(os.getenv("DIARIZE_WINDOW_S") or 0)
+# Speech chunks Whisper decodes per batch (1 = sequential, previous-text conditioning)
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE") or 16)
+
+# Requests processed at once; the rest wait here before decoding instead of
+# piling up decoded audio in front of the models
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", 2))
+inference_slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+
+# Identical uploads (e.g. pipeline retries) share one model run. Off by default:
+# duplicates get the same transcript_path, so it only suits callers that do
+# not move or delete the transcript file after reading it
+ENABLE_DEDUPE = os.getenv("ENABLE_DEDUPE", "false").lower() == "true"
+# Seconds a finished result is reused for an identical upload
+DEDUPE_TTL = int(os.getenv("DEDUPE_TTL", 300))
+# Only the first bytes are hashed; together with the size this tells retries apart
+DEDUPE_HASH_BYTES = 64 << 20
+inflight_jobs: Dict[tuple, asyncio.Task] = {}  # key -> running job
+recent_results: Dict[tuple, tuple] = {}  # key -> (expires_at, response)
+
 # Create directories
-AUDIO_DIR.mkdir(parents=True, exist_ok=True)
 TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -62,6 +113,10 @@ MODELS_DIR.mkdir(parents=True, exist_ok=True)
 whisper_transcriber: Optional[WhisperTranscriber] = None
 speaker_diarizer: Optional[SpeakerDiarizer] = None
 models_loaded = False
+# Set once the first inference ran in this process (see warmup_models)
+models_warmed = False
+# Model info never changes after loading - built once for /health and /models/info
+loaded_models_info: Optional[dict] = None
 
 
 # Pydantic models
@@ -109,16 +164,18 @@ class ModelsInfoResponse(BaseModel):
     pyannote: dict
 
 
-@app.on_event("startup")
-async def startup_event():
+def load_models():
     """
-    Load models at application startup
+    Load Whisper and pyannote models once per process
+
+    Does nothing if the models are already loaded, e.g. preloaded in the
+    gunicorn master before the workers were forked.
     """
-    global whisper_transcriber, speaker_diarizer, models_loaded
+    global whisper_transcriber, speaker_diarizer, models_loaded, loaded_models_info
 
-    logger.info("="*60)
-    logger.info("STARTING TRANSCRIPTION SERVICE")
-    logger.info("="*60)
+    if models_loaded:
+        logger.info("Models already loaded (preloaded before fork)")
+        return
 
     # Get configuration from environment variables
     whisper_model = os.getenv("WHISPER_MODEL", "medium")
@@ -130,6 +187,10 @@ async def startup_event():
     logger.info(f"  - Whisper model: {whisper_model}")
     logger.info(f"  - Device: {device}")
     logger.info(f"  - Language: {language}")
+    logger.info(
+        f"  - Threads: whisper {WHISPER_THREADS} x {WHISPER_WORKERS} workers, pyannote {INFERENCE_THREADS}, "
+        f"concurrent jobs: {MAX_CONCURRENT_JOBS}"
+    )
     logger.info(f"  - HF token: {'***' + hf_token[-4:] if hf_token else 'NOT SET'}")
 
     try:
@@ -138,7 +199,10 @@ async def startup_event():
         whisper_transcriber = WhisperTranscriber(
             model_size=whisper_model,
             device=device,
-            compute_type="int8" if device == "cpu" else "float16"
+            # Empty = int8 on CPU, int8_float16 on GPU
+            compute_type=os.getenv("WHISPER_COMPUTE_TYPE") or None,
+            cpu_threads=WHISPER_THREADS,
+            num_workers=WHISPER_WORKERS
         )
         logger.info("✓ Whisper model loaded")
 
@@ -146,10 +210,15 @@ async def startup_event():
         logger.info("Loading pyannote.audio model...")
         speaker_diarizer = SpeakerDiarizer(
             device=device,
-            use_auth_token=hf_token
+            use_auth_token=hf_token,
+            num_threads=INFERENCE_THREADS
         )
         logger.info("✓ pyannote.audio model loaded")
 
+        loaded_models_info = {
+            "whisper": whisper_transcriber.get_model_info(),
+            "pyannote": speaker_diarizer.get_model_info()
+        }
         models_loaded = True
         logger.info("="*60)
         logger.info("ALL MODELS SUCCESSFULLY LOADED")
@@ -161,55 +230,202 @@ async def startup_event():
         models_loaded = False
 
 
-async def get_audio_duration(audio_path: Path) -> Optional[float]:
+def warmup_models():
+    """
+    Run the first (much slower) inference of both models in this process
+
+    Kept out of load_models: inference starts the torch and CTranslate2
+    OpenMP thread pools, which do not survive a fork, so with preloading
+    it must run in each worker rather than in the gunicorn master.
+    """
+    global models_warmed
+
+    if models_warmed or not models_loaded:
+        return
+    if os.getenv("WARMUP_MODELS", "true").lower() != "true":
+        return
+
+    whisper_transcriber.warmup()
+    speaker_diarizer.warmup(SAMPLE_RATE)
+    models_warmed = True
+
+
+@app.on_event("startup")
+async def startup_event():
+    """
+    Load models at application startup
+    """
+    logger.info("="*60)
+    logger.info("STARTING TRANSCRIPTION SERVICE")
+    logger.info("="*60)
+
+    load_models()
+    warmup_models()
+
+
+# With PRELOAD_MODELS=true the models are loaded at import time, so that
+# `gunicorn -k uvicorn.workers.UvicornWorker --preload -w N app:app` loads
+# them once in the master and the forked workers share the weights
+# copy-on-write. CPU only: CUDA state does not survive a fork. The warmup
+# runs later, per worker, in startup_event.
+if os.getenv("PRELOAD_MODELS", "false").lower() == "true":
+    if os.getenv("DEVICE", "cpu") == "cpu":
+        load_models()
+    else:
+        logger.warning("PRELOAD_MODELS ignored: preloading before fork is only supported on CPU")
+
+
+def dump_transcript(transcript_data: dict) -> bytes:
     """
-    Get audio duration using ffprobe
+    Serialize transcript to compact UTF-8 JSON
 
     Args:
-        audio_path: Path to audio file
+        transcript_data: Transcript with metadata
 
     Returns:
-        Duration in seconds or None
+        JSON bytes (numpy arrays and dataclasses serialized natively)
     """
-    try:
-        process = await asyncio.create_subprocess_exec(
-            "ffprobe",
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            str(audio_path),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await process.communicate()
+    return orjson.dumps(transcript_data, option=orjson.OPT_SERIALIZE_NUMPY)
 
-        if process.returncode == 0:
-            return round(float(stdout.decode().strip()), 2)
-        return None
-    except Exception as e:
-        logger.warning(f"Failed to determine duration: {e}")
-        return None
+
+async def write_transcript(transcript_path: str, transcript_data: dict, compressed: bool) -> str:
+    """
+    Write transcript JSON, optionally zstd-compressed
+
+    Args:
+        transcript_path: Destination path of the plain JSON file
+        transcript_data: Transcript with metadata
+        compressed: Write <path>.zst instead of plain JSON
+
+    Returns:
+        Path of the written file
+    """
+    data = dump_transcript(transcript_data)
+    if compressed:
+        data = zstandard.ZstdCompressor(level=TRANSCRIPT_ZSTD_LEVEL).compress(data)
+        transcript_path += ".zst"
+
+    async with aiofiles.open(transcript_path, 'wb') as f:
+        await f.write(data)
+
+    return transcript_path
+
+
+def hash_upload(source) -> bytes:
+    """
+    Hash the start of an upload together with its size
+
+    Args:
+        source: Binary file object of the upload
+
+    Returns:
+        Digest identifying the upload
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    source.seek(0)
+    remaining = DEDUPE_HASH_BYTES
+    while remaining > 0 and (chunk := source.read(min(1 << 20, remaining))):
+        digest.update(chunk)
+        remaining -= len(chunk)
+    source.seek(0, os.SEEK_END)
+    digest.update(source.tell().to_bytes(8, "little"))
+    source.seek(0)
+    return digest.digest()
+
+
+def detach_upload(file: UploadFile) -> UploadFile:
+    """
+    Give a shared job its own handle on an upload
+
+    FastAPI closes an UploadFile when its request ends, also when the client
+    disconnects while other requests still wait on the job. Uploads spooled to
+    disk get a duplicated descriptor of the same temporary file, uploads still
+    held in memory are copied.
+
+    Args:
+        file: Uploaded file of the request starting the job
+
+    Returns:
+        UploadFile the job owns and closes when done
+    """
+    source = file.file
+    handle = None
+    # Same check as decode_audio_16k - fileno() would roll an in-memory upload to disk
+    if getattr(source, "_rolled", True):
+        try:
+            handle = os.fdopen(os.dup(source.fileno()), "rb")
+        except (AttributeError, OSError):
+            handle = None
+
+    if handle is None:
+        source.seek(0)
+        handle = io.BytesIO(source.read())
+
+    return UploadFile(handle, size=file.size, filename=file.filename, headers=file.headers)
+
+
+async def run_deduplicated(file: UploadFile, params: tuple, process: Callable[[UploadFile], Awaitable]):
+    """
+    Run process() once for identical concurrent or recent uploads
+
+    Args:
+        file: Uploaded file
+        params: Endpoint name and request parameters, part of the key
+        process: Coroutine function doing the actual work on the upload
+
+    Returns:
+        Result of process(), possibly shared with another request
+    """
+    if not ENABLE_DEDUPE:
+        return await process(file)
+
+    loop = asyncio.get_event_loop()
+    key = (await loop.run_in_executor(None, hash_upload, file.file),) + params
+
+    recent = recent_results.get(key)
+    if recent and recent[0] > time.monotonic() and os.path.exists(recent[1].transcript_path):
+        logger.info(f"Returning recent result for identical upload: {file.filename}")
+        return recent[1]
+
+    job = inflight_jobs.get(key)
+    if job is None:
+        # The job outlives this request if its client disconnects
+        job_file = detach_upload(file)
+        job = asyncio.ensure_future(process(job_file))
+        inflight_jobs[key] = job
+
+        def finished(done: asyncio.Task):
+            job_file.file.close()
+            inflight_jobs.pop(key, None)
+            if not done.cancelled() and done.exception() is None:
+                now = time.monotonic()
+                for stale in [k for k, (expires, _) in recent_results.items() if expires <= now]:
+                    del recent_results[stale]
+                recent_results[key] = (now + DEDUPE_TTL, done.result())
+
+        job.add_done_callback(finished)
+    else:
+        logger.info(f"Joining in-flight job for identical upload: {file.filename}")
+
+    # A disconnecting client must not cancel the job other requests wait on
+    return await asyncio.shield(job)
 
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
     Health check endpoint
-    """
-    models_info = None
-    if models_loaded:
-        models_info = {
-            "whisper": whisper_transcriber.get_model_info(),
-            "pyannote": speaker_diarizer.get_model_info()
-        }
 
-    return HealthResponse(
-        status="healthy" if models_loaded else "degraded",
-        service="transcription-diarization",
-        timestamp=datetime.utcnow().isoformat(),
-        models_loaded=models_loaded,
-        models_info=models_info
-    )
+    Polled by the container health check, so the HealthResponse-shaped dict
+    is returned as a ready response, skipping response model validation.
+    """
+    return ORJSONResponse({
+        "status": "healthy" if models_loaded else "degraded",
+        "service": "transcription-diarization",
+        "timestamp": datetime.utcnow().isoformat(),
+        "models_loaded": models_loaded,
+        "models_info": loaded_models_info
+    })
 
 
 @app.get("/models/info", response_model=ModelsInfoResponse)
@@ -223,17 +439,18 @@ async def get_models_info():
             detail="Models not loaded. Check service logs."
         )
 
-    return ModelsInfoResponse(
-        whisper=whisper_transcriber.get_model_info(),
-        pyannote=speaker_diarizer.get_model_info()
-    )
+    return ModelsInfoResponse(**loaded_models_info)
 
 
 @app.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe_audio(
     file: UploadFile = File(..., description="Audio file (.wav, .mp3, etc.)"),
     language: str = Query("ru", description="Audio language (ru/en, etc.)"),
-    beam_size: int = Query(5, ge=1, le=10, description="Beam size for Whisper")
+    beam_size: int = Query(5, ge=1, le=10, description="Beam size for Whisper"),
+    quality: Optional[Literal["fast", "balanced", "accurate"]] = Query(
+        None, description="Decoding preset, overrides beam_size (fast = greedy)"
+    ),
+    compressed: bool = Query(False, description="Store transcript as zstd-compressed .json.zst")
 ):
     """
     Transcribe audio file (without diarization)
@@ -242,6 +459,8 @@ async def transcribe_audio(
         file: Audio file
         language: Audio language
         beam_size: Beam search size
+        quality: Decoding preset (fast/balanced/accurate), overrides beam_size
+        compressed: Store transcript zstd-compressed
 
     Returns:
         Transcription with timestamps
@@ -252,36 +471,57 @@ async def transcribe_audio(
             detail="Whisper model not loaded. Service unavailable."
         )
 
-    start_time = datetime.utcnow()
+    return await run_deduplicated(
+        file,
+        ("transcribe", language, beam_size, quality, compressed),
+        functools.partial(
+            process_transcription,
+            language=language, beam_size=beam_size, quality=quality, compressed=compressed
+        )
+    )
+
+
+async def process_transcription(
+    file: UploadFile,
+    language: str,
+    beam_size: int,
+    quality: Optional[str],
+    compressed: bool
+) -> TranscriptionResponse:
+    """
+    Transcribe an upload and save the transcript (see transcribe_audio)
+    """
+    start_time = time.perf_counter()
     file_id = str(uuid.uuid4())
 
     try:
-        # Save audio file
-        audio_filename = f"{file_id}_{file.filename}"
-        audio_path = AUDIO_DIR / audio_filename
-
-        async with aiofiles.open(audio_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # The upload is decoded in place, only its name is kept for logging
+        audio_path = Path(file.filename or file_id)
 
         logger.info(f"Starting transcription: {file.filename}")
 
-        # Transcription (runs synchronously in executor)
-        loop = asyncio.get_event_loop()
-        segments = await loop.run_in_executor(
-            None,
-            whisper_transcriber.transcribe,
-            audio_path,
-            language,
-            beam_size
-        )
-
-        # Get duration
-        duration = await get_audio_duration(audio_path)
+        # Transcription (runs synchronously on the Whisper thread)
+        async with inference_slots:
+            loop = asyncio.get_event_loop()
+            waveform = await loop.run_in_executor(None, decode_audio_16k, file.file)
+            segments = await loop.run_in_executor(
+                whisper_pool,
+                functools.partial(
+                    whisper_transcriber.transcribe,
+                    audio_path,
+                    language,
+                    beam_size,
+                    waveform=waveform,
+                    batch_size=WHISPER_BATCH_SIZE,
+                    quality=quality
+                )
+            )
+
+        duration = round(len(waveform) / SAMPLE_RATE, 2)
 
         # Save result to JSON
         transcript_filename = f"{file_id}_transcript.json"
-        transcript_path = TRANSCRIPTS_DIR / transcript_filename
+        transcript_path = f"{TRANSCRIPTS_DIR_STR}/{transcript_filename}"
 
         transcript_data = {
             "metadata": {
@@ -290,16 +530,13 @@ async def transcribe_audio(
                 "language": language,
                 "processed_at": datetime.utcnow().isoformat()
             },
-            "transcript": [seg.to_dict() for seg in segments]
+            # Segments are dataclasses - orjson serializes them without to_dict()
+            "transcript": segments
         }
 
-        async with aiofiles.open(transcript_path, 'w', encoding='utf-8') as f:
-            await f.write(json.dumps(transcript_data, ensure_ascii=False, indent=2))
+        transcript_path = await write_transcript(transcript_path, transcript_data, compressed)
 
-        # Delete audio file
-        audio_path.unlink()
-
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
 
         logger.info(
             f"Transcription completed: {len(segments)} segments, "
@@ -308,7 +545,7 @@ async def transcribe_audio(
 
         return TranscriptionResponse(
             status="success",
-            transcript_path=f"/app/data/transcripts/{transcript_filename}",
+            transcript_path=transcript_path,
             num_segments=len(segments),
             duration=duration,
             language=language,
@@ -317,9 +554,6 @@ async def transcribe_audio(
 
     except Exception as e:
         logger.error(f"Transcription error: {e}", exc_info=True)
-        # Cleanup
-        if audio_path.exists():
-            audio_path.unlink()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -336,38 +570,37 @@ async def diarize_audio(
     if not models_loaded:
         raise HTTPException(status_code=503, detail="Models not loaded")
 
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     file_id = str(uuid.uuid4())
 
     try:
-        # Save audio
-        audio_filename = f"{file_id}_{file.filename}"
-        audio_path = AUDIO_DIR / audio_filename
-
-        async with aiofiles.open(audio_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # The upload is decoded in place, only its name is kept for logging
+        audio_path = Path(file.filename or file_id)
 
         logger.info(f"Starting diarization: {file.filename}")
 
-        # Diarization
-        loop = asyncio.get_event_loop()
-        segments = await loop.run_in_executor(
-            None,
-            speaker_diarizer.diarize,
-            audio_path,
-            num_speakers,
-            min_speakers,
-            max_speakers
-        )
+        # Diarization (runs synchronously on the pyannote thread)
+        async with inference_slots:
+            loop = asyncio.get_event_loop()
+            waveform = await loop.run_in_executor(None, decode_audio_16k, file.file)
+            segments = await loop.run_in_executor(
+                diarize_pool,
+                functools.partial(
+                    speaker_diarizer.diarize_long,
+                    audio_path,
+                    num_speakers,
+                    min_speakers,
+                    max_speakers,
+                    waveform=waveform,
+                    sample_rate=SAMPLE_RATE,
+                    window_s=DIARIZE_WINDOW_S
+                )
+            )
 
         # Count unique speakers
-        unique_speakers = len(set(seg.speaker for seg in segments))
-
-        # Delete audio
-        audio_path.unlink()
+        unique_speakers = len({seg.speaker for seg in segments})
 
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
 
         logger.info(
             f"Diarization completed: {len(segments)} segments, "
@@ -383,8 +616,6 @@ async def diarize_audio(
 
     except Exception as e:
         logger.error(f"Diarization error: {e}", exc_info=True)
-        if audio_path.exists():
-            audio_path.unlink()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -393,9 +624,13 @@ async def transcribe_with_speakers(
     file: UploadFile = File(..., description="Audio file"),
     language: str = Query("ru", description="Audio language"),
     beam_size: int = Query(5, ge=1, le=10, description="Beam size"),
+    quality: Optional[Literal["fast", "balanced", "accurate"]] = Query(
+        None, description="Decoding preset, overrides beam_size (fast = greedy)"
+    ),
     num_speakers: Optional[int] = Query(None, ge=1, le=20, description="Number of speakers"),
     min_speakers: Optional[int] = Query(None, ge=1, le=20, description="Min. speakers"),
-    max_speakers: Optional[int] = Query(None, ge=1, le=20, description="Max. speakers")
+    max_speakers: Optional[int] = Query(None, ge=1, le=20, description="Max. speakers"),
+    compressed: bool = Query(False, description="Store transcript as zstd-compressed .json.zst")
 ):
     """
     Full process: transcription + diarization
@@ -406,50 +641,88 @@ async def transcribe_with_speakers(
     if not models_loaded:
         raise HTTPException(status_code=503, detail="Models not loaded")
 
-    start_time = datetime.utcnow()
+    return await run_deduplicated(
+        file,
+        ("transcribe-with-speakers", language, beam_size, quality,
+         num_speakers, min_speakers, max_speakers, compressed),
+        functools.partial(
+            process_full_transcription,
+            language=language, beam_size=beam_size, quality=quality, num_speakers=num_speakers,
+            min_speakers=min_speakers, max_speakers=max_speakers, compressed=compressed
+        )
+    )
+
+
+async def process_full_transcription(
+    file: UploadFile,
+    language: str,
+    beam_size: int,
+    quality: Optional[str],
+    num_speakers: Optional[int],
+    min_speakers: Optional[int],
+    max_speakers: Optional[int],
+    compressed: bool
+) -> TranscriptionWithSpeakersResponse:
+    """
+    Transcribe and diarize an upload and save the transcript (see transcribe_with_speakers)
+    """
+    start_time = time.perf_counter()
     file_id = str(uuid.uuid4())
 
     try:
-        # Save audio
-        audio_filename = f"{file_id}_{file.filename}"
-        audio_path = AUDIO_DIR / audio_filename
-
-        async with aiofiles.open(audio_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # The upload is decoded in place, only its name is kept for logging
+        audio_path = Path(file.filename or file_id)
 
         logger.info(f"Starting full processing: {file.filename}")
 
-        # Get duration
-        duration = await get_audio_duration(audio_path)
-
-        loop = asyncio.get_event_loop()
-
-        # Run transcription and diarization in parallel
-        logger.info("Launching transcription and diarization in parallel...")
-
-        transcription_task = loop.run_in_executor(
-            None,
-            whisper_transcriber.transcribe,
-            audio_path,
-            language,
-            beam_size
-        )
-
-        diarization_task = loop.run_in_executor(
-            None,
-            speaker_diarizer.diarize,
-            audio_path,
-            num_speakers,
-            min_speakers,
-            max_speakers
-        )
-
-        # Wait for both tasks to complete
-        transcription_segments, diarization_segments = await asyncio.gather(
-            transcription_task,
-            diarization_task
-        )
+        async with inference_slots:
+            loop = asyncio.get_event_loop()
+
+            # Decode once, both models work on the same 16 kHz mono waveform
+            waveform = await loop.run_in_executor(None, decode_audio_16k, file.file)
+            duration = round(len(waveform) / SAMPLE_RATE, 2)
+
+            transcription_task = loop.run_in_executor(
+                whisper_pool,
+                functools.partial(
+                    whisper_transcriber.transcribe,
+                    audio_path,
+                    language,
+                    beam_size,
+                    waveform=waveform,
+                    batch_size=WHISPER_BATCH_SIZE,
+                    quality=quality
+                )
+            )
+
+            if num_speakers == 1 or max_speakers == 1:
+                # One speaker by request (e.g. dictation): nothing for pyannote to find
+                logger.info("Single speaker requested, skipping diarization")
+                transcription_segments = await transcription_task
+                diarization_segments = [DiarizationSegment(0.0, duration, SINGLE_SPEAKER_LABEL)]
+            else:
+                # Run transcription and diarization in parallel
+                logger.info("Launching transcription and diarization in parallel...")
+
+                diarization_task = loop.run_in_executor(
+                    diarize_pool,
+                    functools.partial(
+                        speaker_diarizer.diarize_long,
+                        audio_path,
+                        num_speakers,
+                        min_speakers,
+                        max_speakers,
+                        waveform=waveform,
+                        sample_rate=SAMPLE_RATE,
+                        window_s=DIARIZE_WINDOW_S
+                    )
+                )
+
+                # Wait for both tasks to complete
+                transcription_segments, diarization_segments = await asyncio.gather(
+                    transcription_task,
+                    diarization_task
+                )
 
         logger.info("Transcription and diarization completed, starting merge...")
 
@@ -460,11 +733,11 @@ async def transcribe_with_speakers(
         )
 
         # Count unique speakers
-        unique_speakers = len(set(seg["speaker"] for seg in merged_segments))
+        unique_speakers = len({seg["speaker"] for seg in merged_segments})
 
         # Save result
         transcript_filename = f"{file_id}_full_transcript.json"
-        transcript_path = TRANSCRIPTS_DIR / transcript_filename
+        transcript_path = f"{TRANSCRIPTS_DIR_STR}/{transcript_filename}"
 
         transcript_data = {
             "metadata": {
@@ -477,13 +750,9 @@ async def transcribe_with_speakers(
             "transcript": merged_segments
         }
 
-        async with aiofiles.open(transcript_path, 'w', encoding='utf-8') as f:
-            await f.write(json.dumps(transcript_data, ensure_ascii=False, indent=2))
-
-        # Delete audio
-        audio_path.unlink()
+        transcript_path = await write_transcript(transcript_path, transcript_data, compressed)
 
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
 
         logger.info(
             f"Full processing completed: {len(merged_segments)} segments, "
@@ -492,7 +761,7 @@ async def transcribe_with_speakers(
 
         return TranscriptionWithSpeakersResponse(
             status="success",
-            transcript_path=f"/app/data/transcripts/{transcript_filename}",
+            transcript_path=transcript_path,
             num_segments=len(merged_segments),
             num_speakers=unique_speakers,
             duration=duration,
@@ -502,8 +771,6 @@ async def transcribe_with_speakers(
 
     except Exception as e:
         logger.error(f"Full processing error: {e}", exc_info=True)
-        if audio_path.exists():
-            audio_path.unlink()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -531,4 +798,12 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        backlog=2048,
+        log_level="info"
+    )
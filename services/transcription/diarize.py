@@ -5,24 +5,37 @@ Diarization - the process of dividing audio into segments by speakers,
 answering the question "who speaks when?"
 """
 
+import contextlib
 import logging
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
-import torch
-from pyannote.audio import Pipeline
+import numpy as np
+
+# torch, pyannote.audio and scipy take seconds to import; they are imported
+# where a model is loaded or used, so importing this module (e.g. for
+# merge_transcription_diarization) stays cheap
 
 logger = logging.getLogger(__name__)
 
+# Cosine distance under which speakers of neighbouring windows are the same
+# person (clustering threshold of pyannote/speaker-diarization-3.1)
+SPEAKER_MATCH_THRESHOLD = 0.7045
+
 
+@dataclass(slots=True)
 class DiarizationSegment:
-    """Diarization segment with speaker identifier"""
+    """
+    Diarization segment with speaker identifier
 
-    def __init__(self, start: float, end: float, speaker: str):
-        self.start = start
-        self.end = end
-        self.speaker = speaker
+    Times are kept unrounded, the merge compares overlaps on them.
+    """
+
+    start: float
+    end: float
+    speaker: str
 
     def to_dict(self) -> dict:
         return {
@@ -45,7 +58,10 @@ class SpeakerDiarizer:
         self,
         model_name: str = "pyannote/speaker-diarization-3.1",
         device: str = "cpu",
-        use_auth_token: Optional[str] = None
+        use_auth_token: Optional[str] = None,
+        dtype: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        batch_size: Optional[int] = None
     ):
         """
         Initialize diarizer
@@ -57,13 +73,51 @@ class SpeakerDiarizer:
                 Can be obtained at https://huggingface.co/settings/tokens
                 License must be accepted at:
                 https://huggingface.co/pyannote/speaker-diarization
+            dtype: Precision for inference (PYANNOTE_DTYPE env variable)
+                - None: bfloat16 on GPUs that support it (Ampere+), float32 otherwise
+                - float32: full precision
+                - bfloat16: GPUs with BF16 tensor cores, CPUs with AVX512-BF16/AMX
+                - float16: GPU only
+            num_threads: torch intra-op threads on CPU (None = torch default)
+            batch_size: Chunks per segmentation/embedding forward pass (PYANNOTE_BATCH_SIZE
+                env variable, None = model config, 32 for 3.1). Embedding dominates
+                diarization time; larger batches keep a GPU busy, VRAM grows with
+                the batch, not with audio length
 
         Raises:
             ValueError: If HuggingFace token not provided
             RuntimeError: On model loading error
         """
+        import torch
+        from pyannote.audio import Audio, Pipeline
+
         self.device = torch.device(device)
 
+        # Files are decoded once up front; given a path, the pipeline would
+        # re-read and resample every chunk for segmentation and embedding
+        self._audio_loader = Audio(sample_rate=16000, mono="downmix")
+
+        if num_threads and self.device.type == "cpu":
+            torch.set_num_threads(num_threads)
+
+        if self.device.type == "cuda":
+            # TF32 tensor cores for the float32 matmuls/convolutions (Ampere+)
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+
+        if dtype is None:
+            dtype = os.getenv("PYANNOTE_DTYPE") or None
+        if dtype is None and self.device.type == "cuda" and torch.cuda.is_bf16_supported():
+            dtype = "bfloat16"
+        if dtype == "float32":
+            dtype = None
+        if dtype not in (None, "bfloat16", "float16"):
+            raise ValueError(f"Unsupported pyannote dtype: {dtype} (use float32, bfloat16 or float16)")
+
+        # Applied with autocast around inference - layers that do not support
+        # the reduced precision keep running in float32
+        self.dtype = dtype
+
         # Get token from environment variables if not specified
         if use_auth_token is None:
             use_auth_token = os.getenv("HF_TOKEN")
@@ -75,7 +129,7 @@ class SpeakerDiarizer:
                 "Get token at: https://huggingface.co/settings/tokens"
             )
 
-        logger.info(f"Loading pyannote model: {model_name} (device={device})")
+        logger.info(f"Loading pyannote model: {model_name} (device={device}, dtype={dtype or 'float32'})")
 
         try:
             self.pipeline = Pipeline.from_pretrained(
@@ -86,6 +140,16 @@ class SpeakerDiarizer:
             # Move to device
             self.pipeline.to(self.device)
 
+            if batch_size is None and os.getenv("PYANNOTE_BATCH_SIZE"):
+                batch_size = int(os.getenv("PYANNOTE_BATCH_SIZE"))
+            if batch_size:
+                self.pipeline.segmentation_batch_size = batch_size
+                self.pipeline.embedding_batch_size = batch_size
+
+            # Own CUDA stream, so pyannote kernels do not serialize with
+            # Whisper's on the legacy default stream when both share a GPU
+            self.stream = torch.cuda.Stream(self.device) if self.device.type == "cuda" else None
+
             logger.info(f"pyannote model loaded successfully")
         except Exception as e:
             logger.error(f"Error loading pyannote model: {e}")
@@ -102,7 +166,9 @@ class SpeakerDiarizer:
         audio_path: Path,
         num_speakers: Optional[int] = None,
         min_speakers: Optional[int] = None,
-        max_speakers: Optional[int] = None
+        max_speakers: Optional[int] = None,
+        waveform: Optional[np.ndarray] = None,
+        sample_rate: int = 16000
     ) -> List[DiarizationSegment]:
         """
         Perform diarization on audio file
@@ -112,6 +178,9 @@ class SpeakerDiarizer:
             num_speakers: Exact number of speakers (if known)
             min_speakers: Minimum number of speakers
             max_speakers: Maximum number of speakers
+            waveform: Already decoded mono audio, skips decoding the file;
+                audio_path is then only used in log messages
+            sample_rate: Sample rate of waveform
 
         Returns:
             List of segments with speaker identifiers
@@ -120,7 +189,9 @@ class SpeakerDiarizer:
             FileNotFoundError: If audio file not found
             RuntimeError: On diarization error
         """
-        if not audio_path.exists():
+        import torch
+
+        if waveform is None and not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
         logger.info(f"Starting diarization: {audio_path.name}")
@@ -129,10 +200,17 @@ class SpeakerDiarizer:
             f"min={min_speakers}, max={max_speakers}"
         )
 
+        # pyannote takes in-memory audio as a (channel, time) tensor
+        if waveform is not None:
+            audio = {"waveform": torch.from_numpy(waveform).unsqueeze(0), "sample_rate": sample_rate}
+        else:
+            audio_waveform, audio_sample_rate = self._audio_loader(str(audio_path))
+            audio = {"waveform": audio_waveform, "sample_rate": audio_sample_rate}
+
         try:
             # Perform diarization
-            diarization = self.pipeline(
-                str(audio_path),
+            diarization = self._run_pipeline(
+                audio,
                 num_speakers=num_speakers,
                 min_speakers=min_speakers,
                 max_speakers=max_speakers
@@ -149,8 +227,8 @@ class SpeakerDiarizer:
                     )
                 )
 
-            # Count unique speakers
-            unique_speakers = len(set(seg.speaker for seg in segments))
+            # Count unique speakers (the annotation keeps its label set)
+            unique_speakers = len(diarization.labels())
 
             logger.info(
                 f"Diarization completed: {len(segments)} segments, "
@@ -163,6 +241,204 @@ class SpeakerDiarizer:
             logger.error(f"Diarization error: {e}", exc_info=True)
             raise RuntimeError(f"Failed to perform diarization: {str(e)}")
 
+    def diarize_long(
+        self,
+        audio_path: Path,
+        num_speakers: Optional[int] = None,
+        min_speakers: Optional[int] = None,
+        max_speakers: Optional[int] = None,
+        waveform: Optional[np.ndarray] = None,
+        sample_rate: int = 16000,
+        window_s: float = 1200,
+        overlap_s: float = 30
+    ) -> List[DiarizationSegment]:
+        """
+        Perform diarization on long audio in overlapping windows
+
+        Memory and time of a single pyannote pass grow faster than the audio
+        (CUDA OOM on 16 GB cards past ~30 min). Each window is diarized on its
+        own and its speakers are matched to the ones found so far by their
+        embedding centroids. Audio that fits in one window goes to diarize().
+
+        Args:
+            audio_path: Path to audio file
+            num_speakers: Exact number of speakers - only an upper bound per window
+            min_speakers: Minimum number of speakers (whole file only)
+            max_speakers: Maximum number of speakers - upper bound per window
+            waveform: Already decoded mono audio, skips decoding the file
+            sample_rate: Sample rate of waveform
+            window_s: Window length in seconds
+            overlap_s: Overlap between neighbouring windows in seconds
+
+        Returns:
+            List of segments with speaker identifiers
+
+        Raises:
+            FileNotFoundError: If audio file not found
+            RuntimeError: On diarization error
+        """
+        import torch
+
+        if waveform is None:
+            if not audio_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+            audio, sample_rate = self._audio_loader(str(audio_path))
+            waveform = audio[0].numpy()
+
+        window = int(window_s * sample_rate)
+        overlap = int(overlap_s * sample_rate)
+
+        if window <= 0 or len(waveform) <= window + overlap:
+            return self.diarize(
+                audio_path, num_speakers, min_speakers, max_speakers,
+                waveform=waveform, sample_rate=sample_rate
+            )
+
+        logger.info(
+            f"Starting windowed diarization: {audio_path.name} "
+            f"({len(waveform) / sample_rate:.0f}s, windows of {window_s:.0f}s)"
+        )
+
+        speaker_centroids: List[np.ndarray] = []  # sum of unit centroids per speaker
+        segments = []
+
+        try:
+            start = 0
+            while True:
+                last = start + window + overlap >= len(waveform)
+                offset = start / sample_rate
+
+                diarization, centroids = self._run_pipeline(
+                    {
+                        "waveform": torch.from_numpy(waveform[start:start + window + overlap]).unsqueeze(0),
+                        "sample_rate": sample_rate
+                    },
+                    max_speakers=num_speakers or max_speakers,
+                    return_embeddings=True
+                )
+                speakers = self._match_speakers(diarization.labels(), centroids, speaker_centroids)
+
+                # Each overlap is split in the middle between its two windows
+                lower = offset + overlap_s / 2 if start else 0.0
+                upper = float("inf") if last else offset + window_s + overlap_s / 2
+
+                for turn, _, speaker in diarization.itertracks(yield_label=True):
+                    seg_start = max(turn.start + offset, lower)
+                    seg_end = min(turn.end + offset, upper)
+                    if seg_end > seg_start:
+                        segments.append(DiarizationSegment(seg_start, seg_end, speakers[speaker]))
+
+                logger.info(f"Window at {offset:.0f}s: {len(diarization.labels())} speakers")
+
+                if last:
+                    break
+                start += window
+
+            logger.info(
+                f"Diarization completed: {len(segments)} segments, "
+                f"{len(speaker_centroids)} speakers"
+            )
+
+            return segments
+
+        except Exception as e:
+            logger.error(f"Diarization error: {e}", exc_info=True)
+            raise RuntimeError(f"Failed to perform diarization: {str(e)}")
+
+    def _run_pipeline(self, audio, **kwargs):
+        """
+        Call the pyannote pipeline on this diarizer's stream and precision
+
+        Args:
+            audio: File path or {"waveform", "sample_rate"} dict
+            **kwargs: Pipeline arguments (speaker counts, return_embeddings)
+
+        Returns:
+            Pipeline output
+        """
+        import torch
+
+        stream_context = torch.cuda.stream(self.stream) if self.stream else contextlib.nullcontext()
+        try:
+            with stream_context, torch.inference_mode(), torch.autocast(
+                device_type=self.device.type,
+                dtype=getattr(torch, self.dtype) if self.dtype else None,
+                enabled=self.dtype is not None
+            ):
+                return self.pipeline(audio, **kwargs)
+        except torch.cuda.OutOfMemoryError:
+            # Not a precision problem - float32 would only need more memory
+            raise
+        except RuntimeError as e:
+            if self.dtype is None:
+                raise
+            # Some op rejected the reduced precision - stay in float32 from now on
+            logger.warning(f"pyannote failed in {self.dtype} ({e}), falling back to float32")
+            self.dtype = None
+            return self._run_pipeline(audio, **kwargs)
+
+    @staticmethod
+    def _match_speakers(
+        labels: List[str],
+        centroids: np.ndarray,
+        speaker_centroids: List[np.ndarray]
+    ) -> Dict[str, str]:
+        """
+        Map a window's speaker labels to speakers of the whole file
+
+        Speakers are paired one-to-one by cosine distance of their embedding
+        centroids; unmatched ones become new speakers. speaker_centroids is
+        updated in place.
+
+        Args:
+            labels: Speaker labels of the window
+            centroids: Embedding centroid per label (same order)
+            speaker_centroids: Summed unit centroids of known speakers
+
+        Returns:
+            Window label -> file-wide label (SPEAKER_00, SPEAKER_01, ...)
+        """
+        from scipy.optimize import linear_sum_assignment
+
+        # Speakers without a usable embedding get a zero vector and never match
+        local = np.nan_to_num(np.asarray(centroids[:len(labels)], dtype=np.float64))
+        local /= np.maximum(np.linalg.norm(local, axis=1, keepdims=True), 1e-12)
+
+        mapping = {}
+        if speaker_centroids and len(labels):
+            known = np.stack(speaker_centroids)
+            known = known / np.maximum(np.linalg.norm(known, axis=1, keepdims=True), 1e-12)
+            distance = 1.0 - local @ known.T
+            for row, col in zip(*linear_sum_assignment(distance)):
+                if distance[row, col] < SPEAKER_MATCH_THRESHOLD:
+                    mapping[labels[row]] = col
+                    speaker_centroids[col] = speaker_centroids[col] + local[row]
+
+        for row, label in enumerate(labels):
+            if label not in mapping:
+                mapping[label] = len(speaker_centroids)
+                speaker_centroids.append(local[row])
+
+        return {label: f"SPEAKER_{index:02d}" for label, index in mapping.items()}
+
+    def warmup(self, sample_rate: int = 16000):
+        """
+        Run the pipeline once on a second of silence so the first request
+        does not pay for lazy initialization (CUDA context, kernel selection)
+
+        Args:
+            sample_rate: Sample rate of the warmup audio
+        """
+        try:
+            self.diarize(
+                Path("warmup"),
+                waveform=np.zeros(sample_rate, dtype=np.float32),
+                sample_rate=sample_rate
+            )
+            logger.info("pyannote warmup completed")
+        except Exception as e:
+            logger.warning(f"pyannote warmup failed: {e}")
+
     def get_model_info(self) -> dict:
         """
         Get information about loaded model
@@ -172,7 +448,8 @@ class SpeakerDiarizer:
         """
         return {
             "framework": "pyannote.audio",
-            "device": str(self.device)
+            "device": str(self.device),
+            "dtype": self.dtype or "float32"
         }
 
 
@@ -183,7 +460,7 @@ def merge_transcription_diarization(
     """
     Merge transcription and diarization
 
-    Matches text segments with speakers based on timestamps.
+    Matches each text segment with the speaker whose turn overlaps it most.
 
     Args:
         transcription_segments: List of transcription segments
@@ -200,34 +477,57 @@ def merge_transcription_diarization(
     """
     logger.info("Starting merge of transcription and diarization")
 
-    merged = []
-
-    for trans_seg in transcription_segments:
-        # Convert TranscriptionSegment to dict if necessary
-        if hasattr(trans_seg, 'to_dict'):
-            trans_dict = trans_seg.to_dict()
-        else:
-            trans_dict = trans_seg
-
-        trans_start = trans_dict["start"]
-        trans_end = trans_dict["end"]
-        trans_mid = (trans_start + trans_end) / 2
-
-        # Find speaker for this segment
-        # Using middle of transcription segment
-        speaker = "UNKNOWN"
-
-        for diar_seg in diarization_segments:
-            if diar_seg.start <= trans_mid <= diar_seg.end:
-                speaker = diar_seg.speaker
-                break
-
-        merged.append({
-            "start": trans_dict["start"],
-            "end": trans_dict["end"],
-            "text": trans_dict["text"],
-            "speaker": speaker
-        })
+    # Output dicts are built once here and get the speaker added in place;
+    # plain dicts from the caller are copied rather than modified
+    if transcription_segments and isinstance(transcription_segments[0], dict):
+        trans_dicts = [
+            {"start": seg["start"], "end": seg["end"], "text": seg["text"]}
+            for seg in transcription_segments
+        ]
+    else:
+        trans_dicts = [seg.to_dict() for seg in transcription_segments]
+
+    # Diarization intervals sorted by start. pyannote turns can overlap, so
+    # ends are not sorted - their running maximum is, and bounds the search
+    diar_sorted = sorted(diarization_segments, key=lambda seg: seg.start)
+    diar_starts = np.array([seg.start for seg in diar_sorted], dtype=np.float64)
+    diar_ends = np.array([seg.end for seg in diar_sorted], dtype=np.float64)
+    diar_speakers = [seg.speaker for seg in diar_sorted]
+
+    trans_starts = np.array([seg["start"] for seg in trans_dicts], dtype=np.float64)
+    trans_ends = np.array([seg["end"] for seg in trans_dicts], dtype=np.float64)
+
+    # Candidate window per transcription segment: turns that start before it
+    # ends, from the first turn that can still reach its start
+    lower = np.searchsorted(np.maximum.accumulate(diar_ends), trans_starts, side='left')
+    upper = np.searchsorted(diar_starts, trans_ends, side='right')
+
+    # Every (segment, candidate turn) pair as flat arrays, so the overlaps of
+    # all segments are computed in one pass instead of a numpy call per segment
+    counts = np.maximum(upper - lower, 0)
+    rows = np.repeat(np.arange(len(trans_dicts)), counts)
+    cols = np.repeat(lower - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    overlaps = (
+        np.minimum(diar_ends[cols], trans_ends[rows])
+        - np.maximum(diar_starts[cols], trans_starts[rows])
+    )
+
+    # Speaker with the longest overlap per segment: order pairs by segment,
+    # longest overlap first (earliest turn on ties), keep each segment's first
+    order = np.lexsort((cols, -overlaps, rows))
+    first = order[np.flatnonzero(np.diff(rows[order], prepend=-1))]
+    best_rows, best_cols, best_overlaps = rows[first], cols[first], overlaps[first]
+
+    # Zero-length segments only need to fall inside a turn
+    matched = (best_overlaps > 0) | (
+        (best_overlaps == 0) & (trans_starts[best_rows] == trans_ends[best_rows])
+    )
+    speaker_index = np.full(len(trans_dicts), -1)
+    speaker_index[best_rows[matched]] = best_cols[matched]
+
+    for trans_dict, index in zip(trans_dicts, speaker_index.tolist()):
+        trans_dict["speaker"] = diar_speakers[index] if index >= 0 else "UNKNOWN"
+    merged = trans_dicts
 
     logger.info(f"Merge completed: {len(merged)} segments")
 
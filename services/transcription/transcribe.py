@@ -7,27 +7,108 @@ using CTranslate2 to speed up inference by 4x.
 
 import logging
 import os
+import subprocess
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Optional
 
-from faster_whisper import WhisperModel
+import numpy as np
+
+# faster_whisper (CTranslate2) is imported in WhisperTranscriber.__init__, so
+# decode_audio_16k and TranscriptionSegment do not pay for it
+
+# Sample rate both Whisper and pyannote work at
+SAMPLE_RATE = 16000
+
+# Pauses longer than this are cut out before the encoder runs (faster-whisper
+# default is 2000 ms, which leaves most of the gaps between phrases in)
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", 500))
+
+# (beam_size, patience) per quality preset. Greedy decoding with the default
+# temperature fallback comes close to beam search accuracy at a fraction of
+# the decoder time
+QUALITY_PRESETS = {
+    "fast": (1, 1.0),
+    "balanced": (5, 1.0),
+    "accurate": (5, 2.0),
+}
 
 logger = logging.getLogger(__name__)
 
 
+def decode_audio_16k(source: BinaryIO) -> np.ndarray:
+    """
+    Decode audio to 16 kHz mono float32 samples with ffmpeg
+
+    The audio is read straight from the uploaded file object. Uploads that
+    were already spooled to a temporary file are passed to ffmpeg as a file
+    descriptor, which keeps them seekable (MP4/M4A with the index at the end);
+    uploads still held in memory are piped to its stdin, so they are never
+    written to disk.
+
+    Args:
+        source: Binary file object with the audio
+
+    Returns:
+        Waveform as 1-D float32 array
+
+    Raises:
+        RuntimeError: If ffmpeg cannot decode the audio
+    """
+    source.seek(0)
+    # fileno() on a SpooledTemporaryFile that is still in memory would roll it
+    # over to disk, so the flag is checked first (as Starlette's UploadFile does)
+    fd = None
+    if getattr(source, "_rolled", True):
+        try:
+            fd = source.fileno()
+        except (AttributeError, OSError):
+            fd = None
+
+    command = [
+        "ffmpeg", "-v", "error",
+        "-i", f"/dev/fd/{fd}" if fd is not None else "pipe:0",
+        "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "pipe:1"
+    ]
+
+    if fd is not None:
+        result = subprocess.run(
+            command, stdin=subprocess.DEVNULL, pass_fds=(fd,), capture_output=True
+        )
+    else:
+        result = subprocess.run(command, input=source.read(), capture_output=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode audio: {result.stderr.decode(errors='replace').strip()}")
+
+    waveform = np.frombuffer(result.stdout, np.int16).astype(np.float32)
+    waveform /= 32768.0
+    return waveform
+
+
+@dataclass(slots=True)
 class TranscriptionSegment:
-    """Transcription segment with timestamps"""
+    """
+    Transcription segment with timestamps
 
-    def __init__(self, start: float, end: float, text: str):
-        self.start = start
-        self.end = end
-        self.text = text
+    Values are stored in their output form (rounded, stripped) so orjson can
+    serialize a list of segments natively, without building a dict per segment.
+    """
+
+    start: float
+    end: float
+    text: str
+
+    @classmethod
+    def from_whisper(cls, segment) -> "TranscriptionSegment":
+        return cls(round(segment.start, 2), round(segment.end, 2), segment.text.strip())
 
     def to_dict(self) -> dict:
         return {
-            "start": round(self.start, 2),
-            "end": round(self.end, 2),
-            "text": self.text.strip()
+            "start": self.start,
+            "end": self.end,
+            "text": self.text
         }
 
 
@@ -39,15 +120,17 @@ class WhisperTranscriber:
         model: Loaded Whisper model
         model_size: Model size (tiny/base/small/medium/large)
         device: Device for inference (cpu/cuda)
-        compute_type: Computation type (int8/float16/float32)
+        compute_type: Computation type (int8/int8_float16/float16/float32)
     """
 
     def __init__(
         self,
         model_size: str = "medium",
         device: str = "cpu",
-        compute_type: str = "int8",
-        download_root: Optional[str] = None
+        compute_type: Optional[str] = None,
+        download_root: Optional[str] = None,
+        cpu_threads: Optional[int] = None,
+        num_workers: int = 1
     ):
         """
         Initialize transcriber
@@ -60,12 +143,24 @@ class WhisperTranscriber:
                 - medium: good accuracy (~1.5GB) - recommended
                 - large-v2: best accuracy, slow (~3GB)
             device: cpu or cuda
-            compute_type: Computation type
+            compute_type: Computation type (None = int8 on CPU, int8_float16 on CUDA)
                 - int8: faster, less memory (CPU)
-                - float16: faster, requires GPU
+                - int8_float16: int8 weights, float16 activations (CUDA, Volta or newer)
+                - float16: faster than int8_float16 when VRAM allows (CUDA)
                 - float32: more accurate, slower
             download_root: Directory for model caching
+            cpu_threads: CTranslate2 threads per inference (None = all cores on CPU,
+                library default on CUDA)
+            num_workers: Inferences CTranslate2 runs at once - match the number of
+                Python threads calling transcribe(); 2 lets a GPU overlap two jobs
         """
+        from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+        if compute_type is None:
+            compute_type = "int8" if device == "cpu" else "int8_float16"
+        if cpu_threads is None:
+            cpu_threads = (os.cpu_count() or 0) if device == "cpu" else 0
+
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
@@ -73,18 +168,32 @@ class WhisperTranscriber:
         if download_root is None:
             download_root = os.getenv("MODELS_PATH", "/app/models/whisper")
 
+        # A model converted ahead of time with the same quantization loads
+        # without re-quantizing the float16 weights on every start:
+        #   ct2-transformers-converter --model openai/whisper-medium --quantization int8 \
+        #       --copy_files tokenizer.json preprocessor_config.json \
+        #       --output_dir $MODELS_PATH/whisper-medium-int8
+        model_path = model_size
+        quantized_dir = os.path.join(download_root, f"whisper-{model_size}-{compute_type}")
+        if os.path.isfile(os.path.join(quantized_dir, "model.bin")):
+            model_path = quantized_dir
+
         logger.info(
-            f"Loading Whisper model: {model_size} "
+            f"Loading Whisper model: {model_path} "
             f"(device={device}, compute_type={compute_type})"
         )
 
         try:
             self.model = WhisperModel(
-                model_size,
+                model_path,
                 device=device,
                 compute_type=compute_type,
-                download_root=download_root
+                download_root=download_root,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers
             )
+            # Shares the model weights; transcribes VAD chunks in batches
+            self.batched = BatchedInferencePipeline(model=self.model)
             logger.info(f"Whisper model '{model_size}' loaded successfully")
         except Exception as e:
             logger.error(f"Error loading Whisper model: {e}")
@@ -94,8 +203,11 @@ class WhisperTranscriber:
         self,
         audio_path: Path,
         language: str = "ru",
-        beam_size: int = 5,
-        vad_filter: bool = True
+        beam_size: int = 1,
+        vad_filter: bool = True,
+        waveform: Optional[np.ndarray] = None,
+        batch_size: int = 16,
+        quality: Optional[str] = None
     ) -> List[TranscriptionSegment]:
         """
         Transcribe audio file
@@ -105,6 +217,12 @@ class WhisperTranscriber:
             language: Audio language (ru/en/es etc.)
             beam_size: Beam search size (larger = more accurate but slower)
             vad_filter: Use Voice Activity Detection to filter silence
+            waveform: Already decoded audio (see decode_audio_16k), skips decoding the file;
+                audio_path is then only used in log messages
+            batch_size: Speech chunks decoded per batch (1 = sequential decoding,
+                each chunk conditioned on the previous text)
+            quality: Preset from QUALITY_PRESETS (fast/balanced/accurate),
+                overrides beam_size
 
         Returns:
             List of transcription segments with timestamps
@@ -113,21 +231,44 @@ class WhisperTranscriber:
             FileNotFoundError: If audio file not found
             RuntimeError: On transcription error
         """
-        if not audio_path.exists():
+        if waveform is None and not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
+        patience = 1.0
+        if quality is not None:
+            if quality not in QUALITY_PRESETS:
+                raise ValueError(f"Unknown quality preset: {quality} (use {', '.join(QUALITY_PRESETS)})")
+            beam_size, patience = QUALITY_PRESETS[quality]
+
         logger.info(f"Starting transcription: {audio_path.name}")
-        logger.info(f"Parameters: language={language}, beam_size={beam_size}, vad={vad_filter}")
+        logger.info(
+            f"Parameters: language={language}, beam_size={beam_size}, patience={patience}, "
+            f"vad={vad_filter}, batch_size={batch_size}"
+        )
 
         try:
-            # Transcription using Faster-Whisper
-            segments, info = self.model.transcribe(
-                str(audio_path),
-                language=language,
-                beam_size=beam_size,
-                vad_filter=vad_filter,
-                word_timestamps=False  # Timestamps at segment level
-            )
+            # Transcription using Faster-Whisper; batching needs VAD chunks
+            if batch_size > 1 and vad_filter:
+                segments, info = self.batched.transcribe(
+                    waveform if waveform is not None else str(audio_path),
+                    language=language,
+                    beam_size=beam_size,
+                    patience=patience,
+                    batch_size=batch_size,
+                    vad_filter=vad_filter,
+                    vad_parameters={"min_silence_duration_ms": VAD_MIN_SILENCE_MS},
+                    word_timestamps=False  # Timestamps at segment level
+                )
+            else:
+                segments, info = self.model.transcribe(
+                    waveform if waveform is not None else str(audio_path),
+                    language=language,
+                    beam_size=beam_size,
+                    patience=patience,
+                    vad_filter=vad_filter,
+                    vad_parameters={"min_silence_duration_ms": VAD_MIN_SILENCE_MS},
+                    word_timestamps=False  # Timestamps at segment level
+                )
 
             logger.info(
                 f"Detected language: {info.language} "
@@ -135,15 +276,9 @@ class WhisperTranscriber:
             )
 
             # Convert to list of segments
-            transcription_segments = []
-            for segment in segments:
-                transcription_segments.append(
-                    TranscriptionSegment(
-                        start=segment.start,
-                        end=segment.end,
-                        text=segment.text
-                    )
-                )
+            transcription_segments = [
+                TranscriptionSegment.from_whisper(segment) for segment in segments
+            ]
 
             logger.info(
                 f"Transcription completed: {len(transcription_segments)} segments"
@@ -155,6 +290,23 @@ class WhisperTranscriber:
             logger.error(f"Transcription error: {e}", exc_info=True)
             raise RuntimeError(f"Failed to transcribe audio: {str(e)}")
 
+    def warmup(self):
+        """
+        Run one short transcription so the first request does not pay for
+        lazy initialization (CUDA context, kernel selection, buffers)
+        """
+        try:
+            # VAD would drop silence before the encoder, so it is disabled here
+            segments, _ = self.model.transcribe(
+                np.zeros(SAMPLE_RATE, dtype=np.float32),
+                beam_size=1,
+                vad_filter=False
+            )
+            list(segments)
+            logger.info("Whisper warmup completed")
+        except Exception as e:
+            logger.warning(f"Whisper warmup failed: {e}")
+
     def get_model_info(self) -> dict:
         """
         Get information about loaded model